@@ -0,0 +1,83 @@
+"""
+Maintenance commands for the local database.
+
+    python -m app.cli backfill-activity [--user-id ID]
+    python -m app.cli backfill-tags [--user-id ID]
+    python -m app.cli repair-counters [--user-id ID]
+    python -m app.cli send-outbox [--transport smtp|file|memory]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlmodel import Session
+
+from .db import engine, init_db
+from .services.activity import backfill_activity
+from .services.email import make_transport
+from .services.outbox import drain
+from .services.progress import repair_counters
+from .services.tags import backfill_tags
+from .settings import EMAIL_TRANSPORT
+
+
+def cmd_backfill_activity(args: argparse.Namespace) -> None:
+    with Session(engine) as session:
+        rows = backfill_activity(session, args.user_id)
+        session.commit()
+    print(f"Rebuilt {rows} daily activity rows")
+
+
+def cmd_backfill_tags(args: argparse.Namespace) -> None:
+    with Session(engine) as session:
+        words = backfill_tags(session, args.user_id)
+        session.commit()
+    print(f"Indexed tags for {words} words")
+
+
+def cmd_repair_counters(args: argparse.Namespace) -> None:
+    with Session(engine) as session:
+        drifted = repair_counters(session, args.user_id)
+        session.commit()
+    print(f"Rebuilt streak and stage counters; {drifted} users had drifted")
+
+
+def cmd_send_outbox(args: argparse.Namespace) -> None:
+    sent = drain(engine, make_transport(args.transport))
+    print(f"Processed {sent} outbox messages")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser(
+        "backfill-activity", help="rebuild the daily/hourly activity rollups"
+    )
+    backfill.add_argument("--user-id", type=int, default=None)
+    backfill.set_defaults(handler=cmd_backfill_activity)
+
+    tags = commands.add_parser(
+        "backfill-tags", help="rebuild the tag/wordtag index from Word.tags"
+    )
+    tags.add_argument("--user-id", type=int, default=None)
+    tags.set_defaults(handler=cmd_backfill_tags)
+
+    repair = commands.add_parser(
+        "repair-counters", help="rebuild the streak and words-per-stage counters"
+    )
+    repair.add_argument("--user-id", type=int, default=None)
+    repair.set_defaults(handler=cmd_repair_counters)
+
+    outbox = commands.add_parser("send-outbox", help="deliver all due outbox emails once")
+    outbox.add_argument("--transport", choices=["smtp", "file", "memory"], default=EMAIL_TRANSPORT)
+    outbox.set_defaults(handler=cmd_send_outbox)
+
+    args = parser.parse_args(argv)
+    init_db()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
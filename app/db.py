@@ -1,67 +1,603 @@
 from __future__ import annotations
 
-from sqlalchemy import text
-from sqlmodel import SQLModel, create_engine
+import os
+import threading
+import time
+from typing import Optional
 
-DATABASE_URL = "sqlite:///./vocabulary.db"
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlmodel import Session, SQLModel, create_engine
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}, echo=False
+from .settings import (
+    DB_BUSY_TIMEOUT_MS,
+    DB_CACHE_SIZE_KIB,
+    DB_JOURNAL_MODE,
+    DB_MAX_OVERFLOW,
+    DB_MMAP_SIZE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_PROFILE,
+    DB_SYNCHRONOUS,
+    DB_TEMP_STORE,
 )
 
+DATABASE_URL = os.getenv("VOCABULARY_DATABASE_URL", "sqlite:///./vocabulary.db")
 
-def migrate_db() -> None:
+# The write queue takes the lock with BEGIN IMMEDIATE, so that is where
+# its writes wait; the statements after it already hold the lock.
+WRITE_PREFIXES = (
+    "INSERT",
+    "UPDATE",
+    "DELETE",
+    "REPLACE",
+    "BEGIN IMMEDIATE",
+    "BEGIN EXCLUSIVE",
+)
+
+
+def is_write(statement: Optional[str]) -> bool:
+    if not statement:
+        return False
+    return " ".join(statement.split()[:2]).upper().startswith(WRITE_PREFIXES)
+
+
+class DbMetrics:
+    """
+    Process-wide counters for pool checkouts and write statements. Time
+    spent in a write statement, or in a BEGIN IMMEDIATE/EXCLUSIVE, includes
+    any busy_timeout wait for the SQLite write lock, so it doubles as the
+    lock-wait measurement.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.engines: list[Engine] = []
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_wait_seconds = 0.0
+            self.max_checkout_wait_seconds = 0.0
+            self.writes = 0
+            self.write_seconds = 0.0
+            self.max_write_seconds = 0.0
+            self.locked_errors = 0
+
+    def record_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_seconds += seconds
+            self.max_checkout_wait_seconds = max(self.max_checkout_wait_seconds, seconds)
+
+    def record_write(self, seconds: float) -> None:
+        with self._lock:
+            self.writes += 1
+            self.write_seconds += seconds
+            self.max_write_seconds = max(self.max_write_seconds, seconds)
+
+    def record_locked(self) -> None:
+        with self._lock:
+            self.locked_errors += 1
+
+    def attach(self, engine: Engine) -> None:
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            if is_write(statement):
+                conn.info["write_started"] = time.perf_counter()
+
+        def after_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info.pop("write_started", None)
+            if started is not None:
+                self.record_write(time.perf_counter() - started)
+
+        def handle_error(context) -> None:
+            if context.connection is not None:
+                context.connection.info.pop("write_started", None)
+            if "database is locked" in str(context.original_exception):
+                self.record_locked()
+
+        event.listen(engine, "before_cursor_execute", before_execute)
+        event.listen(engine, "after_cursor_execute", after_execute)
+        event.listen(engine, "handle_error", handle_error)
+        self.engines.append(engine)
+
+    def stats(self) -> dict:
+        pools = [engine.pool for engine in self.engines]
+        with self._lock:
+            return {
+                "pool_size": sum(getattr(pool, "size", lambda: 0)() for pool in pools),
+                "checked_out": sum(
+                    getattr(pool, "checkedout", lambda: 0)() for pool in pools
+                ),
+                "overflow": sum(
+                    max(0, getattr(pool, "overflow", lambda: 0)()) for pool in pools
+                ),
+                "checkouts": self.checkouts,
+                "checkout_wait_seconds": self.checkout_wait_seconds,
+                "max_checkout_wait_seconds": self.max_checkout_wait_seconds,
+                "writes": self.writes,
+                "write_seconds": self.write_seconds,
+                "max_write_seconds": self.max_write_seconds,
+                "locked_errors": self.locked_errors,
+            }
+
+
+db_metrics = DbMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_metrics.record_checkout(time.perf_counter() - started)
+
+
+def sqlite_pragmas(profile: str = DB_PROFILE) -> dict[str, object]:
+    if profile == "default":
+        return {}
+    if profile != "tuned":
+        raise ValueError(f"Unknown database profile: {profile}")
+    return {
+        "journal_mode": DB_JOURNAL_MODE,
+        "synchronous": DB_SYNCHRONOUS,
+        "busy_timeout": DB_BUSY_TIMEOUT_MS,
+        # Negative cache_size is in KiB rather than pages.
+        "cache_size": -DB_CACHE_SIZE_KIB,
+        "mmap_size": DB_MMAP_SIZE,
+        "temp_store": DB_TEMP_STORE,
+    }
+
+
+def create_db_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE) -> Engine:
+    """
+    Build the SQLite engine for a profile. "tuned" applies WAL and the
+    DB_* pragmas on every new connection and sizes the pool from settings;
+    "default" keeps SQLite's and SQLAlchemy's defaults.
+    """
+    options = {}
+    if make_url(url).database not in (None, "", ":memory:"):
+        options["poolclass"] = TimedQueuePool
+        options.update(_pool_options(profile))
+    new_engine = create_engine(
+        url, connect_args={"check_same_thread": False}, echo=False, **options
+    )
+    _install_pragmas(new_engine, sqlite_pragmas(profile))
+    db_metrics.attach(new_engine)
+    return new_engine
+
+
+def create_async_db_engine(
+    url: str = DATABASE_URL, profile: str = DB_PROFILE
+) -> AsyncEngine:
+    """
+    The same database through aiosqlite, for async routes: queries run on
+    aiosqlite's worker thread and the event loop awaits them instead of
+    parking a threadpool thread. Writes still go through the write queue.
+    """
+    async_url = make_url(url).set(drivername="sqlite+aiosqlite")
+    options = {}
+    if async_url.database not in (None, "", ":memory:"):
+        options["poolclass"] = AsyncAdaptedQueuePool
+        options.update(_pool_options(profile))
+    new_engine = create_async_engine(async_url, echo=False, **options)
+    _install_pragmas(new_engine.sync_engine, sqlite_pragmas(profile))
+    db_metrics.attach(new_engine.sync_engine)
+    return new_engine
+
+
+def _pool_options(profile: str) -> dict:
+    if profile != "tuned":
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+
+def _install_pragmas(target: Engine, pragmas: dict[str, object]) -> None:
+    if not pragmas:
+        return
+
+    @event.listens_for(target, "connect")
+    def apply_pragmas(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+engine = create_db_engine()
+async_engine = create_async_db_engine()
+
+
+# Versioned schema additions, tracked through PRAGMA user_version.
+# Append new entries; never edit one that has shipped.
+# Trigger bodies that move one word into / out of its dueday row. The
+# WHERE on the insert skips legacy words without a user (and lets SQLite
+# parse the upsert after a SELECT).
+_DUEDAY_ADD = (
+    "INSERT INTO dueday(user_id, day, words) "
+    "SELECT new.user_id, new.next_review, 1 WHERE new.user_id IS NOT NULL "
+    "ON CONFLICT(user_id, day) DO UPDATE SET words = words + 1;"
+)
+_DUEDAY_REMOVE = (
+    "UPDATE dueday SET words = words - 1 "
+    "WHERE user_id = old.user_id AND day = old.next_review; "
+    "DELETE FROM dueday "
+    "WHERE user_id = old.user_id AND day = old.next_review AND words <= 0;"
+)
+# Same for the word's stagecount row; rows stay at 0 rather than go away.
+_STAGECOUNT_ADD = (
+    "INSERT INTO stagecount(user_id, stage, words) "
+    "SELECT new.user_id, new.stage, 1 WHERE new.user_id IS NOT NULL "
+    "ON CONFLICT(user_id, stage) DO UPDATE SET words = words + 1;"
+)
+_STAGECOUNT_REMOVE = (
+    "UPDATE stagecount SET words = words - 1 "
+    "WHERE user_id = old.user_id AND stage = old.stage;"
+)
+# Same for the score histogram when a stage-4 stagecount row changes.
+_SCORECOUNT_ADD = (
+    "INSERT INTO scorecount(score, users) SELECT new.words, 1 WHERE new.words > 0 "
+    "ON CONFLICT(score) DO UPDATE SET users = users + 1;"
+)
+_SCORECOUNT_REMOVE = (
+    "UPDATE scorecount SET users = users - 1 WHERE score = old.words; "
+    "DELETE FROM scorecount WHERE score = old.words AND users <= 0;"
+)
+
+
+def _scorecount_move(old: str, new: str) -> str:
+    """
+    One user's score moving from `old` to `new` (0: unranked). Scores
+    between the two gain or lose the user from their `ahead`; the rows
+    below both keep it. A new score row starts from the next higher one.
+    """
+    return (
+        f"UPDATE scorecount SET users = users - 1 WHERE score = {old}; "
+        f"DELETE FROM scorecount WHERE score = {old} AND users <= 0; "
+        f"UPDATE scorecount SET ahead = ahead + CASE WHEN score < {new} THEN 1 ELSE -1 END "
+        f"WHERE score >= min({old}, {new}) AND score < max({old}, {new}); "
+        f"INSERT INTO scorecount(score, users, ahead) SELECT {new}, 1, coalesce(("
+        f"SELECT ahead + users FROM scorecount WHERE score > {new} ORDER BY score LIMIT 1"
+        f"), 0) WHERE {new} > 0 "
+        "ON CONFLICT(score) DO UPDATE SET users = users + 1;"
+    )
+
+
+# The streak after a review on excluded.last_active_day: the day after the
+# last active day extends it, a later day starts over at 1, and the same
+# or an earlier day (a backdated answer) leaves it alone.
+_STREAK_NEXT = (
+    "CASE WHEN excluded.last_active_day = date(last_active_day, '+1 day') "
+    "THEN current_streak + 1 "
+    "WHEN excluded.last_active_day > last_active_day THEN 1 "
+    "ELSE current_streak END"
+)
+
+SCHEMA_MIGRATIONS: list[tuple[int, tuple[str, ...]]] = [
+    (
+        1,
+        (
+            # review queue + due counts: user_id = ? AND next_review <= ? ORDER BY next_review, stage
+            "CREATE INDEX IF NOT EXISTS ix_word_user_next_review "
+            "ON word(user_id, next_review, stage)",
+            # word listing and export: user_id = ? ORDER BY created_at DESC
+            "CREATE INDEX IF NOT EXISTS ix_word_user_created_at "
+            "ON word(user_id, created_at)",
+            # duplicate detection on create/import: lower(term) = ?
+            "CREATE INDEX IF NOT EXISTS ix_word_user_term_lower "
+            "ON word(user_id, lower(term))",
+            # stats windows and rollup backfill
+            "CREATE INDEX IF NOT EXISTS ix_review_user_reviewed_at "
+            "ON review(user_id, reviewed_at)",
+        ),
+    ),
+    (
+        2,
+        (
+            # substring/prefix search for GET /api/words?q=
+            "CREATE VIRTUAL TABLE IF NOT EXISTS word_fts USING fts5("
+            "term, translation, example, tags, "
+            "content='word', content_rowid='id', tokenize='trigram')",
+            "CREATE TRIGGER IF NOT EXISTS word_fts_ai AFTER INSERT ON word BEGIN "
+            "INSERT INTO word_fts(rowid, term, translation, example, tags) "
+            "VALUES (new.id, new.term, new.translation, new.example, new.tags); "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS word_fts_ad AFTER DELETE ON word BEGIN "
+            "INSERT INTO word_fts(word_fts, rowid, term, translation, example, tags) "
+            "VALUES ('delete', old.id, old.term, old.translation, old.example, old.tags); "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS word_fts_au "
+            "AFTER UPDATE OF term, translation, example, tags ON word BEGIN "
+            "INSERT INTO word_fts(word_fts, rowid, term, translation, example, tags) "
+            "VALUES ('delete', old.id, old.term, old.translation, old.example, old.tags); "
+            "INSERT INTO word_fts(rowid, term, translation, example, tags) "
+            "VALUES (new.id, new.term, new.translation, new.example, new.tags); "
+            "END",
+            # rank = bm25 weighted towards term, then translation
+            "INSERT INTO word_fts(word_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 2.0)')",
+            "INSERT INTO word_fts(word_fts) VALUES ('rebuild')",
+        ),
+    ),
+    (
+        3,
+        (
+            # tag filter and per-tag stats: tag -> words
+            "CREATE INDEX IF NOT EXISTS ix_wordtag_tag_word ON wordtag(tag_id, word_id)",
+        ),
+    ),
+    (
+        4,
+        (
+            # auth lookups: lower(email) = ?
+            'CREATE INDEX IF NOT EXISTS ix_user_email_lower ON "user"(lower(email))',
+        ),
+    ),
+    (
+        5,
+        (
+            # outbox worker: pending messages by due time
+            "CREATE INDEX IF NOT EXISTS ix_emailoutbox_pending ON emailoutbox(next_attempt_at) "
+            "WHERE sent_at IS NULL AND failed_at IS NULL",
+        ),
+    ),
+    (
+        6,
+        (
+            # keyset pages of /api/words: each index ends in the implicit rowid,
+            # so (key, id) order and (key, id) > (?, ?) seeks need no sort.
+            # sort=created and sort=term reuse ix_word_user_created_at and
+            # ix_word_user_term_lower.
+            "CREATE INDEX IF NOT EXISTS ix_word_user_stage ON word(user_id, stage)",
+            "CREATE INDEX IF NOT EXISTS ix_word_user_next_review_id "
+            "ON word(user_id, next_review)",
+        ),
+    ),
+    (
+        7,
+        (
+            # GET /api/sync: every write to word/review moves the row's
+            # changelog entry to the next seq, in the writer's transaction.
+            *(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_changelog_{suffix} "
+                f"AFTER {event} ON {table} BEGIN "
+                "INSERT OR REPLACE INTO changelog(user_id, entity, entity_id, deleted) "
+                f"VALUES ({row}.user_id, '{table}', {row}.id, {deleted}); "
+                "END"
+                for table in ("word", "review")
+                for suffix, event, row, deleted in (
+                    ("ai", "INSERT", "new", 0),
+                    ("au", "UPDATE", "new", 0),
+                    ("ad", "DELETE", "old", 1),
+                )
+            ),
+            # Existing rows start out as changed, so since=0 is a full copy.
+            "INSERT OR REPLACE INTO changelog(user_id, entity, entity_id, deleted) "
+            "SELECT user_id, 'word', id, 0 FROM word ORDER BY id",
+            "INSERT OR REPLACE INTO changelog(user_id, entity, entity_id, deleted) "
+            "SELECT user_id, 'review', id, 0 FROM review ORDER BY id",
+        ),
+    ),
+    (
+        8,
+        (
+            # Due counts for stats and GET /api/review/summary: dueday holds
+            # words per (user_id, next_review), so due-now and due-this-week
+            # sum a few dueday rows instead of range-scanning word.
+            "CREATE TRIGGER IF NOT EXISTS dueday_word_ai AFTER INSERT ON word "
+            "WHEN new.user_id IS NOT NULL BEGIN "
+            f"{_DUEDAY_ADD} "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS dueday_word_ad AFTER DELETE ON word "
+            "WHEN old.user_id IS NOT NULL BEGIN "
+            f"{_DUEDAY_REMOVE} "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS dueday_word_au "
+            "AFTER UPDATE OF user_id, next_review ON word "
+            "WHEN old.user_id IS NOT new.user_id OR old.next_review IS NOT new.next_review "
+            "BEGIN "
+            f"{_DUEDAY_REMOVE} "
+            f"{_DUEDAY_ADD} "
+            "END",
+            "INSERT OR REPLACE INTO dueday(user_id, day, words) "
+            "SELECT user_id, next_review, count(*) FROM word "
+            "WHERE user_id IS NOT NULL GROUP BY user_id, next_review",
+        ),
+    ),
+    (
+        9,
+        (
+            # Dashboard counters read in O(1): words per stage, kept like
+            # dueday, and the review streak, advanced by each review insert.
+            # Existing streaks are rebuilt at startup (ensure_progress_counters).
+            "CREATE TRIGGER IF NOT EXISTS stagecount_word_ai AFTER INSERT ON word "
+            "WHEN new.user_id IS NOT NULL BEGIN "
+            f"{_STAGECOUNT_ADD} "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS stagecount_word_ad AFTER DELETE ON word "
+            "WHEN old.user_id IS NOT NULL BEGIN "
+            f"{_STAGECOUNT_REMOVE} "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS stagecount_word_au "
+            "AFTER UPDATE OF user_id, stage ON word "
+            "WHEN old.user_id IS NOT new.user_id OR old.stage IS NOT new.stage "
+            "BEGIN "
+            f"{_STAGECOUNT_REMOVE} "
+            f"{_STAGECOUNT_ADD} "
+            "END",
+            "INSERT OR REPLACE INTO stagecount(user_id, stage, words) "
+            "SELECT user_id, stage, count(*) FROM word "
+            "WHERE user_id IS NOT NULL GROUP BY user_id, stage",
+            "CREATE TRIGGER IF NOT EXISTS streak_review_ai AFTER INSERT ON review "
+            "WHEN new.user_id IS NOT NULL BEGIN "
+            "INSERT INTO streak(user_id, current_streak, longest_streak, last_active_day) "
+            "SELECT new.user_id, 1, 1, date(new.reviewed_at) WHERE true "
+            "ON CONFLICT(user_id) DO UPDATE SET "
+            f"current_streak = {_STREAK_NEXT}, "
+            f"longest_streak = max(longest_streak, {_STREAK_NEXT}), "
+            "last_active_day = max(last_active_day, excluded.last_active_day); "
+            "END",
+        ),
+    ),
+    (
+        10,
+        (
+            # GET /api/leaderboard: the stage-4 stagecount row is the user's
+            # score. Top-N reads this index in order and never touches the
+            # table.
+            "CREATE INDEX IF NOT EXISTS ix_stagecount_learned "
+            "ON stagecount(words DESC, user_id) WHERE stage = 4",
+        ),
+    ),
+    (
+        11,
+        (
+            # Leaderboard ranks: users per score, so "how many users are
+            # ahead" is a range over distinct scores rather than over users.
+            "CREATE TRIGGER IF NOT EXISTS scorecount_stagecount_ai "
+            "AFTER INSERT ON stagecount WHEN new.stage = 4 BEGIN "
+            f"{_SCORECOUNT_ADD} "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS scorecount_stagecount_ad "
+            "AFTER DELETE ON stagecount WHEN old.stage = 4 BEGIN "
+            f"{_SCORECOUNT_REMOVE} "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS scorecount_stagecount_au "
+            "AFTER UPDATE OF words ON stagecount "
+            "WHEN new.stage = 4 AND old.words IS NOT new.words BEGIN "
+            f"{_SCORECOUNT_REMOVE} "
+            f"{_SCORECOUNT_ADD} "
+            "END",
+            "DELETE FROM scorecount",
+            "INSERT INTO scorecount(score, users) "
+            "SELECT words, count(*) FROM stagecount "
+            "WHERE stage = 4 AND words > 0 GROUP BY words",
+        ),
+    ),
+    (
+        12,
+        (
+            # The "sm2" scheduler was only SM-2's interval sequence at a
+            # fixed ease; it is now called "geometric".
+            "UPDATE schedulersettings SET scheduler = 'geometric' WHERE scheduler = 'sm2'",
+        ),
+    ),
+    (
+        13,
+        (
+            # Scheduler settings are cached per process; a save moves the
+            # user's 'settings' changelog entry so every worker sees it
+            # (app.services.response_cache.Generations).
+            *(
+                f"CREATE TRIGGER IF NOT EXISTS schedulersettings_changelog_{suffix} "
+                f"AFTER {event} ON schedulersettings BEGIN "
+                "INSERT OR REPLACE INTO changelog(user_id, entity, entity_id, deleted) "
+                "VALUES (new.user_id, 'settings', new.user_id, 0); "
+                "END"
+                for suffix, event in (("ai", "INSERT"), ("au", "UPDATE"))
+            ),
+        ),
+    ),
+    (
+        14,
+        (
+            # Leaderboard ranks in one lookup: each score row also keeps
+            # `ahead`, the users above it, so a rank is the next higher
+            # row's ahead + users. Learning or lapsing a word moves a score
+            # by one, which touches the one row in between.
+            "DROP TRIGGER IF EXISTS scorecount_stagecount_ai",
+            "DROP TRIGGER IF EXISTS scorecount_stagecount_ad",
+            "DROP TRIGGER IF EXISTS scorecount_stagecount_au",
+            "CREATE TRIGGER IF NOT EXISTS scorecount_stagecount_ai "
+            "AFTER INSERT ON stagecount WHEN new.stage = 4 BEGIN "
+            f"{_scorecount_move('0', 'new.words')} "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS scorecount_stagecount_ad "
+            "AFTER DELETE ON stagecount WHEN old.stage = 4 BEGIN "
+            f"{_scorecount_move('old.words', '0')} "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS scorecount_stagecount_au "
+            "AFTER UPDATE OF words ON stagecount "
+            "WHEN new.stage = 4 AND old.words IS NOT new.words BEGIN "
+            f"{_scorecount_move('old.words', 'new.words')} "
+            "END",
+            "DELETE FROM scorecount",
+            "INSERT INTO scorecount(score, users, ahead) "
+            "SELECT words, count(*), "
+            "coalesce(sum(count(*)) OVER (ORDER BY words DESC "
+            "ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0) "
+            "FROM stagecount WHERE stage = 4 AND words > 0 GROUP BY words",
+        ),
+    ),
+]
+
+
+def apply_schema_migrations(bind: Optional[Engine] = None) -> None:
+    with (bind or engine).begin() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        for target, statements in SCHEMA_MIGRATIONS:
+            if target <= version:
+                continue
+            for statement in statements:
+                conn.exec_driver_sql(statement)
+            conn.exec_driver_sql(f"PRAGMA user_version = {target}")
+
+
+def adopt_legacy_users() -> None:
     """
-    Minimal in-place migrations for local SQLite.
-    (SQLModel doesn't manage schema ALTERs.)
+    Databases created by the session-cookie branch keep accounts in
+    `users`. Rename it to `user`, which the foreign keys here point at
+    (SQLite rewrites the references in word), and mark those accounts
+    verified: they signed up before verification existed.
     """
     with engine.begin() as conn:
         tables = {
             row[0]
             for row in conn.exec_driver_sql(
                 "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()
-        }
-        if "user" in tables and "users" not in tables:
-            conn.exec_driver_sql("ALTER TABLE user RENAME TO users")
-
-        columns = conn.exec_driver_sql("PRAGMA table_info(word)").fetchall()
-        column_names = {row[1] for row in columns}  # row[1] = name
-        if "user_id" not in column_names:
-            conn.exec_driver_sql("ALTER TABLE word ADD COLUMN user_id INTEGER")
-            conn.exec_driver_sql(
-                "CREATE INDEX IF NOT EXISTS ix_word_user_id ON word(user_id)"
             )
-
-
-def claim_legacy_words_for_user(user_id: int) -> None:
-    """
-    One-time migration helper: if there are legacy words without user_id,
-    and no words have been claimed yet, assign them to this user.
-    """
-    with engine.begin() as conn:
-        any_claimed = conn.execute(
-            text("SELECT 1 FROM word WHERE user_id IS NOT NULL LIMIT 1")
-        ).fetchone()
-        if any_claimed:
+        }
+        if "users" not in tables or "user" in tables:
             return
-        conn.execute(text("UPDATE word SET user_id = :uid WHERE user_id IS NULL"), {"uid": user_id})
+        # create_all recreates it as the unique index on user.email.
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_user_email")
+        conn.exec_driver_sql('ALTER TABLE users RENAME TO "user"')
+        conn.exec_driver_sql(
+            'ALTER TABLE "user" ADD COLUMN is_verified BOOLEAN NOT NULL DEFAULT 1'
+        )
 
 
 def init_db() -> None:
+    adopt_legacy_users()
     SQLModel.metadata.create_all(engine)
-<<<<<<< HEAD
-    migrate_db()
-=======
     with engine.begin() as conn:
         columns = conn.execute(text("PRAGMA table_info(word)")).fetchall()
         col_names = {row[1] for row in columns}
         if "user_id" not in col_names:
             conn.execute(text("ALTER TABLE word ADD COLUMN user_id INTEGER"))
+        if "interval" not in col_names:
+            conn.execute(text("ALTER TABLE word ADD COLUMN interval INTEGER"))
+        if "ease" not in col_names:
+            conn.execute(text("ALTER TABLE word ADD COLUMN ease FLOAT"))
 
         columns = conn.execute(text("PRAGMA table_info(review)")).fetchall()
         col_names = {row[1] for row in columns}
         if "user_id" not in col_names:
             conn.execute(text("ALTER TABLE review ADD COLUMN user_id INTEGER"))
 
->>>>>>> dce23febdb3bb8efd7e33cacfdea52a2dd384518
+        columns = conn.execute(text("PRAGMA table_info(scorecount)")).fetchall()
+        if "ahead" not in {row[1] for row in columns}:
+            conn.execute(
+                text("ALTER TABLE scorecount ADD COLUMN ahead INTEGER NOT NULL DEFAULT 0")
+            )
+
+    apply_schema_migrations()
@@ -3,16 +3,11 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Optional
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, SQLModel
 
 
 class User(SQLModel, table=True):
-<<<<<<< HEAD
-    __tablename__ = "users"
-    id: Optional[int] = Field(default=None, primary_key=True)
-    email: str = Field(index=True)
-    password_hash: str
-=======
     id: Optional[int] = Field(default=None, primary_key=True)
     email: str = Field(index=True, unique=True)
     password_hash: str
@@ -25,17 +20,12 @@ class VerificationCode(SQLModel, table=True):
     user_id: int = Field(foreign_key="user.id")
     code: str
     expires_at: datetime
->>>>>>> dce23febdb3bb8efd7e33cacfdea52a2dd384518
     created_at: datetime = Field(default_factory=datetime.now)
 
 
 class Word(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-<<<<<<< HEAD
-    user_id: Optional[int] = Field(default=None, foreign_key="users.id", index=True)
-=======
     user_id: Optional[int] = Field(default=None, foreign_key="user.id")
->>>>>>> dce23febdb3bb8efd7e33cacfdea52a2dd384518
     term: str
     translation: str
     example: Optional[str] = None
@@ -43,6 +33,11 @@ class Word(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.now)
     stage: int = Field(default=0)
     next_review: date = Field(default_factory=date.today)
+    # Days from the last answer to next_review, and the card's own ease
+    # under the geometric scheduler (None: the user's ease). Cards that
+    # were never answered have no interval; their stage's is assumed.
+    interval: Optional[int] = None
+    ease: Optional[float] = None
 
 
 class Review(SQLModel, table=True):
@@ -52,3 +47,131 @@ class Review(SQLModel, table=True):
     reviewed_at: datetime = Field(default_factory=datetime.now)
     result: bool
     next_review_assigned: date
+
+
+class ReviewReceipt(SQLModel, table=True):
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    key: str = Field(primary_key=True, max_length=64)
+    word_id: int
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+class ChangeLog(SQLModel, table=True):
+    # One row per synced word/review: its latest change. Filled by the
+    # triggers in migration 7; INSERT OR REPLACE gives a changed row a new,
+    # higher seq (AUTOINCREMENT never reuses one), so rows with seq > N are
+    # exactly what changed after N. Deletes leave a tombstone (deleted=1).
+    # Saved scheduler settings log one 'settings' row per user (migration
+    # 13); sync skips it.
+    __table_args__ = (
+        UniqueConstraint("entity", "entity_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    user_id: Optional[int] = Field(default=None, index=True)
+    # word | review | settings
+    entity: str
+    entity_id: int
+    deleted: bool = Field(default=False)
+
+
+class SchedulerSettings(SQLModel, table=True):
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    # a key of app.services.scheduler.SCHEDULERS: fixed | multiplier | geometric
+    scheduler: str = Field(default="fixed")
+    # days after a right answer, for stages 1..4, comma-separated
+    intervals: str = Field(default="3,7,14,30")
+    multiplier: float = Field(default=1.0)
+    ease: float = Field(default=2.5)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class ActivityDay(SQLModel, table=True):
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    new_words: int = Field(default=0)
+    reviews: int = Field(default=0)
+
+
+class ActivityHour(SQLModel, table=True):
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    hour: datetime = Field(primary_key=True)
+    new_words: int = Field(default=0)
+    reviews: int = Field(default=0)
+
+
+class DueDay(SQLModel, table=True):
+    # The user's words per next_review date, kept current by the triggers
+    # in migration 8. Days with no words left are deleted.
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    words: int = Field(default=0)
+
+
+class StageCount(SQLModel, table=True):
+    # The user's words per SRS stage, kept current by the triggers in
+    # migration 9. Words at MAX_STAGE count as learned.
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    stage: int = Field(primary_key=True)
+    words: int = Field(default=0)
+
+
+class ScoreCount(SQLModel, table=True):
+    # Users per leaderboard score (learned words, above 0), and users with
+    # a higher score, kept current by the stagecount triggers in migration
+    # 14. Empty scores are deleted.
+    score: int = Field(primary_key=True)
+    users: int = Field(default=0)
+    ahead: int = Field(default=0)
+
+
+class Streak(SQLModel, table=True):
+    # Days in a row with at least one review, advanced by the review insert
+    # trigger in migration 9; rebuilt from review history by repair_counters.
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    current_streak: int = Field(default=0)
+    longest_streak: int = Field(default=0)
+    last_active_day: date
+
+
+class Tag(SQLModel, table=True):
+    __table_args__ = (UniqueConstraint("user_id", "name"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    name: str
+
+
+class WordTag(SQLModel, table=True):
+    word_id: int = Field(foreign_key="word.id", primary_key=True)
+    tag_id: int = Field(foreign_key="tag.id", primary_key=True)
+
+
+class EmailOutbox(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    to_email: str
+    subject: str
+    body: str
+    created_at: datetime = Field(default_factory=datetime.now)
+    next_attempt_at: datetime = Field(default_factory=datetime.now)
+    locked_until: Optional[datetime] = None
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+    failed_at: Optional[datetime] = None
+
+
+class ImportJob(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    filename: Optional[str] = None
+    size: int = Field(default=0)
+    # pending | running | done | failed
+    status: str = Field(default="pending")
+    imported: int = Field(default=0)
+    skipped: int = Field(default=0)
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,106 +1,130 @@
 from __future__ import annotations
 
-import csv
-import io
+import shutil
+import tempfile
 from datetime import date, datetime, timedelta
 from typing import Optional
 
 import secrets
-from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile
-from fastapi.responses import Response
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy import func
 from sqlmodel import Session, select
-
-from ..db import engine
-from ..models import Review, User, VerificationCode, Word
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..db import async_engine, engine
+from ..models import (
+    ImportJob,
+    Review,
+    SchedulerSettings,
+    User,
+    VerificationCode,
+    Word,
+)
 from ..schemas import (
     AuthLogin,
     AuthRegister,
     AuthToken,
     AuthVerify,
+    ForecastOut,
+    ImportJobOut,
+    LeaderboardOut,
+    ReviewBatch,
+    ReviewBatchOut,
     ReviewResult,
+    ReviewSummaryOut,
+    SchedulerSettingsIn,
+    SchedulerSettingsOut,
     StatsOut,
+    SyncOut,
+    TagStatsOut,
     UserOut,
     WordCreate,
+    WordOut,
     WordUpdate,
 )
-from ..services.auth import create_access_token, decode_access_token, hash_password, verify_password
-from ..services.review import MAX_STAGE, next_review_date
-from ..services.tags import normalize_tag, normalize_tags
-from ..services.email import send_verification_email
+from ..services.auth import (
+    create_access_token,
+    decode_access_token,
+    hash_password_async,
+    invalidate_user,
+    user_cache,
+    verify_and_update_password,
+)
+from ..services.activity import (
+    backfill_activity,
+    daily_activity,
+    hourly_activity,
+    record_activity,
+)
+from ..services.exporter import MEDIA_TYPES, export_chunks, export_statement
+from ..services.forecast import MAX_FORECAST_DAYS, forecast_reviews
+from ..services.importer import (
+    CsvImportError,
+    fold_term,
+    import_csv,
+    merge_tags,
+    merge_translation,
+    run_import_job,
+)
+from ..services.leaderboard import leaderboard
+from ..services.pagination import (
+    SORT_KEYS,
+    InvalidCursor,
+    encode_cursor,
+    keyset_page,
+    sort_key_column,
+)
+from ..services.progress import repair_counters
+from ..services.read_models import WORD_COLUMNS, render_words, render_words_out
+from ..services.response_cache import render_json, response_cache
+from ..services.review import apply_review, apply_review_batch, client_moment
+from ..services.scheduler import (
+    MAX_STAGE,
+    InvalidSchedulerSettings,
+    save_scheduler_settings,
+    scheduler_cache,
+    scheduler_for,
+    settings_scheduler,
+)
+from ..services.search import (
+    HIGHLIGHT_COLUMNS,
+    fts_highlights,
+    fts_match,
+    fts_phrase,
+    word_fts,
+)
+from ..services.stats import compute_stats, due_summary
+from ..services.sync import changes_since
+from ..services.tags import (
+    drop_word_tags,
+    normalize_tag,
+    normalize_tags,
+    sync_word_tags,
+    tag_filter,
+    tag_progress,
+)
+from ..services.outbox import enqueue_verification_email, wake_worker
+from ..services.writer import write_queue
+from ..settings import (
+    IMPORT_BACKGROUND_BYTES,
+    LEADERBOARD_MAX_LIMIT,
+    REVIEW_BATCH_LIMIT,
+    SYNC_PAGE_LIMIT,
+)
 
 router = APIRouter(prefix="/api")
 
 
-def parse_date(value: Optional[str]) -> Optional[date]:
-    if not value:
-        return None
-    try:
-        return date.fromisoformat(value)
-    except ValueError:
-        return None
-
-
-def parse_datetime(value: Optional[str]) -> Optional[datetime]:
-    if not value:
-        return None
-    try:
-        return datetime.fromisoformat(value)
-    except ValueError:
-        return None
-
-
-def parse_stage(value: Optional[str]) -> Optional[int]:
-    if value is None or value == "":
-        return None
-    try:
-        return int(value)
-    except ValueError:
-        return None
-
-
-def merge_translation(existing: str, incoming: str) -> str:
-    existing = existing.strip()
-    incoming = incoming.strip()
-    if not existing:
-        return ", ".join(
-            [part for part in (p.strip() for p in incoming.split(",")) if part]
-        )
-    if not incoming:
-        return existing
-    parts = [part.strip() for part in existing.split(",") if part.strip()]
-    lower_parts = {part.lower() for part in parts}
-    for part in incoming.split(","):
-        cleaned = part.strip()
-        if not cleaned:
-            continue
-        if cleaned.lower() in lower_parts:
-            continue
-        parts.append(cleaned)
-        lower_parts.add(cleaned.lower())
-    return ", ".join(parts)
-
-
-def merge_tags(existing: Optional[str], incoming: Optional[str]) -> Optional[str]:
-    normalized_existing = normalize_tags(existing)
-    normalized_incoming = normalize_tags(incoming)
-    if not normalized_existing:
-        return normalized_incoming
-    if not normalized_incoming:
-        return normalized_existing
-    parts = [part.strip() for part in normalized_existing.split(",") if part.strip()]
-    lower_parts = {part.lower() for part in parts}
-    for tag in normalized_incoming.split(","):
-        tag = tag.strip()
-        if not tag:
-            continue
-        if tag.lower() in lower_parts:
-            continue
-        parts.append(tag)
-        lower_parts.add(tag.lower())
-    return ",".join(parts)
-
-
 def build_time_buckets(
     start: datetime, end: datetime, step: timedelta, fmt: str
 ) -> list[str]:
@@ -111,7 +135,7 @@ def build_time_buckets(
         cursor += step
     return buckets
 
-def get_current_user(authorization: Optional[str] = Header(None)) -> User:
+async def get_current_user(authorization: Optional[str] = Header(None)) -> User:
     if not authorization:
         raise HTTPException(status_code=401, detail="Not authenticated")
     scheme, _, token = authorization.partition(" ")
@@ -120,36 +144,46 @@ def get_current_user(authorization: Optional[str] = Header(None)) -> User:
     subject = decode_access_token(token)
     if not subject:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
-    with Session(engine) as session:
-        user = session.exec(
-            select(User).where(func.lower(User.email) == subject.lower())
-        ).first()
+    key = subject.lower()
+    user = user_cache.get(key)
+    if user is None:
+        async with AsyncSession(async_engine) as session:
+            result = await session.exec(
+                select(User).where(func.lower(User.email) == key)
+            )
+            user = result.first()
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
-        if not user.is_verified:
-            raise HTTPException(status_code=403, detail="Email not verified")
-        return user
+        user_cache.set(key, user)
+    if not user.is_verified:
+        raise HTTPException(status_code=403, detail="Email not verified")
+    return user
 
 @router.post("/auth/register")
-def register(payload: AuthRegister) -> dict:
+async def register(payload: AuthRegister) -> dict:
     email = payload.email.strip().lower()
     password = payload.password.strip()
     if not email or not password:
         raise HTTPException(status_code=400, detail="Email and password required")
-    with Session(engine) as session:
-        existing = session.exec(
-            select(User).where(func.lower(User.email) == email)
+    async with AsyncSession(async_engine) as session:
+        existing = (
+            await session.exec(select(User).where(func.lower(User.email) == email))
         ).first()
-        if existing and existing.is_verified:
-            raise HTTPException(status_code=409, detail="Email already registered")
+    if existing and existing.is_verified:
+        raise HTTPException(status_code=409, detail="Email already registered")
+
+    # Hash outside any open session so a queued hash job holds no connection.
+    password_hash = await hash_password_async(password)
+
+    def write(session: Session) -> None:
         if existing:
-            existing.password_hash = hash_password(password)
-            user = existing
+            user = session.get(User, existing.id)
+            user.password_hash = password_hash
+            session.add(user)
         else:
-            user = User(email=email, password_hash=hash_password(password))
+            user = User(email=email, password_hash=password_hash)
             session.add(user)
-            session.commit()
-            session.refresh(user)
+            session.flush()
 
         code = f"{secrets.randbelow(1000000):06d}"
         verification = VerificationCode(
@@ -158,12 +192,12 @@ def register(payload: AuthRegister) -> dict:
             expires_at=datetime.now() + timedelta(minutes=10),
         )
         session.add(verification)
-        session.commit()
+        enqueue_verification_email(session, email, code)
 
-    try:
-        send_verification_email(email, code)
-    except RuntimeError as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    await write_queue(engine).run_async(write)
+    if existing:
+        invalidate_user(email)
+    wake_worker()
 
     return {"ok": True}
 
@@ -174,7 +208,8 @@ def verify_email(payload: AuthVerify) -> dict:
     code = payload.code.strip()
     if not email or not code:
         raise HTTPException(status_code=400, detail="Email and code required")
-    with Session(engine) as session:
+
+    def write(session: Session) -> None:
         user = session.exec(
             select(User).where(func.lower(User.email) == email)
         ).first()
@@ -191,26 +226,42 @@ def verify_email(payload: AuthVerify) -> dict:
             raise HTTPException(status_code=400, detail="Code expired")
         user.is_verified = True
         session.add(user)
-        session.commit()
+
+    write_queue(engine).run(write)
+    invalidate_user(email)
     return {"ok": True}
 
 
 @router.post("/auth/login", response_model=AuthToken)
-def login(payload: AuthLogin) -> AuthToken:
+async def login(payload: AuthLogin) -> AuthToken:
     email = payload.email.strip().lower()
     password = payload.password.strip()
     if not email or not password:
         raise HTTPException(status_code=400, detail="Email and password required")
-    with Session(engine) as session:
-        user = session.exec(
-            select(User).where(func.lower(User.email) == email)
+    async with AsyncSession(async_engine) as session:
+        user = (
+            await session.exec(select(User).where(func.lower(User.email) == email))
         ).first()
-        if not user or not verify_password(password, user.password_hash):
-            raise HTTPException(status_code=401, detail="Invalid credentials")
-        if not user.is_verified:
-            raise HTTPException(status_code=403, detail="Email not verified")
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    valid, upgraded_hash = await verify_and_update_password(password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if not user.is_verified:
+        raise HTTPException(status_code=403, detail="Email not verified")
+
+    def write(session: Session) -> None:
+        if upgraded_hash:
+            session.execute(
+                User.__table__.update()
+                .where(User.id == user.id)
+                .values(password_hash=upgraded_hash)
+            )
         claim_legacy_data(session, user.id)
-        session.commit()
+
+    await write_queue(engine).run_async(write)
+    if upgraded_hash:
+        invalidate_user(email)
     token = create_access_token(email)
     return AuthToken(access_token=token)
 
@@ -221,6 +272,17 @@ def me(current_user: User = Depends(get_current_user)) -> UserOut:
 
 
 def claim_legacy_data(session: Session, user_id: int) -> None:
+    """
+    Hand words and reviews saved before accounts existed to this user,
+    then rebuild what the bare UPDATEs leave behind: the tag index for the
+    claimed words, the user's activity rollups and their counters.
+    """
+    claimed = session.exec(
+        select(Word.id, Word.tags).where(Word.user_id.is_(None))
+    ).all()
+    reviews = session.exec(select(Review.id).where(Review.user_id.is_(None)).limit(1))
+    if not claimed and reviews.first() is None:
+        return
     session.execute(
         Word.__table__.update()
         .where(Word.user_id.is_(None))
@@ -231,45 +293,94 @@ def claim_legacy_data(session: Session, user_id: int) -> None:
         .where(Review.user_id.is_(None))
         .values(user_id=user_id)
     )
+    sync_word_tags(session, user_id, {word_id: tags for word_id, tags in claimed})
+    backfill_activity(session, user_id)
+    repair_counters(session, user_id)
 
 
-@router.get("/words", response_model=list[Word])
-def list_words(
+@router.get("/words", response_model=list[WordOut])
+async def list_words(
     current_user: User = Depends(get_current_user),
     q: Optional[str] = None,
     tag: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
-) -> list[Word]:
-    statement = select(Word).where(Word.user_id == current_user.id)
-    if q:
-        query = q.strip().lower()
-        like = f"%{query}%"
-        statement = statement.where(
-            func.lower(Word.term).like(like)
-            | func.lower(Word.translation).like(like)
+    highlight: bool = False,
+    sort: str = "created",
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    if sort not in SORT_KEYS:
+        raise HTTPException(
+            status_code=400, detail=f"sort must be one of: {', '.join(SORT_KEYS)}"
+        )
+    phrase = fts_phrase(q)
+    if phrase and cursor:
+        raise HTTPException(
+            status_code=400, detail="Ranked search results use offset, not cursor"
         )
+    key = response_cache.key(
+        current_user.id, "words", q, tag, limit, offset, highlight, sort, cursor
+    )
+    cached = response_cache.lookup(key, if_none_match)
+    if cached is not None:
+        return cached
+    if phrase:
+        # Ranked substring search through the trigram index.
+        columns = fts_highlights() if highlight else []
+        statement = (
+            select(*WORD_COLUMNS, *columns)
+            .select_from(word_fts)
+            .join(Word, Word.id == word_fts.c.rowid)
+            .where(fts_match(phrase), Word.user_id == current_user.id)
+        )
+    else:
+        # The trailing sort_key column is for the cursor; rendering skips it.
+        statement = select(*WORD_COLUMNS, sort_key_column(sort)).where(
+            Word.user_id == current_user.id
+        )
+        if q and q.strip():
+            like = f"%{q.strip().lower()}%"
+            statement = statement.where(
+                func.lower(Word.term).like(like)
+                | func.lower(Word.translation).like(like)
+            )
     normalized_tag = normalize_tag(tag)
     if normalized_tag:
-        statement = statement.where(
-            (Word.tags == normalized_tag)
-            | (Word.tags.like(f"{normalized_tag},%"))
-            | (Word.tags.like(f"%,{normalized_tag},%"))
-            | (Word.tags.like(f"%,{normalized_tag}"))
-        )
-    statement = statement.order_by(Word.created_at.desc()).limit(limit).offset(offset)
-    return session.exec(statement).all()
+        statement = statement.where(tag_filter(current_user.id, normalized_tag))
+    if phrase:
+        statements = [statement.order_by(word_fts.c.rank).offset(offset)]
+    else:
+        try:
+            statements = keyset_page(statement, sort, cursor)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if not cursor:
+            statements = [statements[0].offset(offset)]
+    rows = []
+    async with AsyncSession(async_engine) as session:
+        for part in statements:
+            if len(rows) >= limit:
+                break
+            rows += (await session.exec(part.limit(limit - len(rows)))).all()
+    headers = {}
+    if not phrase and limit > 0 and len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(sort, rows[-1].sort_key, rows[-1].id)
+    marked = list(HIGHLIGHT_COLUMNS) if phrase and highlight else []
+    body = render_words_out(rows, marked)
+    return response_cache.store(key, body, if_none_match, headers)
 
 
 @router.post("/words", response_model=Word, status_code=201)
 def create_word(payload: WordCreate, current_user: User = Depends(get_current_user)) -> Word:
     today = date.today()
-    with Session(engine) as session:
+
+    def write(session: Session) -> Word:
         normalized_term = payload.term.strip()
         existing = session.exec(
             select(Word).where(
                 Word.user_id == current_user.id,
-                func.lower(Word.term) == normalized_term.lower(),
+                func.lower(Word.term) == fold_term(normalized_term),
             )
         ).first()
         if existing:
@@ -285,8 +396,7 @@ def create_word(payload: WordCreate, current_user: User = Depends(get_current_us
             existing.translation = merged_translation
             existing.tags = merged_tags
             session.add(existing)
-            session.commit()
-            session.refresh(existing)
+            sync_word_tags(session, current_user.id, {existing.id: existing.tags})
             return existing
 
         word = Word(
@@ -299,16 +409,20 @@ def create_word(payload: WordCreate, current_user: User = Depends(get_current_us
             user_id=current_user.id,
         )
         session.add(word)
-        session.commit()
-        session.refresh(word)
+        session.flush()
+        record_activity(session, current_user.id, [word.created_at], "new_words")
+        sync_word_tags(session, current_user.id, {word.id: word.tags})
         return word
 
+    word = write_queue(engine).run(write)
+    return word
+
 
 @router.patch("/words/{word_id}", response_model=Word)
 def update_word(
     word_id: int, payload: WordUpdate, current_user: User = Depends(get_current_user)
 ) -> Word:
-    with Session(engine) as session:
+    def write(session: Session) -> Word:
         word = session.get(Word, word_id)
         if not word or word.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Word not found")
@@ -320,186 +434,246 @@ def update_word(
             word.example = payload.example.strip() or None
         if payload.tags is not None:
             word.tags = normalize_tags(payload.tags)
+            sync_word_tags(session, current_user.id, {word.id: word.tags})
         session.add(word)
-        session.commit()
-        session.refresh(word)
+        session.flush()
         return word
 
+    word = write_queue(engine).run(write)
+    return word
+
 
 @router.delete("/words/{word_id}")
 def delete_word(word_id: int, current_user: User = Depends(get_current_user)) -> dict:
-    with Session(engine) as session:
+    def write(session: Session) -> None:
         word = session.get(Word, word_id)
         if not word or word.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Word not found")
+        record_activity(session, current_user.id, [word.created_at], "new_words", -1)
+        drop_word_tags(session, word.id)
         session.delete(word)
-        session.commit()
+
+    write_queue(engine).run(write)
     return {"ok": True}
 
 
+@router.get("/tags", response_model=list[TagStatsOut])
+def list_tags(current_user: User = Depends(get_current_user)) -> list[TagStatsOut]:
+    with Session(engine) as session:
+        rows = tag_progress(session, current_user.id)
+    return [
+        TagStatsOut(name=row[0], word_count=row[1], stages=list(row[2:]))
+        for row in rows
+    ]
+
+
 @router.get("/review/today", response_model=list[Word])
-def review_today(
-    limit: int = 20, current_user: User = Depends(get_current_user)
-) -> list[Word]:
+async def review_today(
+    limit: int = 20,
+    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     today = date.today()
     statement = (
-        select(Word)
+        select(*WORD_COLUMNS)
         .where(Word.user_id == current_user.id, Word.next_review <= today)
         .order_by(Word.next_review, Word.stage)
         .limit(limit)
     )
-    return session.exec(statement).all()
+    key = response_cache.key(current_user.id, "review_today", today, limit)
+    cached = response_cache.lookup(key, if_none_match)
+    if cached is not None:
+        return cached
+    async with AsyncSession(async_engine) as session:
+        rows = (await session.exec(statement)).all()
+    return response_cache.store(key, render_words(rows), if_none_match)
+
+
+@router.get("/review/summary", response_model=ReviewSummaryOut)
+async def review_summary(
+    current_user: User = Depends(get_current_user),
+) -> ReviewSummaryOut:
+    async with AsyncSession(async_engine) as session:
+        summary = await session.run_sync(due_summary, current_user.id, date.today())
+    return ReviewSummaryOut(**summary)
+
+
+@router.get("/review/forecast", response_model=ForecastOut)
+async def review_forecast(
+    days: int = 30, current_user: User = Depends(get_current_user)
+) -> ForecastOut:
+    if not 1 <= days <= MAX_FORECAST_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"days must be 1-{MAX_FORECAST_DAYS}"
+        )
+    async with AsyncSession(async_engine) as session:
+        forecast = await session.run_sync(
+            forecast_reviews, current_user.id, date.today(), days
+        )
+    return ForecastOut.model_validate(forecast)
+
+
+@router.post("/review/batch", response_model=ReviewBatchOut)
+async def review_batch(
+    payload: ReviewBatch, current_user: User = Depends(get_current_user)
+) -> ReviewBatchOut:
+    if len(payload.answers) > REVIEW_BATCH_LIMIT:
+        raise HTTPException(
+            status_code=400, detail=f"At most {REVIEW_BATCH_LIMIT} answers per batch"
+        )
+    now = datetime.now()
+    answers = []
+    for answer in payload.answers:
+        result = answer.result.strip().lower()
+        if result not in {"good", "bad"}:
+            raise HTTPException(status_code=400, detail="Result must be good or bad")
+        key = (answer.idempotency_key or "").strip() or None
+        if key and len(key) > 64:
+            raise HTTPException(status_code=400, detail="Idempotency key is too long")
+        answers.append(
+            (answer.word_id, result == "good", client_moment(answer.reviewed_at, now), key)
+        )
+
+    def write(session: Session) -> ReviewBatchOut:
+        reviews, duplicates, missing, words = apply_review_batch(
+            session, current_user.id, answers
+        )
+        record_activity(
+            session, current_user.id, [review.reviewed_at for review in reviews], "reviews"
+        )
+        session.flush()
+        return ReviewBatchOut(
+            applied=len(reviews),
+            duplicates=duplicates,
+            missing=missing,
+            words=[WordOut.model_validate(word) for word in words],
+        )
+
+    outcome = await write_queue(engine).run_async(write)
+    return outcome
 
 
 @router.post("/review/{word_id}", response_model=Word)
-def review_word(
+async def review_word(
     word_id: int, payload: ReviewResult, current_user: User = Depends(get_current_user)
 ) -> Word:
     result = payload.result.strip().lower()
     if result not in {"good", "bad"}:
         raise HTTPException(status_code=400, detail="Result must be good or bad")
-    today = date.today()
-    with Session(engine) as session:
+
+    def write(session: Session) -> Word:
         word = session.get(Word, word_id)
         if not word or word.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Word not found")
-        if result == "good":
-            word.stage = min(word.stage + 1, MAX_STAGE)
-            word.next_review = next_review_date(word.stage, today)
-            result_bool = True
-        else:
-            word.stage = 0
-            word.next_review = today + timedelta(days=1)
-            result_bool = False
-        review = Review(
-            word_id=word.id,
-            result=result_bool,
-            next_review_assigned=word.next_review,
-            user_id=current_user.id,
+        review = apply_review(
+            word, result == "good", datetime.now(), scheduler_for(session, current_user.id)
         )
         session.add(review)
         session.add(word)
-        session.commit()
-        session.refresh(word)
+        record_activity(session, current_user.id, [review.reviewed_at], "reviews")
+        session.flush()
         return word
 
+    word = await write_queue(engine).run_async(write)
+    return word
+
+
+def scheduler_settings_out(
+    settings: SchedulerSettings, rescheduled: int = 0
+) -> SchedulerSettingsOut:
+    return SchedulerSettingsOut(
+        scheduler=settings.scheduler,
+        intervals=[int(days) for days in settings.intervals.split(",")],
+        multiplier=settings.multiplier,
+        ease=settings.ease,
+        stage_intervals=settings_scheduler(settings).stage_intervals,
+        rescheduled=rescheduled,
+    )
+
+
+@router.get("/settings/scheduler", response_model=SchedulerSettingsOut)
+def get_scheduler_settings(
+    current_user: User = Depends(get_current_user),
+) -> SchedulerSettingsOut:
+    with Session(engine) as session:
+        settings = session.get(SchedulerSettings, current_user.id)
+    return scheduler_settings_out(settings or SchedulerSettings(user_id=current_user.id))
+
+
+@router.put("/settings/scheduler", response_model=SchedulerSettingsOut)
+def update_scheduler_settings(
+    payload: SchedulerSettingsIn, current_user: User = Depends(get_current_user)
+) -> SchedulerSettingsOut:
+    def write(session: Session) -> SchedulerSettingsOut:
+        settings, rescheduled = save_scheduler_settings(
+            session,
+            current_user.id,
+            payload.scheduler.strip().lower(),
+            payload.intervals,
+            payload.multiplier,
+            payload.ease,
+        )
+        return scheduler_settings_out(settings, rescheduled)
+
+    try:
+        result = write_queue(engine).run(write)
+    except InvalidSchedulerSettings as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    scheduler_cache.pop(current_user.id)
+    return result
+
 
 @router.get("/stats", response_model=StatsOut)
-def get_stats(current_user: User = Depends(get_current_user)) -> StatsOut:
-    today = date.today()
-    start_today = datetime.combine(today, datetime.min.time())
+async def get_stats(
+    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     now = datetime.now()
-    start_1d = now - timedelta(days=1)
-    start_7d = now - timedelta(days=7)
-    start_30d = now - timedelta(days=30)
-    start_365d = now - timedelta(days=365)
-    next_7d = today + timedelta(days=7)
-    with Session(engine) as session:
-        today_due_count = session.exec(
-            select(func.count())
-            .select_from(Word)
-            .where(Word.user_id == current_user.id, Word.next_review <= today)
-        ).one()
-        reviewed_today_count = session.exec(
-            select(func.count())
-            .select_from(Review)
-            .where(
-                Review.user_id == current_user.id,
-                Review.reviewed_at >= start_today,
-            )
-        ).one()
-        new_words_1d = session.exec(
-            select(func.count())
-            .select_from(Word)
-            .where(Word.user_id == current_user.id, Word.created_at >= start_1d)
-        ).one()
-        new_words_7d = session.exec(
-            select(func.count())
-            .select_from(Word)
-            .where(Word.user_id == current_user.id, Word.created_at >= start_7d)
-        ).one()
-        new_words_30d = session.exec(
-            select(func.count())
-            .select_from(Word)
-            .where(Word.user_id == current_user.id, Word.created_at >= start_30d)
-        ).one()
-        new_words_365d = session.exec(
-            select(func.count())
-            .select_from(Word)
-            .where(Word.user_id == current_user.id, Word.created_at >= start_365d)
-        ).one()
-        reviews_1d = session.exec(
-            select(func.count())
-            .select_from(Review)
-            .where(
-                Review.user_id == current_user.id,
-                Review.reviewed_at >= start_1d,
-            )
-        ).one()
-        reviews_7d = session.exec(
-            select(func.count())
-            .select_from(Review)
-            .where(
-                Review.user_id == current_user.id,
-                Review.reviewed_at >= start_7d,
-            )
-        ).one()
-        reviews_30d = session.exec(
-            select(func.count())
-            .select_from(Review)
-            .where(
-                Review.user_id == current_user.id,
-                Review.reviewed_at >= start_30d,
-            )
-        ).one()
-        reviews_365d = session.exec(
-            select(func.count())
-            .select_from(Review)
-            .where(
-                Review.user_id == current_user.id,
-                Review.reviewed_at >= start_365d,
-            )
-        ).one()
-        due_next_7d = session.exec(
-            select(func.count())
-            .select_from(Word)
-            .where(
-                Word.user_id == current_user.id,
-                Word.next_review > today,
-                Word.next_review <= next_7d,
-            )
-        ).one()
-    return StatsOut(
-        today_due_count=today_due_count,
-        reviewed_today_count=reviewed_today_count,
-        new_words_1d=new_words_1d,
-        new_words_7d=new_words_7d,
-        new_words_30d=new_words_30d,
-        new_words_365d=new_words_365d,
-        reviews_1d=reviews_1d,
-        reviews_7d=reviews_7d,
-        reviews_30d=reviews_30d,
-        reviews_365d=reviews_365d,
-        due_next_7d=due_next_7d,
-    )
+    # The rolling windows move by the hour.
+    key = response_cache.key(current_user.id, "stats", now.strftime("%Y-%m-%d %H"))
+    cached = response_cache.lookup(key, if_none_match)
+    if cached is not None:
+        return cached
+    async with AsyncSession(async_engine) as session:
+        stats = await session.run_sync(compute_stats, current_user.id, now)
+    return response_cache.store(key, render_json(StatsOut, stats), if_none_match)
+
+
+@router.get("/leaderboard", response_model=LeaderboardOut)
+async def get_leaderboard(
+    limit: int = 10, current_user: User = Depends(get_current_user)
+) -> LeaderboardOut:
+    if not 1 <= limit <= LEADERBOARD_MAX_LIMIT:
+        raise HTTPException(
+            status_code=400, detail=f"limit must be 1-{LEADERBOARD_MAX_LIMIT}"
+        )
+    async with AsyncSession(async_engine) as session:
+        board = await session.run_sync(leaderboard, current_user.id, limit)
+    return LeaderboardOut.model_validate(board)
 
 
 @router.get("/stats/series")
 def get_stats_series(
-    range: str = "7d", current_user: User = Depends(get_current_user)
-) -> dict:
+    range: str = "7d",
+    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     now = datetime.now()
     range = range.lower()
     if range not in {"1d", "7d", "30d", "365d"}:
         raise HTTPException(status_code=400, detail="range must be 1d, 7d, 30d, or 365d")
+    key = response_cache.key(
+        current_user.id, "series", range, now.strftime("%Y-%m-%d %H")
+    )
+    cached = response_cache.lookup(key, if_none_match)
+    if cached is not None:
+        return cached
 
     if range == "1d":
         start = now - timedelta(hours=23)
         step = timedelta(hours=1)
         fmt = "%Y-%m-%d %H:00"
         label_fmt = "%H:00"
-        group_expr_reviews = func.strftime("%Y-%m-%d %H:00", Review.reviewed_at, "localtime")
-        group_expr_words = func.strftime("%Y-%m-%d %H:00", Word.created_at, "localtime")
     else:
         days = {"7d": 6, "30d": 29, "365d": 364}[range]
         start_date = (now.date() - timedelta(days=days))
@@ -507,8 +681,6 @@ def get_stats_series(
         step = timedelta(days=1)
         fmt = "%Y-%m-%d"
         label_fmt = "%b %d"
-        group_expr_reviews = func.strftime("%Y-%m-%d", Review.reviewed_at, "localtime")
-        group_expr_words = func.strftime("%Y-%m-%d", Word.created_at, "localtime")
 
     buckets = build_time_buckets(start, now, step, fmt)
     labels = [
@@ -516,152 +688,146 @@ def get_stats_series(
     ]
 
     with Session(engine) as session:
-        review_rows = session.exec(
-            select(group_expr_reviews, func.count())
-            .where(
-                Review.user_id == current_user.id,
-                Review.reviewed_at >= start,
-            )
-            .group_by(group_expr_reviews)
-        ).all()
-        word_rows = session.exec(
-            select(group_expr_words, func.count())
-            .where(
-                Word.user_id == current_user.id,
-                Word.created_at >= start,
-            )
-            .group_by(group_expr_words)
-        ).all()
+        if range == "1d":
+            rows = hourly_activity(session, current_user.id, start)
+        else:
+            rows = daily_activity(session, current_user.id, start.date())
 
-    review_map = {row[0]: row[1] for row in review_rows if row[0]}
-    word_map = {row[0]: row[1] for row in word_rows if row[0]}
-    reviews = [review_map.get(key, 0) for key in buckets]
-    new_words = [word_map.get(key, 0) for key in buckets]
+    activity = {bucket.strftime(fmt): counts for bucket, counts in rows.items()}
+    new_words = [activity.get(key, (0, 0))[0] for key in buckets]
+    reviews = [activity.get(key, (0, 0))[1] for key in buckets]
 
-    return {
+    series = {
         "range": range,
         "labels": labels,
         "keys": buckets,
         "new_words": new_words,
         "reviews": reviews,
     }
+    return response_cache.store(key, render_json(dict, series), if_none_match)
+
+
+@router.get("/sync", response_model=SyncOut)
+async def sync_changes(
+    since: Optional[str] = None,
+    limit: int = SYNC_PAGE_LIMIT,
+    current_user: User = Depends(get_current_user),
+) -> SyncOut:
+    if not 1 <= limit <= SYNC_PAGE_LIMIT:
+        raise HTTPException(
+            status_code=400, detail=f"limit must be 1-{SYNC_PAGE_LIMIT}"
+        )
+    try:
+        sequence = int(since or 0)
+    except ValueError:
+        sequence = -1
+    if sequence < 0:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    async with AsyncSession(async_engine) as session:
+        changes = await session.run_sync(
+            changes_since, current_user.id, sequence, limit
+        )
+    return SyncOut.model_validate(changes, from_attributes=True)
 
 
 @router.get("/words/export")
-def export_words(current_user: User = Depends(get_current_user)) -> Response:
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(
-        ["term", "translation", "example", "tags", "stage", "next_review", "created_at"]
+def export_words(
+    format: str = "csv",
+    gzip: bool = False,
+    tag: Optional[str] = None,
+    stage: Optional[int] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    format = format.lower()
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    if stage is not None and not 0 <= stage <= MAX_STAGE:
+        raise HTTPException(status_code=400, detail=f"stage must be 0-{MAX_STAGE}")
+    statement = export_statement(
+        current_user.id, normalize_tag(tag), stage, created_from, created_to
+    )
+    filename = f"vocabulary_words.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        export_chunks(engine, statement, format, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
-    with Session(engine) as session:
-        words = session.exec(
-            select(Word)
-            .where(Word.user_id == current_user.id)
-            .order_by(Word.created_at.desc())
-        ).all()
-        for word in words:
-            writer.writerow(
-                [
-                    word.term,
-                    word.translation,
-                    word.example or "",
-                    word.tags or "",
-                    word.stage,
-                    word.next_review.isoformat() if word.next_review else "",
-                    word.created_at.isoformat(timespec="seconds"),
-                ]
-            )
-    response = Response(content=output.getvalue(), media_type="text/csv; charset=utf-8")
-    response.headers["Content-Disposition"] = "attachment; filename=vocabulary_words.csv"
-    return response
 
 
 @router.post("/words/import")
 async def import_words(
-    file: UploadFile = File(...), current_user: User = Depends(get_current_user)
-) -> dict:
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    background: bool = False,
+    current_user: User = Depends(get_current_user),
+):
     if not file:
         raise HTTPException(status_code=400, detail="CSV file is required")
-    contents = await file.read()
-    if not contents:
-        raise HTTPException(status_code=400, detail="CSV file is empty")
-    try:
-        text = contents.decode("utf-8-sig")
-    except UnicodeDecodeError as exc:
-        raise HTTPException(
-            status_code=400, detail="CSV must be UTF-8 encoded"
-        ) from exc
+    size = file.size or 0
+    if background or size > IMPORT_BACKGROUND_BYTES:
+        # The upload is closed once the response is sent, so spool it to a
+        # file the job owns before handing it over.
+        with tempfile.NamedTemporaryFile(
+            prefix="vocabulary-import-", suffix=".csv", delete=False
+        ) as spool:
+            await run_in_threadpool(shutil.copyfileobj, file.file, spool)
+
+        def write(session: Session) -> ImportJob:
+            job = ImportJob(user_id=current_user.id, filename=file.filename, size=size)
+            session.add(job)
+            session.flush()
+            return job
+
+        job = await write_queue(engine).run_async(write)
+        background_tasks.add_task(run_import_job, engine, job.id, spool.name)
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": job.id, "status": job.status},
+            headers={"Location": f"/api/words/import/{job.id}"},
+        )
 
-    reader = csv.DictReader(io.StringIO(text))
-    if not reader.fieldnames:
-        raise HTTPException(status_code=400, detail="CSV must include headers")
+    try:
+        progress = await run_in_threadpool(
+            import_csv, engine, current_user.id, file.file
+        )
+    except CsvImportError as exc:
+        # Chunks before the error are committed; say how many, so a client
+        # can tell a partial import from one that saved nothing.
+        saved = exc.progress
+        detail = str(exc)
+        if saved.total:
+            detail += f"; the {saved.total} rows before it were processed"
+        return JSONResponse(
+            status_code=400,
+            content={
+                "detail": detail,
+                "imported": saved.imported,
+                "skipped": saved.skipped,
+                "total": saved.total,
+            },
+        )
+    return {
+        "imported": progress.imported,
+        "skipped": progress.skipped,
+        "total": progress.total,
+    }
 
-    imported = 0
-    skipped = 0
-    today = date.today()
-    now = datetime.now()
 
+@router.get("/words/import/{job_id}", response_model=ImportJobOut)
+def get_import_job(
+    job_id: int, current_user: User = Depends(get_current_user)
+) -> ImportJobOut:
     with Session(engine) as session:
-        for row in reader:
-            normalized = {}
-            for key, value in row.items():
-                if key is None:
-                    continue
-                normalized[str(key).strip().lower()] = "" if value is None else str(value)
-            term = normalized.get("term", "").strip()
-            translation = normalized.get("translation", "").strip()
-            if not term or not translation:
-                skipped += 1
-                continue
-
-            example_raw = normalized.get("example", "").strip()
-            tags_raw = normalized.get("tags", "").strip()
-            stage_raw = parse_stage(normalized.get("stage"))
-            next_review = parse_date(normalized.get("next_review"))
-            created_at = parse_datetime(normalized.get("created_at"))
-
-            stage = min(max(stage_raw or 0, 0), MAX_STAGE)
-            if not next_review:
-                if stage == 0:
-                    next_review = today
-                else:
-                    next_review = next_review_date(stage, today)
-
-            existing = session.exec(
-                select(Word).where(
-                    Word.user_id == current_user.id,
-                    func.lower(Word.term) == term.lower(),
-                )
-            ).first()
-            if existing:
-                merged_translation = merge_translation(existing.translation, translation)
-                merged_tags = merge_tags(existing.tags, tags_raw)
-                if (
-                    merged_translation == existing.translation
-                    and merged_tags == existing.tags
-                ):
-                    skipped += 1
-                    continue
-                existing.translation = merged_translation
-                existing.tags = merged_tags
-                session.add(existing)
-                imported += 1
-                continue
-
-            word = Word(
-                term=term,
-                translation=translation,
-                example=example_raw or None,
-                tags=normalize_tags(tags_raw),
-                stage=stage,
-                next_review=next_review,
-                created_at=created_at or now,
-                user_id=current_user.id,
-            )
-            session.add(word)
-            imported += 1
-        session.commit()
-
-    return {"imported": imported, "skipped": skipped, "total": imported + skipped}
+        job = session.get(ImportJob, job_id)
+        if not job or job.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Import job not found")
+        return ImportJobOut.model_validate(
+            job, update={"total": job.imported + job.skipped}
+        )
 
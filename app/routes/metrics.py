@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from anyio import to_thread
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..db import db_metrics, engine
+from ..services.hashing import hash_pool
+from ..services.metrics import request_metrics
+from ..services.profiler import request_profiler
+from ..services.writer import write_queue
+
+router = APIRouter()
+
+PROMETHEUS_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics() -> PlainTextResponse:
+    # The limiter belongs to the event loop, so it is sampled here rather than
+    # from a background thread.
+    limiter = to_thread.current_default_thread_limiter()
+    threadpool = limiter.statistics()
+    db = db_metrics.stats()
+    writer = write_queue(engine).stats()
+    hashing = hash_pool.stats()
+    gauges = {
+        "vocabulary_threadpool_size": (
+            "Threads for sync routes.",
+            limiter.total_tokens,
+        ),
+        "vocabulary_threadpool_busy": (
+            "Threads running sync routes.",
+            threadpool.borrowed_tokens,
+        ),
+        "vocabulary_threadpool_queued": (
+            "Sync route calls waiting for a thread.",
+            threadpool.tasks_waiting,
+        ),
+        "vocabulary_db_pool_checked_out": (
+            "Connections checked out of the pools.",
+            db["checked_out"],
+        ),
+        "vocabulary_write_queue_queued": (
+            "Writes waiting for the writer thread.",
+            writer["queued"],
+        ),
+        "vocabulary_hash_pool_queued": (
+            "Password hashes waiting for a thread.",
+            hashing["queued"],
+        ),
+    }
+    counters = {
+        "vocabulary_db_checkout_wait_seconds_total": (
+            "Total time spent waiting for a pooled connection.",
+            db["checkout_wait_seconds"],
+        ),
+        "vocabulary_db_write_seconds_total": (
+            "Total time in write statements, lock waits included.",
+            db["write_seconds"],
+        ),
+        "vocabulary_db_locked_errors_total": (
+            "'database is locked' errors.",
+            db["locked_errors"],
+        ),
+        "vocabulary_write_queue_commits_total": (
+            "Writer transactions committed.",
+            writer["commits"],
+        ),
+        "vocabulary_profiles_written_total": (
+            "Slow-request profiles dumped.",
+            request_profiler.dumped,
+        ),
+    }
+    return PlainTextResponse(
+        request_metrics.render(gauges, counters), media_type=PROMETHEUS_TEXT
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import date, datetime
 from typing import Optional
 
 from sqlmodel import SQLModel
@@ -45,10 +46,115 @@ class WordUpdate(SQLModel):
     tags: Optional[str] = None
 
 
+class WordOut(SQLModel):
+    id: int
+    user_id: Optional[int] = None
+    term: str
+    translation: str
+    example: Optional[str] = None
+    tags: Optional[str] = None
+    created_at: datetime
+    stage: int
+    next_review: date
+    highlights: Optional[dict[str, Optional[str]]] = None
+
+
+class TagStatsOut(SQLModel):
+    name: str
+    word_count: int
+    stages: list[int]
+
+
 class ReviewResult(SQLModel):
     result: str
 
 
+class ReviewAnswer(SQLModel):
+    word_id: int
+    result: str
+    reviewed_at: Optional[datetime] = None
+    idempotency_key: Optional[str] = None
+
+
+class ReviewBatch(SQLModel):
+    answers: list[ReviewAnswer]
+
+
+class ReviewBatchOut(SQLModel):
+    applied: int
+    duplicates: int
+    missing: list[int]
+    words: list[WordOut]
+
+
+class ReviewOut(SQLModel):
+    id: int
+    word_id: int
+    reviewed_at: datetime
+    result: bool
+    next_review_assigned: date
+
+
+class SyncOut(SQLModel):
+    token: str
+    more: bool
+    words: list[WordOut]
+    reviews: list[ReviewOut]
+    deleted_words: list[int]
+    deleted_reviews: list[int]
+
+
+class ReviewSummaryOut(SQLModel):
+    due_today: int
+    due_next_7d: int
+    next_due: Optional[date] = None
+
+
+class ForecastDay(SQLModel):
+    day: date
+    expected: float
+    low: float
+    high: float
+
+
+class ForecastOut(SQLModel):
+    days: int
+    pass_rate: float
+    answers: int
+    forecast: list[ForecastDay]
+
+
+class LeaderboardEntry(SQLModel):
+    rank: int
+    name: str
+    learned: int
+    you: bool = False
+
+
+class LeaderboardOut(SQLModel):
+    entries: list[LeaderboardEntry]
+    your_rank: int
+    your_learned: int
+    # Users with at least one learned word.
+    ranked_users: int
+
+
+class SchedulerSettingsIn(SQLModel):
+    scheduler: str = "fixed"
+    intervals: Optional[list[int]] = None
+    multiplier: float = 1.0
+    ease: float = 2.5
+
+
+class SchedulerSettingsOut(SQLModel):
+    scheduler: str
+    intervals: list[int]
+    multiplier: float
+    ease: float
+    stage_intervals: list[int]
+    rescheduled: int = 0
+
+
 class StatsOut(SQLModel):
     today_due_count: int
     reviewed_today_count: int
@@ -61,4 +167,25 @@ class StatsOut(SQLModel):
     reviews_30d: int
     reviews_365d: int
     due_next_7d: int
+    # Days in a row with reviews, up to today (0 once a day was missed).
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_active_day: Optional[date] = None
+    # Words at the top stage, and words per stage 0..MAX_STAGE.
+    words_learned: int = 0
+    words_per_stage: list[int] = []
+
 
+
+class ImportJobOut(SQLModel):
+    id: int
+    filename: Optional[str] = None
+    size: int
+    status: str
+    imported: int
+    skipped: int
+    total: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -3,23 +3,20 @@ from __future__ import annotations
 import base64
 import hashlib
 import hmac
-import secrets
 
+# Accounts adopted from the session-cookie branch (see adopt_legacy_users)
+# carry hashes in this format; they are replaced on the next login.
+LEGACY_SCHEME = "pbkdf2_sha256"
 
-def hash_password(password: str, *, iterations: int = 200_000) -> str:
-    salt = secrets.token_bytes(16)
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
-    return "pbkdf2_sha256${}${}${}".format(
-        iterations,
-        base64.b64encode(salt).decode("ascii"),
-        base64.b64encode(dk).decode("ascii"),
-    )
+
+def is_legacy_hash(stored: str) -> bool:
+    return stored.startswith(LEGACY_SCHEME + "$")
 
 
 def verify_password(password: str, stored: str) -> bool:
     try:
         scheme, iter_s, salt_b64, hash_b64 = stored.split("$", 3)
-        if scheme != "pbkdf2_sha256":
+        if scheme != LEGACY_SCHEME:
             return False
         iterations = int(iter_s)
         salt = base64.b64decode(salt_b64.encode("ascii"))
@@ -29,4 +26,3 @@ def verify_password(password: str, stored: str) -> bool:
 
     dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
     return hmac.compare_digest(dk, expected)
-
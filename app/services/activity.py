@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from ..models import ActivityDay, ActivityHour
+
+
+def hour_bucket(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _upsert(
+    session: Session, model, key_column: str, key, user_id: int, column: str, count: int
+) -> None:
+    statement = insert(model).values(
+        {"user_id": user_id, key_column: key, column: count}
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", key_column],
+        set_={column: getattr(model, column) + statement.excluded[column]},
+    )
+    session.execute(statement)
+
+
+def record_activity(
+    session: Session,
+    user_id: int,
+    moments: Iterable[datetime],
+    column: str,
+    delta: int = 1,
+) -> None:
+    """
+    Add `delta` to `column` ("new_words" or "reviews") of the day and hour
+    rollup rows covering each moment. Runs inside the caller's transaction.
+    """
+    days: Counter[date] = Counter()
+    hours: Counter[datetime] = Counter()
+    for moment in moments:
+        days[moment.date()] += delta
+        hours[hour_bucket(moment)] += delta
+    for day, count in days.items():
+        _upsert(session, ActivityDay, "day", day, user_id, column, count)
+    for hour, count in hours.items():
+        _upsert(session, ActivityHour, "hour", hour, user_id, column, count)
+
+
+def daily_activity(
+    session: Session, user_id: int, start: date
+) -> dict[date, tuple[int, int]]:
+    rows = session.exec(
+        select(ActivityDay.day, ActivityDay.new_words, ActivityDay.reviews).where(
+            ActivityDay.user_id == user_id, ActivityDay.day >= start
+        )
+    ).all()
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+def hourly_activity(
+    session: Session, user_id: int, start: datetime, end: Optional[datetime] = None
+) -> dict[datetime, tuple[int, int]]:
+    statement = select(
+        ActivityHour.hour, ActivityHour.new_words, ActivityHour.reviews
+    ).where(ActivityHour.user_id == user_id, ActivityHour.hour >= hour_bucket(start))
+    if end is not None:
+        statement = statement.where(ActivityHour.hour < end)
+    return {row[0]: (row[1], row[2]) for row in session.exec(statement).all()}
+
+
+_BACKFILL_SOURCE = """
+    SELECT user_id, created_at AS moment, 1 AS new_words, 0 AS reviews
+    FROM word WHERE user_id IS NOT NULL {word_filter}
+    UNION ALL
+    SELECT user_id, reviewed_at, 0, 1
+    FROM review WHERE user_id IS NOT NULL {review_filter}
+"""
+
+
+def backfill_activity(session: Session, user_id: Optional[int] = None) -> int:
+    """
+    Rebuild the rollup tables from the word and review history, for one
+    user or for everyone. Returns the number of daily rows written.
+    """
+    params = {}
+    word_filter = review_filter = ""
+    if user_id is not None:
+        params["uid"] = user_id
+        word_filter = "AND word.user_id = :uid"
+        review_filter = "AND review.user_id = :uid"
+    source = _BACKFILL_SOURCE.format(
+        word_filter=word_filter, review_filter=review_filter
+    )
+    scope = "WHERE user_id = :uid" if user_id is not None else ""
+    session.execute(text(f"DELETE FROM activityday {scope}"), params)
+    session.execute(text(f"DELETE FROM activityhour {scope}"), params)
+    session.execute(
+        text(
+            "INSERT INTO activityday (user_id, day, new_words, reviews) "
+            "SELECT user_id, date(moment), sum(new_words), sum(reviews) "
+            f"FROM ({source}) GROUP BY user_id, date(moment)"
+        ),
+        params,
+    )
+    # Match SQLAlchemy's DATETIME storage format so upserts hit these rows.
+    session.execute(
+        text(
+            "INSERT INTO activityhour (user_id, hour, new_words, reviews) "
+            "SELECT user_id, strftime('%Y-%m-%d %H:00:00.000000', moment), "
+            "sum(new_words), sum(reviews) "
+            f"FROM ({source}) GROUP BY user_id, strftime('%Y-%m-%d %H', moment)"
+        ),
+        params,
+    )
+    return session.execute(
+        text(f"SELECT count(*) FROM activityday {scope}"), params
+    ).scalar_one()
+
+
+def ensure_activity_rollups(session: Session) -> None:
+    """Backfill once when the rollup tables are introduced on an existing database."""
+    if session.exec(select(ActivityDay.user_id).limit(1)).first() is not None:
+        return
+    backfill_activity(session)
+    session.commit()
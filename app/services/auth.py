@@ -6,9 +6,32 @@ from typing import Optional
 import jwt
 from passlib.context import CryptContext
 
-from ..settings import JWT_ALGORITHM, JWT_EXPIRE_MINUTES, JWT_SECRET
+from ..models import User
+from ..security import is_legacy_hash, verify_password as verify_legacy_password
+from ..settings import (
+    BCRYPT_ROUNDS,
+    JWT_ALGORITHM,
+    JWT_EXPIRE_MINUTES,
+    JWT_SECRET,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL_SECONDS,
+)
+from .cache import TTLCache
+from .hashing import hash_pool
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with fewer rounds than configured report needs_update and are
+# rehashed on the next successful login, like legacy pbkdf2 hashes.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+
+# Token subject (lower-cased email) -> detached User, so authenticated
+# requests skip the user lookup. Entries must be dropped with
+# invalidate_user() whenever verification, password or existence changes.
+user_cache: TTLCache[str, User] = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS)
 
 
 def hash_password(password: str) -> str:
@@ -19,6 +42,25 @@ def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
 
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run(hash_password, password)
+
+
+def _verify_and_update(password: str, hashed: str) -> tuple[bool, Optional[str]]:
+    if is_legacy_hash(hashed):
+        if not verify_legacy_password(password, hashed):
+            return False, None
+        return True, hash_password(password)
+    return pwd_context.verify_and_update(password, hashed)
+
+
+async def verify_and_update_password(
+    password: str, hashed: str
+) -> tuple[bool, Optional[str]]:
+    """Verify on the hash pool; also return a fresh hash if `hashed` is outdated."""
+    return await hash_pool.run(_verify_and_update, password, hashed)
+
+
 def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
     expire = datetime.utcnow() + timedelta(
         minutes=expires_minutes or JWT_EXPIRE_MINUTES
@@ -33,3 +75,7 @@ def decode_access_token(token: str) -> Optional[str]:
         return payload.get("sub")
     except jwt.PyJWTError:
         return None
+
+
+def invalidate_user(email: str) -> None:
+    user_cache.pop(email.strip().lower())
@@ -2,22 +2,104 @@ from __future__ import annotations
 
 import smtplib
 from email.message import EmailMessage
+from pathlib import Path
+from typing import Optional
 
-from ..settings import SMTP_FROM, SMTP_HOST, SMTP_PASSWORD, SMTP_PORT, SMTP_USER
+from ..settings import (
+    EMAIL_FILE_DIR,
+    EMAIL_TRANSPORT,
+    SMTP_FROM,
+    SMTP_HOST,
+    SMTP_PASSWORD,
+    SMTP_PORT,
+    SMTP_USER,
+)
 
+VERIFICATION_SUBJECT = "Vocabulary verification code"
 
-def send_verification_email(to_email: str, code: str) -> None:
-    if not SMTP_HOST or not SMTP_USER or not SMTP_PASSWORD or not SMTP_FROM:
-        raise RuntimeError("SMTP is not configured")
 
+def verification_body(code: str) -> str:
+    return f"Your verification code is {code}. It expires in 10 minutes."
+
+
+def build_message(to_email: str, subject: str, body: str) -> EmailMessage:
     message = EmailMessage()
-    message["Subject"] = "Vocabulary verification code"
+    message["Subject"] = subject
     message["From"] = SMTP_FROM
     message["To"] = to_email
-    message.set_content(
-        f"Your verification code is {code}. It expires in 10 minutes."
-    )
+    message.set_content(body)
+    return message
+
+
+class SmtpTransport:
+    """Keeps one SMTP_SSL connection open across sends until close()."""
+
+    def __init__(self) -> None:
+        self._server: Optional[smtplib.SMTP_SSL] = None
 
-    with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT) as server:
+    def _connect(self) -> smtplib.SMTP_SSL:
+        if not SMTP_HOST or not SMTP_USER or not SMTP_PASSWORD or not SMTP_FROM:
+            raise RuntimeError("SMTP is not configured")
+        server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT)
         server.login(SMTP_USER, SMTP_PASSWORD)
-        server.send_message(message)
+        return server
+
+    def send(self, message: EmailMessage) -> None:
+        if self._server is None:
+            self._server = self._connect()
+        try:
+            self._server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped an idle connection; reconnect once.
+            self._server = self._connect()
+            self._server.send_message(message)
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except smtplib.SMTPException:
+            pass
+        finally:
+            self._server = None
+
+
+class FileTransport:
+    """Writes each message as an .eml file, for local development."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def send(self, message: EmailMessage) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index = len(list(self.directory.glob("*.eml")))
+        path = self.directory / f"{index:06d}-{message['To']}.eml"
+        path.write_bytes(bytes(message))
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryTransport:
+    """Collects messages in memory, for tests."""
+
+    def __init__(self) -> None:
+        self.sent: list[EmailMessage] = []
+
+    def send(self, message: EmailMessage) -> None:
+        self.sent.append(message)
+
+    def close(self) -> None:
+        pass
+
+
+def make_transport(kind: str = EMAIL_TRANSPORT):
+    if kind == "smtp":
+        return SmtpTransport()
+    if kind == "file":
+        return FileTransport(EMAIL_FILE_DIR)
+    if kind == "memory":
+        return MemoryTransport()
+    raise ValueError(f"Unknown email transport: {kind}")
+
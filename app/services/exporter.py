@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy.engine import Engine
+from sqlmodel import select
+
+from ..models import Word
+from ..settings import EXPORT_CHUNK_SIZE
+from .tags import tag_filter
+
+EXPORT_COLUMNS = [
+    "term",
+    "translation",
+    "example",
+    "tags",
+    "stage",
+    "next_review",
+    "created_at",
+]
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_statement(
+    user_id: int,
+    tag: Optional[str] = None,
+    stage: Optional[int] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+):
+    """Column-only select, newest first (served by ix_word_user_created_at)."""
+    statement = select(*(getattr(Word, column) for column in EXPORT_COLUMNS)).where(
+        Word.user_id == user_id
+    )
+    if tag:
+        statement = statement.where(tag_filter(user_id, tag))
+    if stage is not None:
+        statement = statement.where(Word.stage == stage)
+    if created_from:
+        statement = statement.where(Word.created_at >= created_from)
+    if created_to:
+        statement = statement.where(Word.created_at < created_to + timedelta(days=1))
+    return statement.order_by(Word.created_at.desc())
+
+
+def stream_rows(
+    engine: Engine, statement, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[list]:
+    """Yield lists of at most `chunk_size` rows from one open cursor."""
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size).execute(statement)
+        for partition in result.partitions():
+            yield partition
+
+
+def _export_values(row) -> list:
+    term, translation, example, tags, stage, next_review, created_at = row
+    return [
+        term,
+        translation,
+        example or "",
+        tags or "",
+        stage,
+        next_review.isoformat() if next_review else "",
+        created_at.isoformat(timespec="seconds"),
+    ]
+
+
+def csv_chunks(partitions: Iterable[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in partitions:
+        writer.writerows(_export_values(row) for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # A deck with no rows still gets its header line.
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _export_record(row) -> dict:
+    record = dict(zip(EXPORT_COLUMNS, row))
+    if record["next_review"]:
+        record["next_review"] = record["next_review"].isoformat()
+    record["created_at"] = record["created_at"].isoformat(timespec="seconds")
+    return record
+
+
+def ndjson_chunks(partitions: Iterable[list]) -> Iterator[bytes]:
+    for rows in partitions:
+        yield "".join(
+            json.dumps(_export_record(row), ensure_ascii=False) + "\n" for row in rows
+        ).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    # wbits=31 writes a gzip header and trailer around the deflate stream.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(
+    engine: Engine, statement, fmt: str = "csv", compress: bool = False
+) -> Iterator[bytes]:
+    """Encoded export body for StreamingResponse, produced one chunk at a time."""
+    encode = csv_chunks if fmt == "csv" else ndjson_chunks
+    chunks = encode(stream_rows(engine, statement))
+    return gzip_chunks(chunks) if compress else chunks
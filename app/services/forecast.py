@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import Integer, func
+from sqlmodel import Session, select
+
+from ..models import Review, Word
+from .scheduler import MAX_STAGE, Scheduler, scheduler_for
+
+MAX_FORECAST_DAYS = 365
+# Pass rate assumed without history, and how many answers it weighs as.
+PRIOR_PASS_RATE = 0.85
+PRIOR_WEIGHT = 20
+# Answers the pass rate is estimated from: the user's most recent ones.
+HISTORY_SIZE = 1000
+# Two-sided 95% normal band.
+Z_95 = 1.96
+
+
+def pass_rate(session: Session, user_id: int) -> tuple[float, int]:
+    """Share of right answers among the user's recent reviews, shrunk towards the prior."""
+    recent = (
+        select(Review.result)
+        .where(Review.user_id == user_id)
+        .order_by(Review.reviewed_at.desc())
+        .limit(HISTORY_SIZE)
+        .subquery()
+    )
+    answers, good = session.exec(
+        # Typed as Integer, or the SUM of a Boolean column comes back as a bool.
+        select(func.count(), func.coalesce(func.sum(recent.c.result, type_=Integer), 0))
+    ).one()
+    rate = (good + PRIOR_PASS_RATE * PRIOR_WEIGHT) / (answers + PRIOR_WEIGHT)
+    return rate, answers
+
+
+def due_curves(scheduler: Scheduler, rate: float, days: int) -> np.ndarray:
+    """
+    curves[s, t]: probability that one card due on day 0 at stage s comes
+    due on day t, reviewing everything on the day it is due. Each review
+    moves the card up a stage with probability `rate` and back to stage 0
+    otherwise. Propagated for all starting stages at once.
+    """
+    stages = MAX_STAGE + 1
+    span = days + max(scheduler.stage_intervals) + 1
+    # due[start stage, day, current stage]
+    due = np.zeros((stages, span, stages))
+    due[np.arange(stages), 0, np.arange(stages)] = 1.0
+    for day in range(days):
+        mass = due[:, day, :]
+        for stage in range(stages):
+            promoted = min(stage + 1, MAX_STAGE)
+            due[:, day + scheduler.interval(promoted), promoted] += rate * mass[:, stage]
+        due[:, day + scheduler.interval(0), 0] += (1 - rate) * mass.sum(axis=1)
+    return due[:, :days, :].sum(axis=2)
+
+
+def forecast_reviews(
+    session: Session, user_id: int, today: date, days: int
+) -> dict:
+    """
+    Expected reviews per day for the next `days` days with a 95% band.
+
+    Cards are bucketed by (stage, due day); overdue cards count as due
+    today. A card's future only depends on its stage and due day, so each
+    bucket's load is the stage's curve shifted to the due day, and the
+    deck's load is one convolution per stage. Cards are independent, so the
+    variance adds up the same way, from curve * (1 - curve). Under the
+    geometric scheduler cards keep their own ease and interval; the
+    forecast follows the stage table instead, which is what a card with the
+    user's ease is given.
+    """
+    rate, answers = pass_rate(session, user_id)
+    scheduler = scheduler_for(session, user_id)
+    counts = np.zeros((MAX_STAGE + 1, days))
+    # (next_review, stage) order matches ix_word_user_next_review, so the
+    # grouping reads the index in order without a sort.
+    buckets = session.exec(
+        select(Word.next_review, Word.stage, func.count())
+        .where(Word.user_id == user_id, Word.next_review < today + timedelta(days=days))
+        .group_by(Word.next_review, Word.stage)
+    ).all()
+    for next_review, stage, count in buckets:
+        counts[stage, max((next_review - today).days, 0)] += count
+
+    curves = due_curves(scheduler, rate, days)
+    expected = np.zeros(days)
+    variance = np.zeros(days)
+    for stage in range(MAX_STAGE + 1):
+        expected += np.convolve(counts[stage], curves[stage])[:days]
+        variance += np.convolve(counts[stage], curves[stage] * (1 - curves[stage]))[:days]
+    spread = Z_95 * np.sqrt(variance)
+    return {
+        "days": days,
+        "pass_rate": round(rate, 4),
+        "answers": answers,
+        "forecast": [
+            {
+                "day": today + timedelta(days=offset),
+                "expected": round(float(expected[offset]), 1),
+                "low": round(float(max(expected[offset] - spread[offset], 0.0)), 1),
+                "high": round(float(expected[offset] + spread[offset]), 1),
+            }
+            for offset in range(days)
+        ],
+    }
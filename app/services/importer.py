@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import csv
+import io
+import os
+import string
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import count, islice
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from ..models import ImportJob, Word
+from ..settings import IMPORT_CHUNK_SIZE
+from .activity import record_activity
+from .scheduler import MAX_STAGE, scheduler_for
+from .tags import chunked, normalize_tags, sync_word_tags
+from .writer import write_queue
+
+
+class CsvImportError(ValueError):
+    """
+    The upload cannot be read as a CSV deck. `progress` counts the rows
+    committed before the error, which stay imported.
+    """
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.progress = ImportProgress()
+
+
+@dataclass
+class ImportProgress:
+    imported: int = 0
+    skipped: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.imported + self.skipped
+
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def fold_term(term: str) -> str:
+    """
+    Lower-case `term` the way SQLite's lower() does, folding only ASCII,
+    so keys built here match func.lower(Word.term) and its index.
+    """
+    return term.translate(_ASCII_LOWER)
+
+
+def parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def parse_stage(value: Optional[str]) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def merge_translation(existing: str, incoming: str) -> str:
+    existing = existing.strip()
+    incoming = incoming.strip()
+    if not existing:
+        return ", ".join(
+            [part for part in (p.strip() for p in incoming.split(",")) if part]
+        )
+    if not incoming:
+        return existing
+    parts = [part.strip() for part in existing.split(",") if part.strip()]
+    lower_parts = {part.lower() for part in parts}
+    for part in incoming.split(","):
+        cleaned = part.strip()
+        if not cleaned:
+            continue
+        if cleaned.lower() in lower_parts:
+            continue
+        parts.append(cleaned)
+        lower_parts.add(cleaned.lower())
+    return ", ".join(parts)
+
+
+def merge_tags(existing: Optional[str], incoming: Optional[str]) -> Optional[str]:
+    normalized_existing = normalize_tags(existing)
+    normalized_incoming = normalize_tags(incoming)
+    if not normalized_existing:
+        return normalized_incoming
+    if not normalized_incoming:
+        return normalized_existing
+    parts = [part.strip() for part in normalized_existing.split(",") if part.strip()]
+    lower_parts = {part.lower() for part in parts}
+    for tag in normalized_incoming.split(","):
+        tag = tag.strip()
+        if not tag:
+            continue
+        if tag.lower() in lower_parts:
+            continue
+        parts.append(tag)
+        lower_parts.add(tag.lower())
+    return ",".join(parts)
+
+
+def read_rows(stream: BinaryIO) -> Iterator[dict[str, str]]:
+    """
+    Decode and parse the upload lazily, yielding rows with lower-cased,
+    stripped header keys. Raises CsvImportError for empty, headerless or
+    non-UTF-8 input.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        try:
+            fieldnames = reader.fieldnames
+        except UnicodeDecodeError as exc:
+            raise CsvImportError("CSV must be UTF-8 encoded") from exc
+        if fieldnames is None:
+            raise CsvImportError("CSV file is empty")
+        if not any(name and name.strip() for name in fieldnames):
+            raise CsvImportError("CSV must include headers")
+        for number in count(1):
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except UnicodeDecodeError as exc:
+                raise CsvImportError("CSV must be UTF-8 encoded") from exc
+            except csv.Error as exc:
+                raise CsvImportError(
+                    f"Malformed CSV at row {number}: {exc}"
+                ) from exc
+            yield {
+                str(key).strip().lower(): "" if value is None else str(value)
+                for key, value in row.items()
+                if key is not None
+            }
+    finally:
+        # Leave the underlying upload open for the caller to close.
+        text.detach()
+
+
+def _existing_words(
+    session: Session, user_id: int, terms: list[str]
+) -> dict[str, dict]:
+    existing = {}
+    for batch in chunked(terms):
+        rows = session.exec(
+            select(Word.id, Word.term, Word.translation, Word.tags).where(
+                Word.user_id == user_id, func.lower(Word.term).in_(batch)
+            )
+        )
+        for word_id, term, translation, tags in rows:
+            existing.setdefault(
+                fold_term(term),
+                {"id": word_id, "term": term, "translation": translation, "tags": tags},
+            )
+    return existing
+
+
+def import_chunk(
+    session: Session,
+    user_id: int,
+    rows: list[dict[str, str]],
+    progress: ImportProgress,
+    today: date,
+    now: datetime,
+) -> None:
+    """
+    Merge one chunk of parsed rows into the user's deck: resolve existing
+    terms with one IN query, then insert and update with executemany.
+    Runs inside the caller's transaction.
+    """
+    valid = [
+        row
+        for row in rows
+        if row.get("term", "").strip() and row.get("translation", "").strip()
+    ]
+    progress.skipped += len(rows) - len(valid)
+    scheduler = scheduler_for(session, user_id)
+    existing = _existing_words(
+        session, user_id, sorted({fold_term(row["term"].strip()) for row in valid})
+    )
+    inserts: dict[str, dict] = {}
+    updates: dict[int, dict] = {}
+
+    for row in valid:
+        term = row["term"].strip()
+        translation = row["translation"].strip()
+        tags_raw = row.get("tags", "").strip()
+        key = fold_term(term)
+        # Rows earlier in this chunk count as existing words too.
+        current = inserts.get(key) or existing.get(key)
+        if current is not None:
+            merged_translation = merge_translation(current["translation"], translation)
+            merged_tags = merge_tags(current["tags"], tags_raw)
+            if (
+                merged_translation == current["translation"]
+                and merged_tags == current["tags"]
+            ):
+                progress.skipped += 1
+                continue
+            current["translation"] = merged_translation
+            current["tags"] = merged_tags
+            if key not in inserts:
+                updates[current["id"]] = current
+            progress.imported += 1
+            continue
+
+        stage = min(max(parse_stage(row.get("stage")) or 0, 0), MAX_STAGE)
+        next_review = parse_date(row.get("next_review"))
+        interval = None
+        if not next_review and stage == 0:
+            next_review = today
+        elif not next_review:
+            interval = scheduler.interval(stage)
+            next_review = today + timedelta(days=interval)
+        inserts[key] = {
+            "user_id": user_id,
+            "term": term,
+            "translation": translation,
+            "example": row.get("example", "").strip() or None,
+            "tags": normalize_tags(tags_raw),
+            "stage": stage,
+            "next_review": next_review,
+            "interval": interval,
+            "created_at": parse_datetime(row.get("created_at")) or now,
+        }
+        progress.imported += 1
+
+    retagged = {word_id: word["tags"] for word_id, word in updates.items()}
+    if updates:
+        session.execute(
+            update(Word),
+            [
+                {"id": word["id"], "translation": word["translation"], "tags": word["tags"]}
+                for word in updates.values()
+            ],
+        )
+    if inserts:
+        new_words = list(inserts.values())
+        # A plain executemany is one cursor call; INSERT ... RETURNING would
+        # fall back to a statement per row, so read the new ids back instead.
+        session.execute(Word.__table__.insert(), new_words)
+        created = _existing_words(session, user_id, sorted(inserts))
+        retagged.update(
+            {
+                word["id"]: inserts[key]["tags"]
+                for key, word in created.items()
+                if word["term"] == inserts[key]["term"]
+            }
+        )
+        record_activity(
+            session, user_id, [word["created_at"] for word in new_words], "new_words"
+        )
+    sync_word_tags(session, user_id, retagged)
+
+
+def import_csv(
+    engine: Engine,
+    user_id: int,
+    stream: BinaryIO,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    on_progress: Optional[Callable[[ImportProgress], None]] = None,
+) -> ImportProgress:
+    """
+    Stream a CSV deck into the user's words, committing every `chunk_size`
+    rows through the write queue so a large file never holds the write
+    lock for long. Rows that miss a term or translation are skipped. A
+    CsvImportError part-way through carries the progress of the chunks
+    already committed.
+    """
+    progress = ImportProgress()
+    rows = read_rows(stream)
+    today = date.today()
+    now = datetime.now()
+    while True:
+        try:
+            chunk = list(islice(rows, chunk_size))
+        except CsvImportError as exc:
+            exc.progress = progress
+            raise
+        if not chunk:
+            break
+        write_queue(engine).run(
+            lambda session: import_chunk(session, user_id, chunk, progress, today, now)
+        )
+        if on_progress is not None:
+            on_progress(progress)
+    return progress
+
+
+def run_import_job(engine: Engine, job_id: int, path: str) -> None:
+    """Import a spooled upload for an ImportJob, recording progress on the row."""
+
+    def save(**values) -> None:
+        write_queue(engine).run(
+            lambda session: session.execute(
+                update(ImportJob).where(ImportJob.id == job_id).values(**values)
+            )
+        )
+
+    def report(progress: ImportProgress) -> None:
+        save(imported=progress.imported, skipped=progress.skipped)
+
+    with Session(engine) as session:
+        job = session.get(ImportJob, job_id)
+        user_id = job.user_id
+    save(status="running", started_at=datetime.now())
+    try:
+        with open(path, "rb") as stream:
+            progress = import_csv(engine, user_id, stream, on_progress=report)
+    except Exception as exc:
+        message = str(exc) if isinstance(exc, CsvImportError) else "Import failed"
+        save(status="failed", error=message, finished_at=datetime.now())
+        if not isinstance(exc, CsvImportError):
+            raise
+    else:
+        save(
+            status="done",
+            imported=progress.imported,
+            skipped=progress.skipped,
+            finished_at=datetime.now(),
+        )
+    finally:
+        os.unlink(path)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlmodel import Session, select
+
+from ..models import ScoreCount, StageCount, User
+from ..settings import LEADERBOARD_MAX_LIMIT, LEADERBOARD_TTL_SECONDS
+from .cache import TTLCache
+from .scheduler import MAX_STAGE
+
+
+@dataclass
+class Ranking:
+    """
+    The top LEADERBOARD_MAX_LIMIT users as (rank, user_id, email, score),
+    best first, and how many users have learned at least one word.
+    Competition ranking: ties share a rank and the next rank skips ahead.
+    """
+
+    top: list[tuple[int, int, str, int]]
+    ranked_users: int
+
+
+def load_ranking(session: Session) -> Ranking:
+    """
+    Walk ix_stagecount_learned in order for the top entries, stopping after
+    LEADERBOARD_MAX_LIMIT rows, and count everyone from the lowest score
+    row. Neither read grows with the number of users.
+    """
+    rows = session.exec(
+        select(StageCount.user_id, User.email, StageCount.words)
+        .join(User, User.id == StageCount.user_id)
+        .where(StageCount.stage == MAX_STAGE)
+        .order_by(StageCount.words.desc(), StageCount.user_id)
+        .limit(LEADERBOARD_MAX_LIMIT)
+    ).all()
+    top = []
+    for position, (user_id, email, score) in enumerate(rows, 1):
+        # Emptied stage rows stay at 0 and sort last.
+        if score <= 0:
+            break
+        rank = top[-1][0] if top and top[-1][3] == score else position
+        top.append((rank, user_id, email, score))
+    return Ranking(top, users_ahead(session, 0))
+
+
+ranking_cache: TTLCache[str, Ranking] = TTLCache(1, LEADERBOARD_TTL_SECONDS)
+
+
+def current_ranking(session: Session) -> Ranking:
+    """The process's ranking, rebuilt at most once per LEADERBOARD_TTL_SECONDS."""
+    ranking = ranking_cache.get("ranking")
+    if ranking is None:
+        ranking = load_ranking(session)
+        ranking_cache.set("ranking", ranking)
+    return ranking
+
+
+def users_ahead(session: Session, score: int) -> int:
+    """
+    Users with a higher score: the lowest score row above `score`, its
+    users plus those ahead of it. One primary-key seek.
+    """
+    ahead = session.exec(
+        select(ScoreCount.ahead + ScoreCount.users)
+        .where(ScoreCount.score > score)
+        .order_by(ScoreCount.score)
+        .limit(1)
+    ).first()
+    return ahead or 0
+
+
+def display_name(email: str) -> str:
+    """Enough of the address to recognise yourself, not enough to mail anyone."""
+    local = email.split("@", 1)[0]
+    return local[:2] + "***"
+
+
+def leaderboard(session: Session, user_id: int, limit: int) -> dict:
+    """
+    Top `limit` users by learned words (words at MAX_STAGE) from the
+    cached ranking, plus the caller's own score and rank, both read live.
+    """
+    ranking = current_ranking(session)
+    learned = session.exec(
+        select(StageCount.words).where(
+            StageCount.user_id == user_id, StageCount.stage == MAX_STAGE
+        )
+    ).first() or 0
+    entries = [
+        {
+            "rank": rank,
+            "name": display_name(email),
+            "learned": score,
+            "you": uid == user_id,
+        }
+        for rank, uid, email, score in ranking.top[:limit]
+    ]
+    return {
+        "entries": entries,
+        "your_rank": users_ahead(session, learned) + 1,
+        "your_learned": learned,
+        "ranked_users": ranking.ranked_users,
+    }
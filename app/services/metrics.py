@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .profiler import request_profiler
+
+# Upper bounds in seconds; the routes here mostly answer in a millisecond or two.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+# Route label for statements run outside any request (outbox worker, startup).
+BACKGROUND = "background"
+
+
+@dataclass
+class RequestStats:
+    """SQL work done on behalf of one request, filled in by the engine events."""
+
+    route: str = BACKGROUND
+    statements: int = 0
+    sql_seconds: float = 0.0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request", default=None
+)
+
+
+class Histogram:
+    """Cumulative Prometheus histogram with one series per label tuple."""
+
+    def __init__(self, buckets: Iterable[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+
+def label_text(names: tuple[str, ...], values: tuple) -> str:
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class RequestMetrics:
+    """
+    Process-wide request and SQL metrics in Prometheus text format. The
+    middleware records one latency observation per request; the engine
+    events add each statement's count and time to the request running it,
+    found through a context variable, so a slow route can be split into
+    time spent in SQLite and time spent everywhere else.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: dict[tuple[str, str, int], int] = {}
+            self.latency = Histogram(LATENCY_BUCKETS)
+            self.statements: dict[str, int] = {}
+            self.sql_seconds: dict[str, float] = {}
+            self.in_flight = 0
+
+    def start_request(self) -> RequestStats:
+        with self._lock:
+            self.in_flight += 1
+        return RequestStats()
+
+    def finish_request(
+        self, stats: RequestStats, method: str, status: int, seconds: float
+    ) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, stats.route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.observe((method, stats.route), seconds)
+            self._add_sql(stats.route, stats.statements, stats.sql_seconds)
+
+    def _add_sql(self, route: str, statements: int, seconds: float) -> None:
+        self.statements[route] = self.statements.get(route, 0) + statements
+        self.sql_seconds[route] = self.sql_seconds.get(route, 0.0) + seconds
+
+    def record_statement(self, seconds: float) -> None:
+        stats = current_request.get()
+        if stats is not None:
+            # Only this request's own tasks and threads write to it.
+            stats.statements += 1
+            stats.sql_seconds += seconds
+            return
+        with self._lock:
+            self._add_sql(BACKGROUND, 1, seconds)
+
+    def attach(self, engine: Engine) -> None:
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info["statement_started"] = time.perf_counter()
+
+        def after_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info.pop("statement_started", None)
+            if started is not None:
+                self.record_statement(time.perf_counter() - started)
+
+        def handle_error(context) -> None:
+            if context.connection is not None:
+                started = context.connection.info.pop("statement_started", None)
+                if started is not None:
+                    self.record_statement(time.perf_counter() - started)
+
+        event.listen(engine, "before_cursor_execute", before_execute)
+        event.listen(engine, "after_cursor_execute", after_execute)
+        event.listen(engine, "handle_error", handle_error)
+
+    def render(
+        self,
+        gauges: dict[str, tuple[str, float]],
+        counters: dict[str, tuple[str, float]],
+    ) -> str:
+        """
+        Prometheus text exposition (version 0.0.4) of everything recorded,
+        plus `gauges` and `counters`: name -> (help, value) sampled by the
+        caller from the process's other stats.
+        """
+        lines: list[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            name = "vocabulary_http_requests_total"
+            header(name, "counter", "HTTP requests by method, route template and status.")
+            for labels, count in sorted(self.requests.items()):
+                text = label_text(("method", "route", "status"), labels)
+                lines.append(f"{name}{text} {count}")
+
+            name = "vocabulary_http_request_duration_seconds"
+            header(name, "histogram", "Time from request start to the last body byte.")
+            for labels, (counts, total, observed) in sorted(self.latency.series.items()):
+                cumulative = 0
+                for bound, count in zip(self.latency.buckets, counts):
+                    cumulative += count
+                    text = label_text(("method", "route", "le"), (*labels, bound))
+                    lines.append(f"{name}_bucket{text} {cumulative}")
+                text = label_text(("method", "route", "le"), (*labels, "+Inf"))
+                lines.append(f"{name}_bucket{text} {observed}")
+                text = label_text(("method", "route"), labels)
+                lines.append(f"{name}_sum{text} {total}")
+                lines.append(f"{name}_count{text} {observed}")
+
+            name = "vocabulary_http_requests_in_flight"
+            header(name, "gauge", "Requests being handled right now.")
+            lines.append(f"{name} {self.in_flight}")
+
+            name = "vocabulary_sql_statements_total"
+            header(name, "counter", "SQL statements executed, by the route that ran them.")
+            for route, count in sorted(self.statements.items()):
+                lines.append(f"{name}{label_text(('route',), (route,))} {count}")
+
+            name = "vocabulary_sql_seconds_total"
+            header(name, "counter", "Time spent executing SQL statements, by route.")
+            for route, seconds in sorted(self.sql_seconds.items()):
+                lines.append(f"{name}{label_text(('route',), (route,))} {seconds}")
+
+        for kind, values in (("gauge", gauges), ("counter", counters)):
+            for name, (help_text, value) in values.items():
+                header(name, kind, help_text)
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def route_label(scope: Scope) -> str:
+    """The matched route's template, the mount path for mounted apps (static files)."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope.get("endpoint") is not None and scope.get("root_path"):
+        return scope["root_path"]
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware task hop per request)
+    that times each HTTP request up to its last body byte, so streamed
+    exports count in full, labels it with the matched route template, and
+    hands it to the opt-in profiler.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = self.metrics.start_request()
+        token = current_request.set(stats)
+        sampler = request_profiler.start()
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            stats.route = route_label(scope)
+            self.metrics.finish_request(stats, scope["method"], status, elapsed)
+            if sampler is not None:
+                request_profiler.finish(sampler, scope["method"], stats.route, elapsed)
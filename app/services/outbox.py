@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from ..models import EmailOutbox
+from ..settings import OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, OUTBOX_POLL_SECONDS
+from .email import VERIFICATION_SUBJECT, build_message, make_transport, verification_body
+
+logger = logging.getLogger(__name__)
+
+LEASE = timedelta(minutes=2)
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+# Atomically lease a batch of due messages so several app processes can
+# run workers against the same database without double-sending.
+_CLAIM = text(
+    """
+    UPDATE emailoutbox SET locked_until = :lease
+    WHERE id IN (
+        SELECT id FROM emailoutbox
+        WHERE sent_at IS NULL AND failed_at IS NULL
+          AND next_attempt_at <= :now
+          AND (locked_until IS NULL OR locked_until < :now)
+        ORDER BY next_attempt_at
+        LIMIT :limit
+    )
+    RETURNING id, to_email, subject, body, attempts
+    """
+)
+
+
+def enqueue_verification_email(session: Session, to_email: str, code: str) -> None:
+    """Queue the message inside the caller's transaction."""
+    session.add(
+        EmailOutbox(
+            to_email=to_email,
+            subject=VERIFICATION_SUBJECT,
+            body=verification_body(code),
+        )
+    )
+
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(
+        seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    )
+
+
+def _format(moment: datetime) -> str:
+    # Same layout SQLAlchemy uses for DATETIME on SQLite, so text comparisons hold.
+    return moment.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def deliver_batch(engine: Engine, transport, limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """
+    Send up to `limit` due messages over `transport`, recording success or
+    scheduling a retry with exponential backoff. Returns how many were claimed.
+    """
+    now = datetime.now()
+    with engine.begin() as conn:
+        claimed = conn.execute(
+            _CLAIM,
+            {"now": _format(now), "lease": _format(now + LEASE), "limit": limit},
+        ).fetchall()
+    if not claimed:
+        return 0
+
+    results = []
+    for row_id, to_email, subject, body, attempts in claimed:
+        try:
+            transport.send(build_message(to_email, subject, body))
+        except Exception as exc:
+            logger.warning("Email %s to %s failed: %s", row_id, to_email, exc)
+            results.append((row_id, attempts + 1, str(exc)))
+        else:
+            results.append((row_id, attempts + 1, None))
+
+    finished = datetime.now()
+    with Session(engine) as session:
+        for row_id, attempts, error in results:
+            message = session.get(EmailOutbox, row_id)
+            message.attempts = attempts
+            message.locked_until = None
+            message.last_error = error
+            if error is None:
+                message.sent_at = finished
+            elif attempts >= OUTBOX_MAX_ATTEMPTS:
+                message.failed_at = finished
+            else:
+                message.next_attempt_at = finished + backoff(attempts)
+            session.add(message)
+        session.commit()
+    return len(claimed)
+
+
+def drain(engine: Engine, transport) -> int:
+    """Deliver batches until nothing is due. Returns the number of messages tried."""
+    total = 0
+    try:
+        while count := deliver_batch(engine, transport):
+            total += count
+    finally:
+        transport.close()
+    return total
+
+
+class OutboxWorker:
+    """
+    Background thread that drains the outbox every `poll_seconds`, or
+    immediately after wake(). The transport (and its SMTP connection) is
+    reused across a busy period and closed once the queue is empty.
+    """
+
+    def __init__(
+        self, engine: Engine, transport=None, poll_seconds: float = OUTBOX_POLL_SECONDS
+    ) -> None:
+        self.engine = engine
+        self.transport = transport or make_transport()
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                drain(self.engine, self.transport)
+            except Exception:
+                logger.exception("Outbox delivery failed")
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+
+_worker: Optional[OutboxWorker] = None
+
+
+def start_worker(engine: Engine) -> None:
+    global _worker
+    if _worker is None:
+        _worker = OutboxWorker(engine)
+        _worker.start()
+
+
+def stop_worker() -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
+
+
+def wake_worker() -> None:
+    """Nudge the worker after enqueueing so delivery does not wait for the next poll."""
+    if _worker is not None:
+        _worker.wake()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from ..models import Word
+
+# sort name -> (key expression, descending, value type)
+SORT_KEYS = {
+    "created": (Word.created_at, True, datetime),
+    "stage": (Word.stage, False, int),
+    "next_review": (Word.next_review, False, date),
+    "term": (func.lower(Word.term), False, str),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def sort_key_column(sort: str):
+    """
+    The sort key as an extra column, labelled sort_key. Cursors carry the
+    key as the database computed it: lower(term) is SQLite's, which folds
+    only ASCII, so Python's str.lower() would disagree on other scripts.
+    """
+    return SORT_KEYS[sort][0].label("sort_key")
+
+
+def encode_cursor(sort: str, key, word_id: int) -> str:
+    """Opaque cursor pointing just past the word with `word_id` and sort `key`."""
+    if isinstance(key, (date, datetime)):
+        key = key.isoformat()
+    raw = json.dumps([sort, key, word_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def cursor_after(session: Session, sort: str, word_id: int) -> str:
+    """Cursor just past a word, reading its sort key back from the database."""
+    key = session.exec(select(sort_key_column(sort)).where(Word.id == word_id)).one()
+    return encode_cursor(sort, key, word_id)
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, word_id = json.loads(base64.urlsafe_b64decode(padded))
+        kind = SORT_KEYS[sort][2]
+        if kind in (datetime, date):
+            value = kind.fromisoformat(value)
+        elif not isinstance(value, kind):
+            raise TypeError(value)
+        if cursor_sort != sort or not isinstance(word_id, int):
+            raise ValueError(cursor_sort)
+    except (ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    return value, word_id
+
+
+def keyset_page(statement, sort: str, cursor: Optional[str]) -> list:
+    """
+    Statements that together list `statement` in (sort key, id) order,
+    starting just past the cursor. Run them in turn until the page is
+    full. With a cursor there are two: the rest of the cursor's key
+    value (key = ? AND id > ?) and everything after it (key > ?). Each is
+    an exact seek on the (user_id, key) index, so a page costs the same
+    at the end of a deck as at the start, even for keys with few
+    distinct values such as stage.
+    """
+    key, descending, _ = SORT_KEYS[sort]
+    if descending:
+        ordered = statement.order_by(key.desc(), Word.id.desc())
+    else:
+        ordered = statement.order_by(key, Word.id)
+    if not cursor:
+        return [ordered]
+    value, word_id = decode_cursor(cursor, sort)
+    if descending:
+        return [
+            statement.where(key == value, Word.id < word_id).order_by(Word.id.desc()),
+            ordered.where(key < value),
+        ]
+    return [
+        statement.where(key == value, Word.id > word_id).order_by(Word.id),
+        ordered.where(key > value),
+    ]
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from ..settings import (
+    PROFILE_DIR,
+    PROFILE_INTERVAL_MS,
+    PROFILE_RATE,
+    PROFILE_THRESHOLD_MS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Innermost frames in these modules mean the thread is parked, not working.
+IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+
+
+def thread_cpu_time(ident: int) -> Optional[float]:
+    """CPU seconds used by a thread, where the platform exposes it (Linux)."""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError):
+        return None
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of every thread in the process every
+    `interval` seconds from a background thread, and counts them as folded
+    stacks ("thread;outer;...;inner" -> samples), the input format of
+    flamegraph.pl, inferno and speedscope. Sampling every thread catches a
+    request wherever it runs: on the event loop, on a threadpool worker or
+    in the db-writer. Time inside SQLite shows up under the Python frame
+    that called into it. Idle threads are skipped: those parked in a wait
+    and, where per-thread CPU clocks exist, those whose CPU time did not
+    move since the last sample.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        cpu = {ident: thread_cpu_time(ident) for ident in sys._current_frames()}
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                used, cpu[ident] = cpu.get(ident), thread_cpu_time(ident)
+                if cpu[ident] is not None and used == cpu[ident]:
+                    continue
+                if os.path.basename(frame.f_code.co_filename) in IDLE_MODULES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    stack.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.items())
+
+
+class RequestProfiler:
+    """
+    Opt-in profiling of slow requests. A `rate` share of requests run under
+    a StackSampler, one at a time since the sampler sees the whole process;
+    those slower than `threshold` seconds are written to `directory` as a
+    .folded file named after the time, method, route and duration.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        rate: float = 1.0,
+        interval: float = 0.001,
+        directory: Path = PROFILE_DIR,
+    ) -> None:
+        self.threshold = threshold
+        self.rate = rate
+        self.interval = interval
+        self.directory = directory
+        self._busy = threading.Lock()
+        self.profiled = 0
+        self.dumped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0 and self.rate > 0
+
+    def start(self) -> Optional[StackSampler]:
+        if not self.enabled or random.random() >= self.rate:
+            return None
+        if not self._busy.acquire(blocking=False):
+            return None
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        return sampler
+
+    def finish(
+        self, sampler: StackSampler, method: str, route: str, seconds: float
+    ) -> Optional[Path]:
+        try:
+            sampler.stop()
+        finally:
+            self._busy.release()
+        self.profiled += 1
+        if seconds < self.threshold or not sampler.samples:
+            return None
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S.%f")
+        path = self.directory / f"{stamp}-{method}-{slug}-{seconds * 1000:.0f}ms.folded"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(sampler.folded())
+        except OSError:
+            logger.exception("Could not write profile %s", path)
+            return None
+        self.dumped += 1
+        return path
+
+
+request_profiler = RequestProfiler(
+    PROFILE_THRESHOLD_MS / 1000, PROFILE_RATE, PROFILE_INTERVAL_MS / 1000
+)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from ..models import Review, StageCount, Streak
+from .scheduler import MAX_STAGE
+
+
+def progress_counters(session: Session, user_id: int, today: date) -> dict:
+    """
+    The user's streak and words per stage, read from their counter rows
+    (two primary-key lookups) instead of the review and word tables.
+    """
+    stages = [0] * (MAX_STAGE + 1)
+    for stage, words in session.exec(
+        select(StageCount.stage, StageCount.words).where(StageCount.user_id == user_id)
+    ).all():
+        stages[stage] = words
+    streak = session.get(Streak, user_id)
+    current = longest = 0
+    last_active_day: Optional[date] = None
+    if streak is not None:
+        longest = streak.longest_streak
+        last_active_day = streak.last_active_day
+        # Still alive until the end of the day after the last review.
+        if last_active_day >= today - timedelta(days=1):
+            current = streak.current_streak
+    return {
+        "current_streak": current,
+        "longest_streak": longest,
+        "last_active_day": last_active_day,
+        "words_learned": stages[MAX_STAGE],
+        "words_per_stage": stages,
+    }
+
+
+# Per user: the runs of consecutive review days (a day minus its rank is
+# constant along a run), then the latest run's length as the current
+# streak and the longest run. SQLite takes the bare `length` column of a
+# max() aggregate from the row holding the maximum, i.e. the latest run.
+_STREAK_SOURCE = """
+    WITH days AS (
+        SELECT DISTINCT user_id, date(reviewed_at) AS day
+        FROM review WHERE user_id IS NOT NULL {review_filter}
+    ),
+    runs AS (
+        SELECT user_id, day,
+            julianday(day) - row_number() OVER (PARTITION BY user_id ORDER BY day) AS run
+        FROM days
+    ),
+    lengths AS (
+        SELECT user_id, count(*) AS length, max(day) AS last_day,
+            max(count(*)) OVER (PARTITION BY user_id) AS longest
+        FROM runs GROUP BY user_id, run
+    )
+    SELECT user_id, length, longest, max(last_day) FROM lengths GROUP BY user_id
+"""
+
+
+def _counter_rows(session: Session, scope: str, params: dict) -> dict:
+    rows: dict[int, list] = {}
+    for user_id, stage, words in session.execute(
+        text(f"SELECT user_id, stage, words FROM stagecount {scope}"), params
+    ):
+        rows.setdefault(user_id, [set(), None])[0].add((stage, words))
+    for user_id, *streak in session.execute(
+        text(
+            "SELECT user_id, current_streak, longest_streak, last_active_day "
+            f"FROM streak {scope}"
+        ),
+        params,
+    ):
+        rows.setdefault(user_id, [set(), None])[1] = tuple(streak)
+    for counters in rows.values():
+        # Stages emptied by the triggers and never written by the rebuild.
+        counters[0] = {(stage, words) for stage, words in counters[0] if words}
+    return {uid: counters for uid, counters in rows.items() if any(counters)}
+
+
+def repair_counters(session: Session, user_id: Optional[int] = None) -> int:
+    """
+    Rebuild the stagecount and streak rows from the word and review
+    history, for one user or for everyone, inside the caller's
+    transaction. Returns how many users' counters had drifted.
+    """
+    params = {}
+    scope = word_filter = review_filter = ""
+    if user_id is not None:
+        params["uid"] = user_id
+        scope = "WHERE user_id = :uid"
+        word_filter = "AND word.user_id = :uid"
+        review_filter = "AND review.user_id = :uid"
+    before = _counter_rows(session, scope, params)
+    session.execute(text(f"DELETE FROM stagecount {scope}"), params)
+    session.execute(
+        text(
+            "INSERT INTO stagecount (user_id, stage, words) "
+            "SELECT user_id, stage, count(*) FROM word "
+            f"WHERE user_id IS NOT NULL {word_filter} GROUP BY user_id, stage"
+        ),
+        params,
+    )
+    session.execute(text(f"DELETE FROM streak {scope}"), params)
+    session.execute(
+        text(
+            "INSERT INTO streak "
+            "(user_id, current_streak, longest_streak, last_active_day) "
+            + _STREAK_SOURCE.format(review_filter=review_filter)
+        ),
+        params,
+    )
+    after = _counter_rows(session, scope, params)
+    return sum(
+        1 for uid in before.keys() | after.keys() if before.get(uid) != after.get(uid)
+    )
+
+
+def ensure_progress_counters(session: Session) -> None:
+    """Rebuild once when the counters are introduced on a database with reviews."""
+    if session.exec(select(Streak.user_id).limit(1)).first() is not None:
+        return
+    reviewed = select(Review.id).where(Review.user_id.is_not(None)).limit(1)
+    if session.exec(reviewed).first() is None:
+        return
+    repair_counters(session)
+    session.commit()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import orjson
+
+from ..models import Word
+from .search import mark_up
+
+# Word's columns in the field order of Word and WordOut, so the JSON
+# rendered here has the same keys, in the same order, as response_model.
+WORD_COLUMNS = (
+    Word.id,
+    Word.user_id,
+    Word.term,
+    Word.translation,
+    Word.example,
+    Word.tags,
+    Word.created_at,
+    Word.stage,
+    Word.next_review,
+)
+WORD_FIELDS = tuple(column.key for column in WORD_COLUMNS)
+
+
+def render_words(rows: Iterable[Sequence]) -> bytes:
+    """
+    JSON for word rows selected as WORD_COLUMNS, matching what list[Word]
+    renders. Skips building ORM objects and validating them: the column
+    types already converted the values, so orjson writes the rows as they
+    are.
+    """
+    return orjson.dumps([dict(zip(WORD_FIELDS, row)) for row in rows])
+
+
+def render_words_out(
+    rows: Iterable[Sequence], highlights: Sequence[str] = ()
+) -> bytes:
+    """
+    JSON matching list[WordOut] for rows selected as WORD_COLUMNS followed
+    by one highlight() column per name in `highlights`, if any, rendered
+    as escaped HTML by mark_up.
+    """
+    width = len(WORD_FIELDS)
+    words = []
+    for row in rows:
+        word = dict(zip(WORD_FIELDS, row))
+        word["highlights"] = (
+            dict(zip(highlights, map(mark_up, row[width:]))) if highlights else None
+        )
+        words.append(word)
+    return orjson.dumps(words)
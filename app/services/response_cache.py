@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
+from sqlmodel import select
+
+from ..models import ChangeLog
+from ..settings import (
+    RESPONSE_CACHE_BACKEND,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_SYNC_SECONDS,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+from .cache import TTLCache
+from .writer import write_queue
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    etag: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class MemoryBackend:
+    """
+    Keeps bodies in a process-local LRU. Each worker process has its own
+    copy, but keys carry the user's changelog generation, so a write served
+    by one worker retires the bodies cached by all of them.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.entries: TTLCache[str, CachedBody] = TTLCache(maxsize, ttl)
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        return self.entries.get(key)
+
+    def set(self, key: str, value: CachedBody) -> None:
+        self.entries.set(key, value)
+
+
+class NullBackend:
+    """Caches nothing; responses still carry an ETag and honour If-None-Match."""
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        return None
+
+    def set(self, key: str, value: CachedBody) -> None:
+        pass
+
+
+def make_backend(kind: str = RESPONSE_CACHE_BACKEND):
+    if kind == "memory":
+        return MemoryBackend(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS)
+    if kind == "none":
+        return NullBackend()
+    raise ValueError(f"Unknown response cache backend: {kind}")
+
+
+class Generations:
+    """
+    Each user's cache generation in this process: the newest changelog seq
+    seen for them since start(). The word/review/settings triggers move a
+    user's seq forward in every write transaction and AUTOINCREMENT never
+    hands one out twice, so a generation only ever grows. `settings(user_id)`
+    is the same, counting only saves of the user's scheduler settings.
+
+    The write queue catches up right after each commit, before its callers
+    resume, so this process's own writes retire cached bodies at once and
+    a lookup never reads the database. Writes committed by other processes
+    are folded in by a background poll every `poll_seconds`. Until start()
+    runs there is nothing to key on, and ResponseCache stores nothing.
+    """
+
+    def __init__(self, poll_seconds: float = RESPONSE_CACHE_SYNC_SECONDS) -> None:
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._seen: dict[int, int] = {}
+        self._settings: dict[int, int] = {}
+        self._last: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._engine: Optional[Engine] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def get(self, user_id: int) -> int:
+        return self._seen.get(user_id, 0)
+
+    def settings(self, user_id: int) -> int:
+        return self._settings.get(user_id, 0)
+
+    def catch_up(self, conn) -> None:
+        """Fold in the changelog entries after the last seen seq (Session or Connection)."""
+        with self._lock:
+            if self._last is None:
+                # Nothing is cached yet, so only the starting point matters.
+                self._last = conn.execute(select(func.max(ChangeLog.seq))).scalar() or 0
+                return
+            rows = conn.execute(
+                select(ChangeLog.seq, ChangeLog.user_id, ChangeLog.entity)
+                .where(ChangeLog.seq > self._last)
+                .order_by(ChangeLog.seq)
+            ).all()
+            for seq, user_id, entity in rows:
+                self._seen[user_id] = seq
+                if entity == "settings":
+                    self._settings[user_id] = seq
+                self._last = seq
+
+    def start(self, engine: Engine) -> None:
+        """Follow `engine`'s changelog: after its write queue's commits and by polling."""
+        if self._thread is not None:
+            return
+        with engine.connect() as conn:
+            self.catch_up(conn)
+        write_queue(engine).add_commit_hook(self.catch_up)
+        self._engine = engine
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(engine,), name="response-cache-sync", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            write_queue(self._engine).remove_commit_hook(self.catch_up)
+            self._stop.set()
+            thread.join(timeout=10)
+
+    def _run(self, engine: Engine) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                with engine.connect() as conn:
+                    self.catch_up(conn)
+            except Exception:
+                logger.exception("Response cache generation sync failed")
+
+
+cache_generations = Generations()
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def render_json(model: Any, value: Any) -> bytes:
+    """Serialize `value` as the route's response_model would."""
+    adapter = _adapter(model)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Rendered JSON bodies of a user's read endpoints, keyed by the user's
+    generation (see Generations), which every write to their words,
+    reviews or scheduler settings moves forward. No endpoint has to remember to invalidate
+    anything; the bodies under old generations are never read again and
+    age out. Taking a key costs no query, so hits and 304s never touch the
+    database.
+
+    A reader takes the key before it queries, so a body computed while a
+    write commits is stored under the old generation and never served.
+    Keys must also carry anything else the body depends on: the query
+    parameters and, for date-relative endpoints, the current day or hour.
+    """
+
+    def __init__(self, backend=None, generations: Optional[Generations] = None) -> None:
+        self.backend = backend if backend is not None else make_backend()
+        self.generations = generations if generations is not None else cache_generations
+
+    def key(self, user_id: int, *parts: object) -> Optional[str]:
+        if not self.generations.running:
+            return None
+        generation = self.generations.get(user_id)
+        return ":".join(map(str, (user_id, generation, *parts)))
+
+    def lookup(self, key: Optional[str], if_none_match: Optional[str]) -> Optional[Response]:
+        if key is None:
+            return None
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        return self._respond(entry, if_none_match)
+
+    def store(
+        self,
+        key: Optional[str],
+        body: bytes,
+        if_none_match: Optional[str],
+        headers: Optional[dict[str, str]] = None,
+    ) -> Response:
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        entry = CachedBody(body, etag, headers or {})
+        if key is not None:
+            self.backend.set(key, entry)
+        return self._respond(entry, if_none_match)
+
+    def _respond(self, entry: CachedBody, if_none_match: Optional[str]) -> Response:
+        headers = {
+            **entry.headers,
+            "ETag": entry.etag,
+            # Browsers may keep the body but must revalidate it each time.
+            "Cache-Control": "private, no-cache",
+            "Vary": "Authorization",
+        }
+        if etag_matches(if_none_match, entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache()
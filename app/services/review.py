@@ -1,12 +1,86 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
+from datetime import datetime
+from typing import Optional
 
-STAGE_INTERVALS = [1, 3, 7, 14, 30]
-MAX_STAGE = len(STAGE_INTERVALS) - 1
+from sqlmodel import Session, select
 
+from ..models import Review, ReviewReceipt, Word
+from .scheduler import DEFAULT_SCHEDULER, Scheduler, scheduler_for
 
-def next_review_date(stage: int, today: date) -> date:
-    interval = STAGE_INTERVALS[stage]
-    return today + timedelta(days=interval)
 
+def apply_review(
+    word: Word,
+    good: bool,
+    reviewed_at: datetime,
+    scheduler: Scheduler = DEFAULT_SCHEDULER,
+) -> Review:
+    """Move `word` along the schedule for one answer; returns the Review to log."""
+    scheduler.answer(word, good, reviewed_at.date())
+    return Review(
+        word_id=word.id,
+        result=good,
+        reviewed_at=reviewed_at,
+        next_review_assigned=word.next_review,
+        user_id=word.user_id,
+    )
+
+
+def client_moment(value: Optional[datetime], now: datetime) -> datetime:
+    """Client answer time as local naive time, never later than `now`."""
+    if value is None:
+        return now
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return min(value, now)
+
+
+def apply_review_batch(
+    session: Session, user_id: int, answers: list[tuple[int, bool, datetime, Optional[str]]]
+) -> tuple[list[Review], int, list[int], list[Word]]:
+    """
+    Apply (word_id, good, reviewed_at, idempotency key) answers in
+    reviewed_at order, the time each was answered on the client; answers
+    with the same time keep their payload order. Answers whose key was
+    already applied are skipped, as are
+    answers for words the user no longer has. Runs inside the caller's
+    transaction; returns (reviews, duplicates, missing word ids, words).
+    """
+    keys = {key for _, _, _, key in answers if key}
+    seen = set()
+    if keys:
+        seen = set(
+            session.exec(
+                select(ReviewReceipt.key).where(
+                    ReviewReceipt.user_id == user_id, ReviewReceipt.key.in_(keys)
+                )
+            )
+        )
+    scheduler = scheduler_for(session, user_id)
+    word_ids = {word_id for word_id, _, _, _ in answers}
+    words = {
+        word.id: word
+        for word in session.exec(
+            select(Word).where(Word.user_id == user_id, Word.id.in_(word_ids))
+        )
+    }
+
+    reviews: list[Review] = []
+    duplicates = 0
+    missing: list[int] = []
+    touched: dict[int, Word] = {}
+    for word_id, good, reviewed_at, key in sorted(answers, key=lambda answer: answer[2]):
+        if key and key in seen:
+            duplicates += 1
+            continue
+        word = words.get(word_id)
+        if word is None:
+            missing.append(word_id)
+            continue
+        if key:
+            seen.add(key)
+            session.add(ReviewReceipt(user_id=user_id, key=key, word_id=word_id))
+        reviews.append(apply_review(word, good, reviewed_at, scheduler))
+        touched[word_id] = word
+    session.add_all(reviews)
+    return reviews, duplicates, missing, list(touched.values())
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import case, func, update
+from sqlmodel import Session
+
+from ..models import SchedulerSettings, Word
+from ..settings import USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS
+from .cache import TTLCache
+from .response_cache import cache_generations
+
+MAX_STAGE = 4
+# Days until the next review after a wrong answer (stage 0).
+LAPSE_INTERVAL = 1
+# Days until the next review after a right answer that reaches stage 1..MAX_STAGE.
+DEFAULT_INTERVALS = [3, 7, 14, 30]
+# SM-2's ease floor, and its ease change for a wrong answer (grade 2); a
+# right answer counts as grade 4, which leaves the ease as it is.
+MIN_EASE = 1.3
+LAPSE_EASE_PENALTY = 0.32
+
+
+class InvalidSchedulerSettings(ValueError):
+    pass
+
+
+class Scheduler:
+    """
+    Maps a card's stage to the days until its next review. A scheduler is
+    fixed by its table of intervals, one per stage (stage 0 is the lapse
+    interval), so every algorithm below can be swapped in or out and the
+    deck rescheduled with a single UPDATE (see `reschedule`). `answer`
+    records the interval it gave on the card, so a reschedule knows each
+    card's last review date.
+    """
+
+    def __init__(self, stage_intervals: list[int]) -> None:
+        if len(stage_intervals) != MAX_STAGE + 1:
+            raise InvalidSchedulerSettings(
+                f"Expected {MAX_STAGE + 1} stage intervals, got {len(stage_intervals)}"
+            )
+        self.stage_intervals = [max(1, int(days)) for days in stage_intervals]
+
+    def interval(self, stage: int) -> int:
+        return self.stage_intervals[stage]
+
+    def next_review(self, stage: int, today: date) -> date:
+        return today + timedelta(days=self.interval(stage))
+
+    def answer(self, word: Word, good: bool, today: date) -> None:
+        """Move `word` along the schedule for one answer given on `today`."""
+        word.stage = min(word.stage + 1, MAX_STAGE) if good else 0
+        word.interval = self.interval(word.stage)
+        word.ease = None
+        word.next_review = today + timedelta(days=word.interval)
+
+    def same_schedule(self, other: Scheduler) -> bool:
+        return type(self) is type(other) and self.stage_intervals == other.stage_intervals
+
+
+class FixedScheduler(Scheduler):
+    """The intervals as given."""
+
+    def __init__(self, intervals: list[int]) -> None:
+        super().__init__([LAPSE_INTERVAL, *intervals])
+
+
+class MultiplierScheduler(Scheduler):
+    """The intervals scaled by `multiplier`: below 1 reviews more often, above 1 less."""
+
+    def __init__(self, intervals: list[int], multiplier: float) -> None:
+        super().__init__(
+            [LAPSE_INTERVAL, *(round(days * multiplier) for days in intervals)]
+        )
+
+
+class GeometricScheduler(Scheduler):
+    """
+    SuperMemo-2 for right/wrong answers. Each card keeps its own ease,
+    starting at the user's `ease`, and its own interval: 1 day, 6 days,
+    then the previous interval times the card's ease, growing past the
+    last stage. A wrong answer restarts the card at the lapse interval and
+    lowers its ease as SM-2 does for grade 2. The stage table (1, 6, 6e,
+    6e²) is what a card answered right every time gets, and what
+    `reschedule` moves cards onto.
+    """
+
+    def __init__(self, ease: float) -> None:
+        self.ease = ease
+        intervals = [1, 6]
+        while len(intervals) < MAX_STAGE:
+            intervals.append(intervals[-1] * ease)
+        super().__init__([LAPSE_INTERVAL, *(round(days) for days in intervals)])
+
+    def answer(self, word: Word, good: bool, today: date) -> None:
+        ease = word.ease or self.ease
+        if good:
+            word.stage = min(word.stage + 1, MAX_STAGE)
+            previous = word.interval or self.interval(word.stage - 1)
+            if word.stage <= 2:
+                word.interval = self.interval(word.stage)
+            else:
+                word.interval = max(round(previous * ease), 1)
+        else:
+            word.stage = 0
+            word.interval = LAPSE_INTERVAL
+            ease = max(ease - LAPSE_EASE_PENALTY, MIN_EASE)
+        word.ease = ease
+        word.next_review = today + timedelta(days=word.interval)
+
+    def same_schedule(self, other: Scheduler) -> bool:
+        return super().same_schedule(other) and self.ease == other.ease
+
+
+# name -> factory(intervals, multiplier, ease); add entries to plug in more.
+SCHEDULERS: dict[str, Callable[[list[int], float, float], Scheduler]] = {
+    "fixed": lambda intervals, multiplier, ease: FixedScheduler(intervals),
+    "multiplier": lambda intervals, multiplier, ease: MultiplierScheduler(
+        intervals, multiplier
+    ),
+    "geometric": lambda intervals, multiplier, ease: GeometricScheduler(ease),
+}
+
+DEFAULT_SCHEDULER = FixedScheduler(DEFAULT_INTERVALS)
+
+
+def make_scheduler(
+    kind: str,
+    intervals: Optional[list[int]] = None,
+    multiplier: float = 1.0,
+    ease: float = 2.5,
+) -> Scheduler:
+    factory = SCHEDULERS.get(kind)
+    if factory is None:
+        raise InvalidSchedulerSettings(
+            f"scheduler must be one of: {', '.join(SCHEDULERS)}"
+        )
+    intervals = list(intervals or DEFAULT_INTERVALS)
+    if len(intervals) != MAX_STAGE or not all(1 <= days <= 3650 for days in intervals):
+        raise InvalidSchedulerSettings(
+            f"intervals must be {MAX_STAGE} whole days between 1 and 3650"
+        )
+    if not 0.1 <= multiplier <= 10:
+        raise InvalidSchedulerSettings("multiplier must be between 0.1 and 10")
+    if not 1.3 <= ease <= 5:
+        raise InvalidSchedulerSettings("ease must be between 1.3 and 5")
+    return factory(intervals, multiplier, ease)
+
+
+def settings_scheduler(settings: Optional[SchedulerSettings]) -> Scheduler:
+    if settings is None:
+        return DEFAULT_SCHEDULER
+    intervals = [int(days) for days in settings.intervals.split(",")]
+    return make_scheduler(settings.scheduler, intervals, settings.multiplier, settings.ease)
+
+
+# user_id -> (settings generation, scheduler). A save in any process moves
+# the generation, so entries go stale at once while generations are running
+# and after USER_CACHE_TTL_SECONDS otherwise.
+scheduler_cache: TTLCache[int, tuple[int, Scheduler]] = TTLCache(
+    USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS
+)
+
+
+def scheduler_for(session: Session, user_id: Optional[int]) -> Scheduler:
+    """The user's scheduler, from the per-process cache or their settings row."""
+    if user_id is None:
+        return DEFAULT_SCHEDULER
+    generation = cache_generations.settings(user_id)
+    cached = scheduler_cache.get(user_id)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+    scheduler = settings_scheduler(session.get(SchedulerSettings, user_id))
+    scheduler_cache.set(user_id, (generation, scheduler))
+    return scheduler
+
+
+def reschedule(session: Session, user_id: int, old: Scheduler, new: Scheduler) -> int:
+    """
+    Move every reviewed card (stage >= 1) onto the new scheduler's interval
+    for its stage, keeping its last review date: next_review minus the
+    card's interval (or, for a card never answered, the old interval for
+    its stage). Per-card eases go back to the user's. One UPDATE over the
+    (user_id, stage) index, computed inside SQLite, with no rows read into
+    Python. Stage 0 cards keep their dates, since the lapse interval never
+    changes. Returns the rows updated.
+    """
+    if new.same_schedule(old):
+        return 0
+    stage_interval = lambda scheduler: case(  # noqa: E731
+        *((Word.stage == stage, scheduler.interval(stage)) for stage in range(1, MAX_STAGE + 1))
+    )
+    reviewed = Word.stage >= 1
+    shift = stage_interval(new) - func.coalesce(Word.interval, stage_interval(old))
+    result = session.execute(
+        update(Word)
+        .where(Word.user_id == user_id, reviewed | Word.ease.is_not(None))
+        .values(
+            next_review=case(
+                (reviewed, func.date(Word.next_review, func.printf("%+d days", shift))),
+                else_=Word.next_review,
+            ),
+            interval=case((reviewed, stage_interval(new)), else_=Word.interval),
+            ease=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def save_scheduler_settings(
+    session: Session,
+    user_id: int,
+    kind: str,
+    intervals: Optional[list[int]],
+    multiplier: float,
+    ease: float,
+) -> tuple[SchedulerSettings, int]:
+    """
+    Store the user's scheduler settings and move their deck onto the new
+    intervals, inside the caller's transaction. Returns the settings and
+    the number of cards rescheduled.
+    """
+    scheduler = make_scheduler(kind, intervals, multiplier, ease)
+    settings = session.get(SchedulerSettings, user_id)
+    old = settings_scheduler(settings)
+    if settings is None:
+        settings = SchedulerSettings(user_id=user_id)
+    settings.scheduler = kind
+    settings.intervals = ",".join(map(str, intervals or DEFAULT_INTERVALS))
+    settings.multiplier = multiplier
+    settings.ease = ease
+    settings.updated_at = datetime.now()
+    session.add(settings)
+    rescheduled = reschedule(session, user_id, old, scheduler)
+    # Later jobs in this write batch must see the new scheduler.
+    scheduler_cache.pop(user_id)
+    return settings, rescheduled
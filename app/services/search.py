@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import html
+from typing import Optional
+
+from sqlalchemy import column, func, literal_column, table
+
+# External-content FTS5 index over word(term, translation, example, tags),
+# kept in sync by triggers (see SCHEMA_MIGRATIONS in app/db.py).
+word_fts = table("word_fts", column("rowid"), column("rank"))
+
+# The trigram tokenizer cannot match fewer than three characters.
+MIN_FTS_LENGTH = 3
+
+HIGHLIGHT_COLUMNS = {"term": 0, "translation": 1, "example": 2, "tags": 3}
+
+# highlight() brackets matches with these control characters rather than
+# tags, so mark_up() can escape the user's text before adding any markup.
+MARK_OPEN = "\x02"
+MARK_CLOSE = "\x03"
+
+
+def fts_phrase(query: Optional[str]) -> Optional[str]:
+    """Quote the user's input as a single FTS5 phrase (a substring match)."""
+    if not query:
+        return None
+    cleaned = query.strip()
+    if len(cleaned) < MIN_FTS_LENGTH:
+        return None
+    return '"' + cleaned.replace('"', '""') + '"'
+
+
+def fts_match(phrase: str):
+    return literal_column("word_fts").op("MATCH")(phrase)
+
+
+def fts_highlights() -> list:
+    return [
+        func.highlight(literal_column("word_fts"), index, MARK_OPEN, MARK_CLOSE).label(
+            f"{name}_highlight"
+        )
+        for name, index in HIGHLIGHT_COLUMNS.items()
+    ]
+
+
+def mark_up(text: Optional[str]) -> Optional[str]:
+    """
+    HTML for a highlight() column: the field text escaped, then each match
+    wrapped in <mark>. Only the markers become tags, so a term such as
+    "<script>" comes back as text.
+    """
+    if text is None:
+        return None
+    return (
+        html.escape(text).replace(MARK_OPEN, "<mark>").replace(MARK_CLOSE, "</mark>")
+    )
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import case, func, or_
+from sqlmodel import Session, select
+
+from ..models import ActivityDay, ActivityHour, DueDay, Review, Word
+from .activity import hour_bucket
+from .progress import progress_counters
+
+WINDOWS = {"1d": 1, "7d": 7, "30d": 30, "365d": 365}
+
+
+def sum_if(condition, column):
+    return func.coalesce(func.sum(case((condition, column))), 0)
+
+
+def due_counts(session: Session, user_id: int, today: date) -> tuple[int, int]:
+    """
+    Words due by today and words due in the next 7 days, summed from the
+    DueDay rollup: one row per distinct due date, not one per word.
+    """
+    return tuple(
+        session.exec(
+            select(
+                sum_if(DueDay.day <= today, DueDay.words),
+                sum_if(DueDay.day > today, DueDay.words),
+            ).where(
+                DueDay.user_id == user_id, DueDay.day <= today + timedelta(days=7)
+            )
+        ).one()
+    )
+
+
+def due_summary(session: Session, user_id: int, today: date) -> dict:
+    """due_counts plus the earliest next_review (past when overdue), an index seek."""
+    due_today, due_next_7d = due_counts(session, user_id, today)
+    next_due = session.exec(
+        select(func.min(DueDay.day)).where(DueDay.user_id == user_id)
+    ).one()
+    return {"due_today": due_today, "due_next_7d": due_next_7d, "next_due": next_due}
+
+
+def next_hour(moment: datetime) -> datetime:
+    """The first whole hour at or after `moment`."""
+    bucket = hour_bucket(moment)
+    return bucket if bucket == moment else bucket + timedelta(hours=1)
+
+
+def edge_counts(
+    session: Session, user_id: int, spans: list[tuple[datetime, datetime]]
+) -> list[int]:
+    """
+    New words and reviews in each [lower, upper) span, read from word and
+    review themselves: new_words, reviews for each span in turn. Used for
+    the part of a window's first hour that the hourly rollup cannot split;
+    an empty span counts 0.
+    """
+
+    def counts(model, column):
+        return session.exec(
+            select(
+                *(sum_if((column >= lower) & (column < upper), 1) for lower, upper in spans)
+            ).where(
+                or_(
+                    *(
+                        (model.user_id == user_id) & (column >= lower) & (column < upper)
+                        for lower, upper in spans
+                    )
+                )
+            )
+        ).one()
+
+    words = counts(Word, Word.created_at)
+    reviews = counts(Review, Review.reviewed_at)
+    return [value for pair in zip(words, reviews) for value in pair]
+
+
+def compute_stats(
+    session: Session, user_id: int, now: Optional[datetime] = None
+) -> dict:
+    """
+    Compute every StatsOut field from the due and activity rollups and the
+    progress counters. Rolling windows start at exactly now minus the
+    window, as they always have: whole days come from ActivityDay, whole
+    hours of the boundary day from ActivityHour, and the minutes of the
+    first, partial hour from word and review (see `edge_counts`).
+    """
+    now = now or datetime.now()
+    today = now.date()
+    starts = {key: now - timedelta(days=days) for key, days in WINDOWS.items()}
+    first_hours = {key: next_hour(start) for key, start in starts.items()}
+    edges = {
+        key: (
+            first_hours[key],
+            datetime.combine(start.date() + timedelta(days=1), datetime.min.time()),
+        )
+        for key, start in starts.items()
+    }
+
+    due_today, due_next_7d = due_counts(session, user_id, today)
+
+    day_columns = [sum_if(ActivityDay.day == today, ActivityDay.reviews)]
+    hour_columns = []
+    for key, start in starts.items():
+        in_days = ActivityDay.day > start.date()
+        day_columns += [
+            sum_if(in_days, ActivityDay.new_words),
+            sum_if(in_days, ActivityDay.reviews),
+        ]
+        lower, upper = edges[key]
+        in_hours = (ActivityHour.hour >= lower) & (ActivityHour.hour < upper)
+        hour_columns += [
+            sum_if(in_hours, ActivityHour.new_words),
+            sum_if(in_hours, ActivityHour.reviews),
+        ]
+
+    day_row = session.exec(
+        select(*day_columns).where(
+            ActivityDay.user_id == user_id,
+            ActivityDay.day > starts["365d"].date(),
+        )
+    ).one()
+    # Repeat user_id inside each OR branch so SQLite can serve every edge
+    # range from the primary key instead of walking all of the user's hours.
+    hour_row = session.exec(
+        select(*hour_columns).where(
+            or_(
+                *(
+                    (ActivityHour.user_id == user_id)
+                    & (ActivityHour.hour >= lower)
+                    & (ActivityHour.hour < upper)
+                    for lower, upper in edges.values()
+                )
+            )
+        )
+    ).one()
+    minutes = edge_counts(
+        session, user_id, [(starts[key], first_hours[key]) for key in WINDOWS]
+    )
+
+    stats = {
+        "today_due_count": due_today,
+        "due_next_7d": due_next_7d,
+        "reviewed_today_count": day_row[0],
+    }
+    for index, key in enumerate(WINDOWS):
+        stats[f"new_words_{key}"] = (
+            day_row[1 + 2 * index] + hour_row[2 * index] + minutes[2 * index]
+        )
+        stats[f"reviews_{key}"] = (
+            day_row[2 + 2 * index] + hour_row[1 + 2 * index] + minutes[1 + 2 * index]
+        )
+    stats.update(progress_counters(session, user_id, today))
+    return stats
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from sqlmodel import Session, select
+
+from ..models import ChangeLog, Review, Word
+from .tags import chunked
+
+
+def changes_since(session: Session, user_id: int, since: int, limit: int) -> dict:
+    """
+    The user's words and reviews changed after change sequence `since`,
+    oldest first, at most `limit` of them. `token` is the seq to pass as
+    the next `since`; `more` says whether another page is waiting. Runs
+    in one read transaction, so the log and the rows it points at agree.
+    """
+    # The driver only opens transactions for writes; without this each
+    # SELECT would read its own snapshot.
+    session.connection().exec_driver_sql("BEGIN")
+    entries = session.exec(
+        select(ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.deleted)
+        .where(
+            ChangeLog.user_id == user_id,
+            ChangeLog.seq > since,
+            ChangeLog.entity.in_(("word", "review")),
+        )
+        .order_by(ChangeLog.seq)
+        .limit(limit + 1)
+    ).all()
+    more = len(entries) > limit
+    entries = entries[:limit]
+
+    changed = {"word": [], "review": []}
+    deleted = {"word": [], "review": []}
+    for _, entity, entity_id, is_deleted in entries:
+        (deleted if is_deleted else changed)[entity].append(entity_id)
+
+    words = []
+    for chunk in chunked(changed["word"]):
+        words += session.exec(
+            select(Word).where(Word.id.in_(chunk), Word.user_id == user_id)
+        ).all()
+    reviews = []
+    for chunk in chunked(changed["review"]):
+        reviews += session.exec(
+            select(Review).where(Review.id.in_(chunk), Review.user_id == user_id)
+        ).all()
+
+    return {
+        "token": str(entries[-1][0] if entries else since),
+        "more": more,
+        "words": words,
+        "reviews": reviews,
+        "deleted_words": deleted["word"],
+        "deleted_reviews": deleted["review"],
+    }
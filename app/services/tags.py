@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from ..models import Tag, Word, WordTag
+from .scheduler import MAX_STAGE
 
 
 def normalize_tags(tags: Optional[str]) -> Optional[str]:
@@ -20,3 +27,103 @@ def normalize_tag(tag: Optional[str]) -> Optional[str]:
         return None
     return parts[0]
 
+
+
+def split_tags(tags: Optional[str]) -> list[str]:
+    normalized = normalize_tags(tags)
+    if not normalized:
+        return []
+    return list(dict.fromkeys(normalized.split(",")))
+
+
+def chunked(items: list, size: int = 500) -> Iterable[list]:
+    """Slices of `items` small enough to bind as one IN (...) list."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def sync_word_tags(
+    session: Session, user_id: int, word_tags: dict[int, Optional[str]]
+) -> None:
+    """
+    Make the tag/wordtag index match the comma-joined tags of the given
+    words (word id -> Word.tags). Runs inside the caller's transaction.
+    """
+    if not word_tags:
+        return
+    wanted = {word_id: split_tags(tags) for word_id, tags in word_tags.items()}
+    names = sorted({name for names in wanted.values() for name in names})
+
+    tag_ids: dict[str, int] = {}
+    for chunk in chunked(names):
+        session.execute(
+            insert(Tag).on_conflict_do_nothing(index_elements=["user_id", "name"]),
+            [{"user_id": user_id, "name": name} for name in chunk],
+        )
+        rows = session.exec(
+            select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(chunk))
+        ).all()
+        tag_ids.update({row[0]: row[1] for row in rows})
+
+    for chunk in chunked(list(wanted)):
+        session.execute(delete(WordTag).where(WordTag.word_id.in_(chunk)))
+    links = [
+        {"word_id": word_id, "tag_id": tag_ids[name]}
+        for word_id, names in wanted.items()
+        for name in names
+    ]
+    if links:
+        session.execute(insert(WordTag), links)
+
+
+def drop_word_tags(session: Session, word_id: int) -> None:
+    session.execute(delete(WordTag).where(WordTag.word_id == word_id))
+
+
+def backfill_tags(session: Session, user_id: Optional[int] = None) -> int:
+    """Rebuild the tag index from Word.tags. Returns the number of words indexed."""
+    statement = select(Word.id, Word.user_id, Word.tags).where(
+        Word.user_id.is_not(None)
+    )
+    if user_id is not None:
+        statement = statement.where(Word.user_id == user_id)
+    by_user: dict[int, dict[int, Optional[str]]] = {}
+    for word_id, owner_id, tags in session.exec(statement).all():
+        by_user.setdefault(owner_id, {})[word_id] = tags
+    for owner_id, word_tags in by_user.items():
+        sync_word_tags(session, owner_id, word_tags)
+    return sum(len(word_tags) for word_tags in by_user.values())
+
+
+def ensure_tag_index(session: Session) -> None:
+    """Backfill once when the tag tables are introduced on an existing database."""
+    if session.exec(select(Tag.id).limit(1)).first() is not None:
+        return
+    if session.exec(select(Word.id).where(Word.tags.is_not(None)).limit(1)).first() is None:
+        return
+    backfill_tags(session)
+    session.commit()
+
+
+def tag_filter(user_id: int, name: str):
+    """Word.id IN (words carrying tag `name`), served by ix_wordtag_tag_word."""
+    return Word.id.in_(
+        select(WordTag.word_id)
+        .join(Tag, Tag.id == WordTag.tag_id)
+        .where(Tag.user_id == user_id, Tag.name == name)
+    )
+
+
+def tag_progress(session: Session, user_id: int) -> list[tuple]:
+    """(name, word count, words per stage...) for every tag the user has in use."""
+    stage_counts = [
+        func.count(case((Word.stage == stage, 1))) for stage in range(MAX_STAGE + 1)
+    ]
+    return session.exec(
+        select(Tag.name, func.count(), *stage_counts)
+        .join(WordTag, WordTag.tag_id == Tag.id)
+        .join(Word, Word.id == WordTag.word_id)
+        .where(Tag.user_id == user_id)
+        .group_by(Tag.name)
+        .order_by(Tag.name)
+    ).all()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from ..settings import WRITE_BATCH_SIZE, WRITE_BATCH_WAIT_MS, WRITE_QUEUE_ENABLED
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteJob = Callable[[Session], T]
+
+
+class WriteQueue:
+    """
+    Funnels the process's writes through one thread and one connection.
+    Jobs that arrive together (up to `max_batch`, or within `max_wait`
+    seconds of the first) share a single BEGIN IMMEDIATE ... COMMIT, so a
+    burst of N writes costs one lock acquisition and one WAL sync instead
+    of N. Each job runs in its own SAVEPOINT: an exception (including
+    HTTPException) rolls back only that job and is raised to its caller.
+
+    Jobs receive the writer's Session and must not keep it. Returned ORM
+    objects are detached with their loaded attributes intact, so callers
+    can read them; flush inside the job when you need generated ids.
+    Reads do not go through the queue; they use ordinary sessions.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        max_batch: int = WRITE_BATCH_SIZE,
+        max_wait: float = WRITE_BATCH_WAIT_MS / 1000,
+        enabled: bool = WRITE_QUEUE_ENABLED,
+    ) -> None:
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.enabled = enabled
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.jobs = 0
+        self.commits = 0
+        self.largest_batch = 0
+        self.commit_seconds = 0.0
+        self._commit_hooks: list[Callable[[Session], None]] = []
+
+    def add_commit_hook(self, hook: Callable[[Session], None]) -> None:
+        """
+        Call `hook` with the writer's session after every commit, before
+        the jobs' callers are resumed, so anything it records is in place
+        by the time a caller can observe its write.
+        """
+        with self._lock:
+            if hook not in self._commit_hooks:
+                self._commit_hooks.append(hook)
+
+    def remove_commit_hook(self, hook: Callable[[Session], None]) -> None:
+        with self._lock:
+            if hook in self._commit_hooks:
+                self._commit_hooks.remove(hook)
+
+    def _after_commit(self, session: Session) -> None:
+        with self._lock:
+            hooks = list(self._commit_hooks)
+        for hook in hooks:
+            try:
+                hook(session)
+            except Exception:
+                logger.exception("Write queue commit hook failed")
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="db-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Finish the queued jobs, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=30)
+
+    def submit(self, job: WriteJob) -> Future:
+        future: Future = Future()
+        if not self.enabled:
+            # Same contract, one transaction per job on the caller's thread.
+            try:
+                future.set_result(self._run_direct(job))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return future
+        self.start()
+        # Run the job in the caller's context, so per-request metrics count
+        # its statements against the route that submitted it.
+        job = functools.partial(contextvars.copy_context().run, job)
+        self._queue.put((job, future))
+        return future
+
+    def run(self, job: WriteJob[T]) -> T:
+        return self.submit(job).result()
+
+    async def run_async(self, job: WriteJob[T]) -> T:
+        return await asyncio.wrap_future(self.submit(job))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "queued": self._queue.qsize(),
+                "jobs": self.jobs,
+                "commits": self.commits,
+                "jobs_per_commit": self.jobs / self.commits if self.commits else 0.0,
+                "largest_batch": self.largest_batch,
+                "commit_seconds": self.commit_seconds,
+            }
+
+    def _run_direct(self, job: WriteJob[T]) -> T:
+        with Session(self.engine, expire_on_commit=False) as session:
+            result = job(session)
+            session.commit()
+            session.expunge_all()
+            self._after_commit(session)
+        with self._lock:
+            self.jobs += 1
+            self.commits += 1
+        return result
+
+    def _next_batch(self) -> tuple[list, bool]:
+        first = self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._commit_batch(batch)
+        # Drain anything submitted while the stop sentinel was in flight.
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self._commit_batch([item])
+
+    def _commit_batch(self, batch: list[tuple[WriteJob, Future]]) -> None:
+        started = time.perf_counter()
+        outcomes: dict[Future, tuple[object, Optional[BaseException]]] = {}
+        try:
+            with Session(self.engine, expire_on_commit=False) as session:
+                # Take the write lock up front so no job has to upgrade a
+                # read transaction, and so the savepoints below stay nested
+                # inside one transaction instead of committing on RELEASE.
+                session.connection().exec_driver_sql("BEGIN IMMEDIATE")
+                for job, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with session.begin_nested():
+                            outcomes[future] = (job(session), None)
+                    except BaseException as exc:
+                        outcomes[future] = (None, exc)
+                session.commit()
+                session.expunge_all()
+                self._after_commit(session)
+        except BaseException as exc:
+            logger.exception("Write batch failed")
+            # Nothing was committed: every job fails, keeping its own error.
+            outcomes = {
+                future: (None, outcomes.get(future, (None, None))[1] or exc)
+                for _, future in batch
+                if not future.cancelled()
+            }
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.jobs += len(batch)
+            self.commits += 1
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.commit_seconds += elapsed
+        for future, (result, error) in outcomes.items():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+_queues: dict[int, WriteQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def write_queue(engine: Engine) -> WriteQueue:
+    """The process-wide WriteQueue for `engine`, created on first use."""
+    with _queues_lock:
+        writer = _queues.get(id(engine))
+        if writer is None:
+            writer = _queues[id(engine)] = WriteQueue(engine)
+        return writer
+
+
+def stop_writers() -> None:
+    with _queues_lock:
+        writers = list(_queues.values())
+        _queues.clear()
+    for writer in writers:
+        writer.stop()
@@ -6,9 +6,6 @@ import os
 BASE_DIR = Path(__file__).resolve().parents[1]
 STATIC_DIR = BASE_DIR / "static"
 
-<<<<<<< HEAD
-SESSION_SECRET = os.environ.get("SESSION_SECRET") or "dev-session-secret-change-me"
-=======
 JWT_SECRET = os.getenv("VOCABULARY_JWT_SECRET", "dev-secret-change-me")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_MINUTES = int(os.getenv("VOCABULARY_JWT_EXPIRE_MINUTES", "60"))
@@ -19,4 +16,63 @@ SMTP_USER = os.getenv("VOCABULARY_SMTP_USER", "")
 SMTP_PASSWORD = os.getenv("VOCABULARY_SMTP_PASSWORD", "")
 SMTP_FROM = os.getenv("VOCABULARY_SMTP_FROM", SMTP_USER)
 
->>>>>>> dce23febdb3bb8efd7e33cacfdea52a2dd384518
+USER_CACHE_SIZE = int(os.getenv("VOCABULARY_USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("VOCABULARY_USER_CACHE_TTL_SECONDS", "60"))
+
+HASH_WORKERS = int(os.getenv("VOCABULARY_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_MAX_PENDING = int(os.getenv("VOCABULARY_HASH_MAX_PENDING", "64"))
+BCRYPT_ROUNDS = int(os.getenv("VOCABULARY_BCRYPT_ROUNDS", "12"))
+
+# smtp | file | memory
+EMAIL_TRANSPORT = os.getenv("VOCABULARY_EMAIL_TRANSPORT", "smtp")
+EMAIL_FILE_DIR = Path(os.getenv("VOCABULARY_EMAIL_FILE_DIR", str(BASE_DIR / "outbox")))
+OUTBOX_WORKER_ENABLED = os.getenv("VOCABULARY_OUTBOX_WORKER", "1") == "1"
+OUTBOX_POLL_SECONDS = float(os.getenv("VOCABULARY_OUTBOX_POLL_SECONDS", "5"))
+OUTBOX_BATCH_SIZE = int(os.getenv("VOCABULARY_OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("VOCABULARY_OUTBOX_MAX_ATTEMPTS", "8"))
+
+IMPORT_CHUNK_SIZE = int(os.getenv("VOCABULARY_IMPORT_CHUNK_SIZE", "1000"))
+# Uploads larger than this run as a background ImportJob.
+IMPORT_BACKGROUND_BYTES = int(os.getenv("VOCABULARY_IMPORT_BACKGROUND_BYTES", str(1024 * 1024)))
+EXPORT_CHUNK_SIZE = int(os.getenv("VOCABULARY_EXPORT_CHUNK_SIZE", "1000"))
+REVIEW_BATCH_LIMIT = int(os.getenv("VOCABULARY_REVIEW_BATCH_LIMIT", "200"))
+
+# tuned: WAL + the pragmas below and a larger pool; default: SQLite/SQLAlchemy defaults.
+DB_PROFILE = os.getenv("VOCABULARY_DB_PROFILE", "tuned")
+DB_JOURNAL_MODE = os.getenv("VOCABULARY_DB_JOURNAL_MODE", "WAL")
+DB_SYNCHRONOUS = os.getenv("VOCABULARY_DB_SYNCHRONOUS", "NORMAL")
+DB_BUSY_TIMEOUT_MS = int(os.getenv("VOCABULARY_DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KIB = int(os.getenv("VOCABULARY_DB_CACHE_SIZE_KIB", "20000"))
+DB_MMAP_SIZE = int(os.getenv("VOCABULARY_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+DB_TEMP_STORE = os.getenv("VOCABULARY_DB_TEMP_STORE", "MEMORY")
+DB_POOL_SIZE = int(os.getenv("VOCABULARY_DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("VOCABULARY_DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("VOCABULARY_DB_POOL_TIMEOUT", "10"))
+
+# Route writes through one writer thread per process with group commits.
+WRITE_QUEUE_ENABLED = os.getenv("VOCABULARY_WRITE_QUEUE", "1") == "1"
+WRITE_BATCH_SIZE = int(os.getenv("VOCABULARY_WRITE_BATCH_SIZE", "64"))
+WRITE_BATCH_WAIT_MS = float(os.getenv("VOCABULARY_WRITE_BATCH_WAIT_MS", "2"))
+
+# memory: per-process LRU of rendered read responses; none: ETags only.
+RESPONSE_CACHE_BACKEND = os.getenv("VOCABULARY_RESPONSE_CACHE", "memory")
+RESPONSE_CACHE_SIZE = int(os.getenv("VOCABULARY_RESPONSE_CACHE_SIZE", "4096"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("VOCABULARY_RESPONSE_CACHE_TTL_SECONDS", "300"))
+# How often a process reads the changelog for writes committed by other processes.
+RESPONSE_CACHE_SYNC_SECONDS = float(os.getenv("VOCABULARY_RESPONSE_CACHE_SYNC_SECONDS", "1"))
+# Largest (and default) page of changes from GET /api/sync.
+SYNC_PAGE_LIMIT = int(os.getenv("VOCABULARY_SYNC_PAGE_LIMIT", "1000"))
+
+# Opt-in: per-route latency, SQL and threadpool metrics at GET /metrics
+# (Prometheus text). The endpoint has no auth, so only enable it where the
+# port is not public.
+METRICS_ENABLED = os.getenv("VOCABULARY_METRICS", "0") == "1"
+# Opt-in profiling: 0 disables; otherwise profile a VOCABULARY_PROFILE_RATE share
+# of requests and dump those slower than this as folded stacks.
+PROFILE_THRESHOLD_MS = float(os.getenv("VOCABULARY_PROFILE_THRESHOLD_MS", "0"))
+PROFILE_RATE = float(os.getenv("VOCABULARY_PROFILE_RATE", "1"))
+PROFILE_INTERVAL_MS = float(os.getenv("VOCABULARY_PROFILE_INTERVAL_MS", "1"))
+PROFILE_DIR = Path(os.getenv("VOCABULARY_PROFILE_DIR", str(BASE_DIR / "profiles")))
+# GET /api/leaderboard: largest top-N, and how long a process reuses its ranking.
+LEADERBOARD_MAX_LIMIT = int(os.getenv("VOCABULARY_LEADERBOARD_MAX_LIMIT", "100"))
+LEADERBOARD_TTL_SECONDS = float(os.getenv("VOCABULARY_LEADERBOARD_TTL_SECONDS", "30"))
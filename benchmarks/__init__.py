@@ -0,0 +1 @@
+"""Standalone benchmarks for Vocabulary Trainer hot paths."""
@@ -0,0 +1,174 @@
+"""
+Compare p50/p99 latency of the hot routes at high concurrency: the async
+routes in app.routes.api against sync copies of the previous handlers, which
+run on Starlette's threadpool (40 threads by default). Both are driven in
+process over httpx's ASGI transport.
+
+    python -m benchmarks.bench_async --clients 500 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime
+
+from .common import percentile, seed, use_temp_database
+
+ROUTES = ["review_today", "words", "stats", "review"]
+
+
+def sync_app():
+    """The hot routes as sync handlers with one Session per request, as before."""
+    from fastapi import Depends, FastAPI, Header, HTTPException
+    from sqlalchemy import func
+    from sqlmodel import Session, select
+
+    from app.db import engine
+    from app.models import User, Word
+    from app.services.activity import record_activity
+    from app.services.auth import decode_access_token, user_cache
+    from app.services.review import apply_review
+    from app.services.stats import compute_stats
+
+    app = FastAPI()
+
+    def current_user(authorization: str = Header(None)) -> User:
+        key = decode_access_token(authorization.partition(" ")[2]).lower()
+        user = user_cache.get(key)
+        if user is None:
+            with Session(engine) as session:
+                user = session.exec(select(User).where(func.lower(User.email) == key)).first()
+            user_cache.set(key, user)
+        return user
+
+    @app.get("/api/review/today")
+    def review_today(limit: int = 20, user: User = Depends(current_user)):
+        with Session(engine) as session:
+            return session.exec(
+                select(Word)
+                .where(Word.user_id == user.id, Word.next_review <= date.today())
+                .order_by(Word.next_review, Word.stage)
+                .limit(limit)
+            ).all()
+
+    @app.get("/api/words")
+    def list_words(limit: int = 50, user: User = Depends(current_user)):
+        with Session(engine) as session:
+            return session.exec(
+                select(Word)
+                .where(Word.user_id == user.id)
+                .order_by(Word.created_at.desc())
+                .limit(limit)
+            ).all()
+
+    @app.get("/api/stats")
+    def stats(user: User = Depends(current_user)):
+        with Session(engine) as session:
+            return compute_stats(session, user.id)
+
+    @app.post("/api/review/{word_id}")
+    def review(word_id: int, payload: dict, user: User = Depends(current_user)):
+        with Session(engine) as session:
+            word = session.get(Word, word_id)
+            if not word:
+                raise HTTPException(status_code=404)
+            entry = apply_review(word, payload["result"] == "good", datetime.now())
+            session.add(entry)
+            session.add(word)
+            record_activity(session, user.id, [entry.reviewed_at], "reviews")
+            session.commit()
+            session.refresh(word)
+            return word
+
+    return app
+
+
+async def drive(app, token: str, word_ids: list[int], clients: int, seconds: float) -> dict:
+    import httpx
+
+    rng = random.Random(1)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors = 0
+    headers = {"Authorization": f"Bearer {token}"}
+    requests = {
+        "review_today": lambda: ("GET", "/api/review/today", {}),
+        "words": lambda: ("GET", "/api/words", {}),
+        "stats": lambda: ("GET", "/api/stats", {}),
+        "review": lambda: (
+            "POST",
+            f"/api/review/{rng.choice(word_ids)}",
+            {"json": {"result": "good"}},
+        ),
+    }
+    deadline = time.perf_counter() + seconds
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+
+    async def client_loop(client) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            # Mostly reads, like a review session: 3 reads per answer.
+            name = rng.choice(ROUTES)
+            method, path, kwargs = requests[name]()
+            started = time.perf_counter()
+            response = await client.request(method, path, headers=headers, **kwargs)
+            if response.status_code < 400:
+                latencies[name].append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", limits=limits, timeout=None
+    ) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+    return {"latencies": latencies, "errors": errors}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--words", type=int, default=2_000)
+    args = parser.parse_args()
+
+    use_temp_database("async.db")
+    from app.db import engine, init_db
+    from app.services.auth import create_access_token
+    from app.services.writer import stop_writers
+    from main import app
+
+    init_db()
+    (user_id,) = seed(engine, words_per_user=args.words, reviews_per_user=20_000)
+    from sqlmodel import Session
+
+    from app.services.activity import backfill_activity
+
+    with Session(engine) as session:
+        backfill_activity(session)
+        session.commit()
+    with engine.connect() as conn:
+        word_ids = [
+            row[0]
+            for row in conn.exec_driver_sql("SELECT id FROM word WHERE user_id = ?", (user_id,))
+        ]
+    token = create_access_token("bench0@example.com")
+
+    for name, target in (("sync", sync_app()), ("async", app)):
+        result = asyncio.run(drive(target, token, word_ids, args.clients, args.seconds))
+        total = sum(len(values) for values in result["latencies"].values())
+        print(f"[{name}] {total / args.seconds:.1f} req/s, {result['errors']} errors")
+        for route in ROUTES:
+            values = result["latencies"][route]
+            print(
+                f"  {route:>12}: p50 {percentile(values, 50) * 1000:8.2f} ms, "
+                f"p99 {percentile(values, 99) * 1000:8.2f} ms ({len(values)} requests)"
+            )
+    stop_writers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Time repeat loads of the dashboard routes with the response cache off, with
+cached bodies, and with conditional requests answered 304, driving the app
+in process over httpx's ASGI transport.
+
+    python -m benchmarks.bench_cache --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from .common import seed, use_temp_database
+
+ROUTES = ["/api/stats", "/api/stats/series?range=30d", "/api/review/today", "/api/words"]
+
+
+async def timed(client, path: str, headers: dict, count: int) -> list[float]:
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code in (200, 304), response.text
+    return timings
+
+
+async def run(app, token: str, count: int) -> None:
+    import httpx
+
+    from app.db import engine
+    from app.services.response_cache import (
+        MemoryBackend,
+        NullBackend,
+        cache_generations,
+        response_cache,
+    )
+
+    # ASGITransport skips the lifespan, which would start this.
+    cache_generations.start(engine)
+    auth = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ROUTES:
+            response_cache.backend = NullBackend()
+            uncached = await timed(client, path, auth, count)
+            response_cache.backend = MemoryBackend(1024, 300)
+            etag = (await client.get(path, headers=auth)).headers["ETag"]
+            cached = await timed(client, path, auth, count)
+            revalidated = await timed(client, path, {**auth, "If-None-Match": etag}, count)
+            print(
+                f"{path:>28}: uncached {statistics.median(uncached) * 1000:7.2f} ms, "
+                f"cached {statistics.median(cached) * 1000:6.2f} ms, "
+                f"304 {statistics.median(revalidated) * 1000:6.2f} ms"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--words", type=int, default=5_000)
+    parser.add_argument("--reviews", type=int, default=100_000)
+    args = parser.parse_args()
+
+    use_temp_database("cache.db")
+    from sqlmodel import Session
+
+    from app.db import engine, init_db
+    from app.services.activity import backfill_activity
+    from app.services.auth import create_access_token
+    from main import app
+
+    init_db()
+    seed(engine, words_per_user=args.words, reviews_per_user=args.reviews)
+    with Session(engine) as session:
+        backfill_activity(session)
+        session.commit()
+    asyncio.run(run(app, create_access_token("bench0@example.com"), args.requests))
+
+
+if __name__ == "__main__":
+    main()
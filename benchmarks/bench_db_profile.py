@@ -0,0 +1,127 @@
+"""
+Run concurrent review writers and stats readers against the "default" and
+"tuned" engine profiles and report throughput, 'database is locked'
+failures and the pool / write-lock metrics from app.db.db_metrics.
+
+    python -m benchmarks.bench_db_profile --writers 8 --readers 8 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+
+from app.db import db_metrics
+from app.models import Word
+from app.services.activity import record_activity
+from app.services.review import apply_review
+from app.services.stats import compute_stats
+
+from .common import make_engine, percentile, seed
+
+
+def writer(engine, user_ids, word_ranges, deadline, rng_seed, out) -> None:
+    rng = random.Random(rng_seed)
+    while time.perf_counter() < deadline:
+        user_id = rng.choice(user_ids)
+        first, count = word_ranges[user_id]
+        started = time.perf_counter()
+        try:
+            with Session(engine) as session:
+                word = session.get(Word, first + rng.randrange(count))
+                review = apply_review(word, rng.random() < 0.8, datetime.now())
+                session.add(review)
+                session.add(word)
+                record_activity(session, user_id, [review.reviewed_at], "reviews")
+                session.commit()
+        except OperationalError:
+            out["errors"] += 1
+            continue
+        out["latencies"].append(time.perf_counter() - started)
+
+
+def reader(engine, user_ids, deadline, rng_seed, out) -> None:
+    rng = random.Random(rng_seed)
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            with Session(engine) as session:
+                compute_stats(session, rng.choice(user_ids))
+        except OperationalError:
+            out["errors"] += 1
+            continue
+        out["latencies"].append(time.perf_counter() - started)
+
+
+def run_profile(profile: str, args) -> None:
+    engine = make_engine(profile=profile)
+    user_ids = seed(
+        engine, users=args.users, words_per_user=1_000, reviews_per_user=5_000
+    )
+    with engine.connect() as conn:
+        word_ranges = {
+            row[0]: (row[1], row[2])
+            for row in conn.exec_driver_sql(
+                "SELECT user_id, min(id), count(*) FROM word GROUP BY user_id"
+            )
+        }
+
+    db_metrics.reset()
+    writes = {"latencies": [], "errors": 0}
+    reads = {"latencies": [], "errors": 0}
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(
+            target=writer, args=(engine, user_ids, word_ranges, deadline, n, writes)
+        )
+        for n in range(args.writers)
+    ] + [
+        threading.Thread(target=reader, args=(engine, user_ids, deadline, n, reads))
+        for n in range(args.readers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = db_metrics.stats()
+    print(f"[{profile}]")
+    for name, data in (("writes", writes), ("reads", reads)):
+        print(
+            f"  {name:>6}: {len(data['latencies']) / args.seconds:8.1f}/s, "
+            f"p50 {percentile(data['latencies'], 50) * 1000:7.2f} ms, "
+            f"p99 {percentile(data['latencies'], 99) * 1000:7.2f} ms, "
+            f"{data['errors']} errors"
+        )
+    print(
+        f"  pool: {metrics['checkouts']} checkouts, "
+        f"max wait {metrics['max_checkout_wait_seconds'] * 1000:.2f} ms; "
+        f"write statements: {metrics['writes']}, "
+        f"max {metrics['max_write_seconds'] * 1000:.2f} ms, "
+        f"{metrics['locked_errors']} locked"
+    )
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--profile", choices=["default", "tuned", "both"], default="both")
+    args = parser.parse_args()
+
+    profiles = ["default", "tuned"] if args.profile == "both" else [args.profile]
+    for profile in profiles:
+        run_profile(profile, args)
+
+
+if __name__ == "__main__":
+    main()
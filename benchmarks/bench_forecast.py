@@ -0,0 +1,50 @@
+"""
+Time GET /api/review/forecast's computation on a large deck: the bucket
+query, the pass-rate query and the per-stage convolutions.
+
+    python -m benchmarks.bench_forecast --words 100000 --days 365
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+from datetime import date
+
+from sqlmodel import Session
+
+from app.services.forecast import forecast_reviews
+
+from .common import make_engine, measure, seed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--reviews", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    (user_id,) = seed(engine, words_per_user=args.words, reviews_per_user=args.reviews)
+    today = date.today()
+
+    with Session(engine) as session:
+        result = forecast_reviews(session, user_id, today, args.days)
+        timings = measure(
+            lambda: forecast_reviews(session, user_id, today, args.days), args.repeat
+        )
+    total = sum(day["expected"] for day in result["forecast"])
+    print(
+        f"{args.words} cards, {args.days} days, pass rate {result['pass_rate']:.2f}: "
+        f"{total:.0f} expected reviews"
+    )
+    print(
+        f"median {statistics.median(timings) * 1000:.1f} ms, "
+        f"max {max(timings) * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure CSV import throughput in rows per second: a fresh deck, then the
+same file again so every row goes through the merge path.
+
+    python -m benchmarks.bench_import --rows 100000 --chunk-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import time
+
+from app.services.importer import import_csv
+
+from .common import QueryCounter, make_engine, seed
+
+TAGS = ["", "food", "travel,verbs", "work", "Food, Travel"]
+
+
+def build_csv(rows: int, rng_seed: int = 42) -> bytes:
+    rng = random.Random(rng_seed)
+    lines = ["term,translation,example,tags,stage,next_review,created_at"]
+    for number in range(rows):
+        lines.append(
+            f"word-{number},translation {number},,\"{rng.choice(TAGS)}\","
+            f"{rng.randint(0, 4)},,"
+        )
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def run(engine, user_id: int, payload: bytes, chunk_size: int) -> tuple[float, int, object]:
+    with QueryCounter(engine) as counter:
+        started = time.perf_counter()
+        progress = import_csv(engine, user_id, io.BytesIO(payload), chunk_size)
+        elapsed = time.perf_counter() - started
+    return elapsed, counter.count, progress
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=1_000)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    (user_id,) = seed(engine, words_per_user=1, reviews_per_user=0)
+    payload = build_csv(args.rows)
+    print(f"{args.rows} rows, {len(payload) / 1e6:.1f} MB, chunk size {args.chunk_size}")
+
+    for label in ("fresh", "re-import"):
+        elapsed, queries, progress = run(engine, user_id, payload, args.chunk_size)
+        print(
+            f"{label:>10}: {progress.imported} imported, {progress.skipped} skipped, "
+            f"{elapsed:6.2f} s, {args.rows / elapsed:9.0f} rows/s, {queries} queries"
+        )
+
+    with engine.connect() as conn:
+        words = conn.exec_driver_sql("SELECT count(*) FROM word").scalar()
+    print(f"{words} words in the deck")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Rank lookups for GET /api/leaderboard: counting the users ahead over
+stagecount, as a plain SQL leaderboard would, against one seek in the
+score table (scorecount.ahead); plus what rebuilding the top-N snapshot
+costs.
+
+    python -m benchmarks.bench_leaderboard --users 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models import StageCount, User
+from app.services.leaderboard import load_ranking, users_ahead
+from app.services.scheduler import MAX_STAGE
+
+from .common import make_engine, measure
+
+
+def count_rank(session: Session, score: int) -> int:
+    ahead = session.exec(
+        select(func.count()).where(
+            StageCount.stage == MAX_STAGE, StageCount.words > score
+        )
+    ).one()
+    return ahead + 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(
+            User.__table__.insert(),
+            [
+                {"id": uid, "email": f"bench{uid}@example.com", "password_hash": "x"}
+                for uid in range(1, args.users + 1)
+            ],
+        )
+        # Skewed like real progress: most users have learned a little.
+        conn.execute(
+            StageCount.__table__.insert(),
+            [
+                {"user_id": uid, "stage": MAX_STAGE, "words": int(rng.paretovariate(1.2))}
+                for uid in range(1, args.users + 1)
+            ],
+        )
+        conn.exec_driver_sql("ANALYZE")
+
+    with Session(engine) as session:
+        learned = session.exec(
+            select(StageCount.words).where(StageCount.stage == MAX_STAGE)
+        ).all()
+        scores = [rng.choice(learned) for _ in range(args.repeat)]
+        assert all(
+            count_rank(session, s) == users_ahead(session, s) + 1 for s in scores[:20]
+        )
+        build = statistics.median(measure(lambda: load_ranking(session), 20))
+        counted = statistics.median(
+            measure(lambda: [count_rank(session, s) for s in scores], 5)
+        )
+        seeked = statistics.median(
+            measure(lambda: [users_ahead(session, s) for s in scores], 5)
+        )
+    per = len(scores)
+    print(f"{args.users} users, top-N snapshot rebuild {build * 1000:.2f} ms")
+    print(
+        f"rank lookup: count(*) {counted / per * 1e6:8.1f} us, "
+        f"scorecount seek {seeked / per * 1e6:6.1f} us ({counted / seeked:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
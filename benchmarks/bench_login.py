@@ -0,0 +1,114 @@
+"""
+Measure login throughput while review traffic runs at the same time,
+driving the real app in-process over httpx's ASGI transport.
+
+    python -m benchmarks.bench_login --logins 8 --reviewers 16 --seconds 5
+    python -m benchmarks.bench_login --legacy   # hash on the request threadpool
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from .common import percentile, seed, use_temp_database
+
+
+async def drive(client, method: str, path: str, deadline: float, latencies: list, **kwargs):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.request(method, path, **kwargs)
+        if response.status_code < 400:
+            latencies.append(time.perf_counter() - started)
+
+
+async def phase(app, seconds: float, logins: int, reviewers: int, token: str) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    login_latencies: list[float] = []
+    review_latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        tasks = [
+            drive(
+                client,
+                "GET",
+                "/api/review/today",
+                deadline,
+                review_latencies,
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            for _ in range(reviewers)
+        ] + [
+            drive(
+                client,
+                "POST",
+                "/api/auth/login",
+                deadline,
+                login_latencies,
+                json={"email": "bench0@example.com", "password": "bench-password"},
+            )
+            for _ in range(logins)
+        ]
+        await asyncio.gather(*tasks)
+    return {
+        "logins_per_s": len(login_latencies) / seconds,
+        "reviews_per_s": len(review_latencies) / seconds,
+        "review_p50_ms": percentile(review_latencies, 50) * 1000,
+        "review_p99_ms": percentile(review_latencies, 99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=8)
+    parser.add_argument("--reviewers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="run hash jobs on the request threadpool, as sync handlers did",
+    )
+    args = parser.parse_args()
+
+    use_temp_database("login.db")
+    from sqlmodel import Session
+    from starlette.concurrency import run_in_threadpool
+
+    from app.db import engine, init_db
+    from app.models import User
+    from app.services.auth import create_access_token, hash_password
+    from app.services.hashing import hash_pool
+    from main import app
+
+    init_db()
+    (user_id,) = seed(engine, words_per_user=500, reviews_per_user=0)
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        user.password_hash = hash_password("bench-password")
+        session.add(user)
+        session.commit()
+    if args.legacy:
+        async def inline(fn, *fn_args):
+            return await run_in_threadpool(fn, *fn_args)
+
+        hash_pool.run = inline
+
+    token = create_access_token("bench0@example.com")
+    quiet = asyncio.run(phase(app, args.seconds, 0, args.reviewers, token))
+    busy = asyncio.run(phase(app, args.seconds, args.logins, args.reviewers, token))
+    for name, result in (("reviews only", quiet), ("with logins", busy)):
+        print(
+            f"{name:>13}: {result['logins_per_s']:7.1f} logins/s, "
+            f"{result['reviews_per_s']:7.1f} reviews/s, "
+            f"review p50 {result['review_p50_ms']:7.2f} ms, "
+            f"p99 {result['review_p99_ms']:7.2f} ms"
+        )
+    if not args.legacy:
+        print("hash pool:", hash_pool.stats())
+
+
+if __name__ == "__main__":
+    main()
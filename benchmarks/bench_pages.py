@@ -0,0 +1,69 @@
+"""
+Time a page of the word list near the start and near the end of a large
+deck, paging with OFFSET and with keyset cursors, for every sort key.
+
+    python -m benchmarks.bench_pages --words 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+
+from sqlmodel import Session, select
+
+from app.models import Word
+from app.services.pagination import SORT_KEYS, cursor_after, keyset_page
+
+from .common import make_engine, measure, seed
+
+PAGE = 50
+
+
+def offset_page(session: Session, user_id: int, sort: str, offset: int) -> list:
+    (statement,) = keyset_page(select(Word).where(Word.user_id == user_id), sort, None)
+    return session.exec(statement.offset(offset).limit(PAGE)).all()
+
+
+def cursor_page(session: Session, user_id: int, sort: str, cursor: str) -> list:
+    rows = []
+    for part in keyset_page(select(Word).where(Word.user_id == user_id), sort, cursor):
+        if len(rows) >= PAGE:
+            break
+        rows += session.exec(part.limit(PAGE - len(rows))).all()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    (user_id,) = seed(engine, words_per_user=args.words, reviews_per_user=0)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    with Session(engine) as session:
+        for sort in SORT_KEYS:
+            for label, offset in (("start", PAGE), ("end", args.words - 2 * PAGE)):
+                anchor = offset_page(session, user_id, sort, offset - 1)[0]
+                cursor = cursor_after(session, sort, anchor.id)
+                assert [w.id for w in cursor_page(session, user_id, sort, cursor)] == [
+                    w.id for w in offset_page(session, user_id, sort, offset)
+                ]
+                by_offset = measure(
+                    lambda: offset_page(session, user_id, sort, offset), args.repeat
+                )
+                by_cursor = measure(
+                    lambda: cursor_page(session, user_id, sort, cursor), args.repeat
+                )
+                print(
+                    f"{sort:>12} {label:>5}: offset {statistics.median(by_offset) * 1000:7.2f} ms, "
+                    f"cursor {statistics.median(by_cursor) * 1000:7.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
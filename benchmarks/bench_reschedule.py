@@ -0,0 +1,54 @@
+"""
+Time a scheduler settings save on a large deck: store the settings and move
+every reviewed card onto the new intervals, as PUT /api/settings/scheduler
+does, cycling through the built-in schedulers.
+
+    python -m benchmarks.bench_reschedule --words 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from sqlmodel import Session
+
+from app.services.scheduler import save_scheduler_settings
+
+from .common import make_engine, seed
+
+SETTINGS = [
+    ("multiplier", [3, 7, 14, 30], 1.5, 2.5),
+    ("geometric", None, 1.0, 2.5),
+    ("fixed", [2, 5, 10, 20], 1.0, 2.5),
+    ("fixed", [3, 7, 14, 30], 1.0, 2.5),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    (user_id,) = seed(engine, words_per_user=args.words, reviews_per_user=0)
+
+    timings = []
+    for _ in range(args.repeat):
+        for kind, intervals, multiplier, ease in SETTINGS:
+            started = time.perf_counter()
+            with Session(engine) as session:
+                _, rescheduled = save_scheduler_settings(
+                    session, user_id, kind, intervals, multiplier, ease
+                )
+                session.commit()
+            elapsed = time.perf_counter() - started
+            timings.append(elapsed)
+            print(f"{kind:>10}: {rescheduled} cards rescheduled in {elapsed * 1000:7.1f} ms")
+    print(f"median {statistics.median(timings) * 1000:.1f} ms over {len(timings)} saves")
+
+
+if __name__ == "__main__":
+    main()
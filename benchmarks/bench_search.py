@@ -0,0 +1,69 @@
+"""
+Compare the legacy lower(...) LIKE '%q%' word search against the FTS5
+trigram index for a user with a large deck.
+
+    python -m benchmarks.bench_search --words 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models import Word
+from app.services.search import fts_match, fts_phrase, word_fts
+
+from .common import make_engine, measure, seed
+
+QUERIES = ["term-1-4", "slation 123", "ation 99", "-1-49999"]
+
+
+def like_search(session: Session, user_id: int, query: str) -> list:
+    like = f"%{query.lower()}%"
+    return session.exec(
+        select(Word)
+        .where(
+            Word.user_id == user_id,
+            func.lower(Word.term).like(like) | func.lower(Word.translation).like(like),
+        )
+        .order_by(Word.created_at.desc())
+        .limit(50)
+    ).all()
+
+
+def fts_search(session: Session, user_id: int, query: str) -> list:
+    return session.exec(
+        select(Word)
+        .select_from(word_fts)
+        .join(Word, Word.id == word_fts.c.rowid)
+        .where(fts_match(fts_phrase(query)), Word.user_id == user_id)
+        .order_by(word_fts.c.rank)
+        .limit(50)
+    ).all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    (user_id,) = seed(engine, words_per_user=args.words, reviews_per_user=0)
+
+    with Session(engine) as session:
+        for query in QUERIES:
+            for name, fn in (("like", like_search), ("fts5", fts_search)):
+                timings = measure(lambda: fn(session, user_id, query), args.repeat)
+                hits = len(fn(session, user_id, query))
+                print(
+                    f"{query!r:>15} {name}: {hits:3d} hits, "
+                    f"median {statistics.median(timings) * 1000:8.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Time one page of GET /api/words, query plus JSON, the way it used to be
+built (ORM objects validated into list[WordOut] by pydantic) and the way it
+is now (column tuples written by orjson), for a few page sizes.
+
+    python -m benchmarks.bench_serialize --words 20000 --pages 50 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+
+from sqlmodel import Session, select
+
+from app.models import Word
+from app.schemas import WordOut
+from app.services.read_models import WORD_COLUMNS, render_words_out
+from app.services.response_cache import render_json
+
+from .common import make_engine, measure, seed
+
+
+def orm_page(session: Session, user_id: int, limit: int) -> bytes:
+    statement = (
+        select(Word)
+        .where(Word.user_id == user_id)
+        .order_by(Word.created_at.desc(), Word.id.desc())
+        .limit(limit)
+    )
+    body = render_json(list[WordOut], session.exec(statement).all())
+    # A request's session starts empty; don't let the identity map help.
+    session.expunge_all()
+    return body
+
+
+def rows_page(session: Session, user_id: int, limit: int) -> bytes:
+    statement = (
+        select(*WORD_COLUMNS)
+        .where(Word.user_id == user_id)
+        .order_by(Word.created_at.desc(), Word.id.desc())
+        .limit(limit)
+    )
+    return render_words_out(session.exec(statement).all())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=20_000)
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    (user_id,) = seed(engine, words_per_user=args.words, reviews_per_user=0)
+
+    with Session(engine) as session:
+        for limit in args.pages:
+            assert orm_page(session, user_id, limit) == rows_page(session, user_id, limit)
+            orm = statistics.median(
+                measure(lambda: orm_page(session, user_id, limit), args.repeat)
+            )
+            rows = statistics.median(
+                measure(lambda: rows_page(session, user_id, limit), args.repeat)
+            )
+            print(
+                f"{limit:>5} rows: orm+pydantic {1 / orm:7.0f} pages/s, "
+                f"columns+orjson {1 / rows:7.0f} pages/s ({orm / rows:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
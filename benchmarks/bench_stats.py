@@ -0,0 +1,89 @@
+"""
+Compare the legacy eleven-query GET /api/stats against the rollup-backed
+stats engine on a seeded database.
+
+    python -m benchmarks.bench_stats --reviews 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models import Review, Word
+from app.services.activity import backfill_activity
+from app.services.stats import compute_stats
+
+from .common import QueryCounter, make_engine, measure, seed
+
+
+def legacy_stats(session: Session, user_id: int, now: datetime) -> dict[str, int]:
+    """The per-field COUNT(*) implementation the stats engine replaced."""
+    today = now.date()
+    start_today = datetime.combine(today, datetime.min.time())
+    next_7d = today + timedelta(days=7)
+
+    def count(model, *conditions) -> int:
+        return session.exec(
+            select(func.count()).select_from(model).where(*conditions)
+        ).one()
+
+    stats = {
+        "today_due_count": count(
+            Word, Word.user_id == user_id, Word.next_review <= today
+        ),
+        "reviewed_today_count": count(
+            Review, Review.user_id == user_id, Review.reviewed_at >= start_today
+        ),
+        "due_next_7d": count(
+            Word,
+            Word.user_id == user_id,
+            Word.next_review > today,
+            Word.next_review <= next_7d,
+        ),
+    }
+    for key, days in {"1d": 1, "7d": 7, "30d": 30, "365d": 365}.items():
+        start = now - timedelta(days=days)
+        stats[f"new_words_{key}"] = count(
+            Word, Word.user_id == user_id, Word.created_at >= start
+        )
+        stats[f"reviews_{key}"] = count(
+            Review, Review.user_id == user_id, Review.reviewed_at >= start
+        )
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=5_000)
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    (user_id,) = seed(engine, words_per_user=args.words, reviews_per_user=args.reviews)
+
+    with Session(engine) as session:
+        backfill_activity(session)
+        session.commit()
+
+    now = datetime.now()
+
+    for name, fn in (("legacy", legacy_stats), ("engine", compute_stats)):
+        with Session(engine) as session:
+            with QueryCounter(engine) as counter:
+                fn(session, user_id, now)
+            timings = measure(lambda: fn(session, user_id, now), args.repeat)
+        print(
+            f"{name:>7}: {counter.count:2d} queries, "
+            f"median {statistics.median(timings) * 1000:8.2f} ms, "
+            f"max {max(timings) * 1000:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Drive the hot /api routes against a seeded database, run EXPLAIN QUERY PLAN
+on every statement they issue and fail if any of them scans a whole table
+or sorts its rows in a temp b-tree, unless the statement is allow-listed
+below with the reason.
+
+    python -m benchmarks.check_query_plans [-v]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+
+from .common import seed, use_temp_database
+
+# Virtual tables (FTS5) report their index lookups as SCAN ... VIRTUAL TABLE.
+# The \b stops the lookahead failing into a match on a shorter name.
+SCAN_RE = re.compile(r"^SCAN (\w+)\b(?! VIRTUAL TABLE)")
+# Whole and partial ("RIGHT PART OF", "LAST TERM OF") ORDER BY sorts.
+SORT_RE = re.compile(r"^USE TEMP B-TREE FOR (.* )?ORDER BY$")
+
+# Statement fragments whose table scans are known and accepted, with the reason.
+ALLOWED_SCANS: dict[str, str] = {
+    "JOIN user ON user.id = stagecount.user_id WHERE stagecount.stage = ? "
+    "ORDER BY stagecount.words DESC": "leaderboard top-N walks "
+    "ix_stagecount_learned in order and stops at the LIMIT",
+}
+
+# Statement fragments whose temp b-tree sorts are known and accepted.
+ALLOWED_SORTS: dict[str, str] = {
+    "word.id IN (SELECT wordtag.word_id FROM wordtag JOIN tag ON tag.id = "
+    "wordtag.tag_id WHERE tag.user_id = ? AND tag.name = ?)": "?tag= reads the "
+    "tag's words through ix_wordtag_tag_word and sorts only those",
+}
+
+
+def allowed_reason(allowed: dict[str, str], query: str) -> str | None:
+    return next((reason for key, reason in allowed.items() if key in query), None)
+
+
+def hot_requests(
+    word_id: int, other_id: int, cursors: dict[str, str]
+) -> list[tuple[str, str, dict]]:
+    csv_body = "term,translation,tags\nterm-1-1,extra,food\nbrand-new,new,travel\n"
+    return [
+        ("GET", "/api/review/today", {}),
+        ("GET", "/api/review/summary", {}),
+        ("GET", "/api/review/forecast?days=365", {}),
+        ("POST", f"/api/review/{word_id}", {"json": {"result": "good"}}),
+        (
+            "POST",
+            "/api/review/batch",
+            {
+                "json": {
+                    "answers": [
+                        {"word_id": word_id, "result": "bad", "idempotency_key": "a"},
+                        {"word_id": other_id, "result": "good", "idempotency_key": "b"},
+                    ]
+                }
+            },
+        ),
+        ("GET", "/api/words", {}),
+        ("GET", "/api/words?offset=200", {}),
+        *(
+            ("GET", "/api/words", {"params": {"sort": sort, "cursor": cursor}})
+            for sort, cursor in cursors.items()
+        ),
+        ("GET", "/api/words?q=term-1", {}),
+        ("GET", "/api/words?q=ter&highlight=true", {}),
+        ("GET", "/api/words?q=te", {}),
+        ("GET", "/api/words?tag=food", {}),
+        ("POST", "/api/words", {"json": {"term": "TERM-1-2", "translation": "x"}}),
+        ("POST", "/api/words", {"json": {"term": "fresh", "translation": "y"}}),
+        ("PATCH", f"/api/words/{word_id}", {"json": {"tags": "food,verbs"}}),
+        ("DELETE", f"/api/words/{other_id}", {}),
+        ("GET", "/api/tags", {}),
+        ("GET", "/api/stats", {}),
+        ("GET", "/api/stats/series?range=1d", {}),
+        ("GET", "/api/stats/series?range=365d", {}),
+        ("GET", "/api/leaderboard?limit=10", {}),
+        ("GET", "/api/sync", {"params": {"limit": 200}}),
+        ("GET", "/api/sync", {"params": {"since": 1_500}}),
+        ("GET", "/api/words/export", {}),
+        ("GET", "/api/words/export?format=ndjson&gzip=true&tag=food&stage=1", {}),
+        ("GET", "/api/words/export?created_from=2025-01-01&created_to=2025-06-30", {}),
+        ("POST", "/api/words/import", {"files": {"file": ("deck.csv", csv_body)}}),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    use_temp_database("plans.db")
+
+    # Imported only now so app.db picks up the throwaway database URL.
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from sqlmodel import Session
+
+    from app.db import async_engine, engine, init_db
+    from app.services.activity import backfill_activity
+    from app.services.auth import create_access_token
+    from app.services.pagination import SORT_KEYS, cursor_after
+    from app.services.response_cache import cache_generations
+    from app.services.tags import backfill_tags
+    from main import app
+
+    init_db()
+    (user_id,) = seed(engine, users=1, words_per_user=2_000, reviews_per_user=20_000)
+    seed(
+        engine,
+        users=3,
+        words_per_user=500,
+        reviews_per_user=2_000,
+        rng_seed=7,
+        email_prefix="other",
+    )
+    with Session(engine) as session:
+        backfill_activity(session)
+        backfill_tags(session)
+        session.commit()
+    with engine.begin() as conn:
+        word_id, other_id = [
+            row[0]
+            for row in conn.exec_driver_sql(
+                "SELECT id FROM word WHERE user_id = ? ORDER BY id LIMIT 2", (user_id,)
+            )
+        ]
+        conn.exec_driver_sql("ANALYZE")
+    with Session(engine) as session:
+        cursors = {sort: cursor_after(session, sort, word_id + 1_000) for sort in SORT_KEYS}
+
+    captured: dict[str, tuple] = {}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if executemany or statement.lstrip().upper().startswith(("INSERT", "PRAGMA")):
+            return
+        captured.setdefault(statement, parameters)
+
+    client = TestClient(app)
+    # The lifespan would start it; its catch-up runs after every queued write.
+    cache_generations.start(engine)
+    headers = {"Authorization": f"Bearer {create_access_token('bench0@example.com')}"}
+    # Async routes read through aiosqlite; capture both engines.
+    engines = [engine, async_engine.sync_engine]
+    for target in engines:
+        event.listen(target, "before_cursor_execute", capture)
+    try:
+        for method, path, kwargs in hot_requests(word_id, other_id, cursors):
+            response = client.request(method, path, headers=headers, **kwargs)
+            if response.status_code >= 400:
+                print(f"{method} {path} -> {response.status_code}: {response.text}")
+                return 2
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", capture)
+
+    scan_failures = sort_failures = 0
+    with engine.connect() as conn:
+        tables = {
+            row[0]
+            for row in conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        for statement, parameters in captured.items():
+            plan = [
+                row[3]
+                for row in conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            ]
+            query = " ".join(statement.split())
+            scans = [
+                detail
+                for detail in plan
+                if (match := SCAN_RE.match(detail)) and match.group(1) in tables
+            ]
+            sorts = [detail for detail in plan if SORT_RE.match(detail)]
+            notes = []
+            if scans:
+                allowed = allowed_reason(ALLOWED_SCANS, query)
+                if allowed is None:
+                    scan_failures += 1
+                    print(f"FULL SCAN: {' | '.join(plan)}\n  {query}\n")
+                    continue
+                notes.append(allowed)
+            if sorts:
+                allowed = allowed_reason(ALLOWED_SORTS, query)
+                if allowed is None:
+                    sort_failures += 1
+                    print(f"SORT: {' | '.join(plan)}\n  {query}\n")
+                    continue
+                notes.append(allowed)
+            if args.verbose:
+                note = f" (allowed: {'; '.join(notes)})" if notes else ""
+                print(f"ok{note}: {' | '.join(plan)}\n  {query}\n")
+
+    print(
+        f"{len(captured)} statements checked, {scan_failures} full table scans, "
+        f"{sort_failures} temp b-tree sorts"
+    )
+    return 1 if scan_failures or sort_failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+
+from app.models import Review, User, Word
+
+
+def use_temp_database(name: str = "bench.db") -> Path:
+    """
+    Point app.db at a throwaway database. Call before anything imports
+    app.db, since the module-level engine reads the URL on import.
+    """
+    path = Path(tempfile.mkdtemp()) / name
+    os.environ["VOCABULARY_DATABASE_URL"] = f"sqlite:///{path}"
+    return path
+
+
+def make_engine(path: Path | None = None, profile: str | None = None) -> Engine:
+    from app.db import DB_PROFILE, apply_schema_migrations, create_db_engine
+
+    if path is None:
+        path = Path(tempfile.mkdtemp()) / "bench.db"
+    engine = create_db_engine(f"sqlite:///{path}", profile or DB_PROFILE)
+    SQLModel.metadata.create_all(engine)
+    apply_schema_migrations(engine)
+    return engine
+
+
+def seed(
+    engine: Engine,
+    *,
+    users: int = 1,
+    words_per_user: int = 2_000,
+    reviews_per_user: int = 100_000,
+    days: int = 400,
+    rng_seed: int = 42,
+    email_prefix: str = "bench",
+) -> list[int]:
+    """
+    Bulk-insert users, words and a review log spread over the last `days`
+    days. Returns the created user ids.
+    """
+    rng = random.Random(rng_seed)
+    now = datetime.now()
+    today = date.today()
+    user_ids = []
+    with engine.begin() as conn:
+        for index in range(users):
+            result = conn.execute(
+                User.__table__.insert().values(
+                    email=f"{email_prefix}{index}@example.com",
+                    password_hash="x",
+                    is_verified=True,
+                    created_at=now,
+                )
+            )
+            user_id = result.inserted_primary_key[0]
+            user_ids.append(user_id)
+
+            words = []
+            for number in range(words_per_user):
+                stage = rng.randint(0, 4)
+                words.append(
+                    {
+                        "user_id": user_id,
+                        "term": f"term-{user_id}-{number}",
+                        "translation": f"translation {number}",
+                        "example": None,
+                        "tags": rng.choice([None, "food", "travel,verbs", "work"]),
+                        "created_at": now - timedelta(minutes=rng.randint(0, days * 1440)),
+                        "stage": stage,
+                        "next_review": today + timedelta(days=rng.randint(-10, 30)),
+                    }
+                )
+            conn.execute(Word.__table__.insert(), words)
+            first_id = conn.exec_driver_sql(
+                "SELECT min(id) FROM word WHERE user_id = ?", (user_id,)
+            ).scalar()
+
+            reviews = []
+            for _ in range(reviews_per_user):
+                reviews.append(
+                    {
+                        "user_id": user_id,
+                        "word_id": first_id + rng.randrange(words_per_user),
+                        "reviewed_at": now - timedelta(minutes=rng.randint(0, days * 1440)),
+                        "result": rng.random() < 0.8,
+                        "next_review_assigned": today,
+                    }
+                )
+            if reviews:
+                conn.execute(Review.__table__.insert(), reviews)
+    return user_ids
+
+
+class QueryCounter:
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def measure(fn: Callable[[], object], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
@@ -0,0 +1,123 @@
+"""
+Load test for concurrent writes: start N worker processes (standing in for
+uvicorn workers) that share one SQLite file, each driving
+POST /api/review/{id} over httpx's ASGI transport, and report total
+writes per second for each worker count, with and without the write queue.
+
+    python -m benchmarks.load_writes --workers 1 2 4 --clients 16 --seconds 5
+    python -m benchmarks.load_writes --mode direct   # one transaction per request
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import time
+
+from .common import percentile, seed, use_temp_database
+
+
+async def drive(app, token: str, word_ids: list[int], clients: int, seconds: float, rng_seed: int):
+    import httpx
+
+    rng = random.Random(rng_seed)
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    transport = httpx.ASGITransport(app=app)
+
+    async def client_loop(client) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            word_id = rng.choice(word_ids)
+            result = "good" if rng.random() < 0.8 else "bad"
+            started = time.perf_counter()
+            response = await client.post(
+                f"/api/review/{word_id}",
+                json={"result": result},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+    return latencies, errors
+
+
+def worker(args: tuple) -> dict:
+    index, clients, seconds, word_ids, token = args
+    from app.db import db_metrics, engine
+    from app.services.writer import stop_writers, write_queue
+    from main import app
+
+    latencies, errors = asyncio.run(
+        drive(app, token, word_ids, clients, seconds, rng_seed=index)
+    )
+    stats = write_queue(engine).stats()
+    locked = db_metrics.stats()["locked_errors"]
+    stop_writers()
+    return {
+        "writes": len(latencies),
+        "errors": errors,
+        "locked": locked,
+        "latencies": latencies,
+        "jobs_per_commit": stats["jobs_per_commit"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=16, help="concurrent clients per worker")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--mode", choices=["queue", "direct", "both"], default="both")
+    args = parser.parse_args()
+
+    use_temp_database("writes.db")
+    os.environ["VOCABULARY_OUTBOX_WORKER"] = "0"
+    from app.db import engine, init_db
+    from app.services.auth import create_access_token
+
+    init_db()
+    (user_id,) = seed(engine, words_per_user=2_000, reviews_per_user=0)
+    with engine.connect() as conn:
+        word_ids = [
+            row[0]
+            for row in conn.exec_driver_sql("SELECT id FROM word WHERE user_id = ?", (user_id,))
+        ]
+    engine.dispose()
+    token = create_access_token("bench0@example.com")
+
+    modes = ["direct", "queue"] if args.mode == "both" else [args.mode]
+    # Fresh interpreters, so each worker builds its own engine and writer.
+    context = multiprocessing.get_context("spawn")
+    for mode in modes:
+        os.environ["VOCABULARY_WRITE_QUEUE"] = "1" if mode == "queue" else "0"
+        for workers in args.workers:
+            jobs = [
+                (index, args.clients, args.seconds, word_ids, token)
+                for index in range(workers)
+            ]
+            with context.Pool(workers) as pool:
+                results = pool.map(worker, jobs)
+            writes = sum(result["writes"] for result in results)
+            latencies = [value for result in results for value in result["latencies"]]
+            batching = sum(result["jobs_per_commit"] for result in results) / workers
+            print(
+                f"{mode:>6} x{workers}: {writes / args.seconds:8.1f} writes/s, "
+                f"p50 {percentile(latencies, 50) * 1000:7.2f} ms, "
+                f"p99 {percentile(latencies, 99) * 1000:8.2f} ms, "
+                f"{sum(result['errors'] for result in results)} errors "
+                f"({sum(result['locked'] for result in results)} locked), "
+                f"{batching:.1f} writes/commit"
+            )
+
+
+if __name__ == "__main__":
+    main()
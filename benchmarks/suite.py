@@ -0,0 +1,326 @@
+"""
+Synthetic load for the whole API. Seeds a throwaway SQLite database, then
+drives the real app over httpx's ASGI transport, one scenario at a time,
+from `--concurrency` clients in each of `--processes` worker processes.
+Prints (or writes to --output) a JSON report with throughput, p50/p95/p99
+latency and SQL statements per request for every scenario.
+
+    python -m benchmarks.suite --users 4 --words 2000 --reviews 20000 --output base.json
+    python -m benchmarks.suite --processes 4 --scenarios review_answer words_search
+    python -m benchmarks.suite --compare base.json new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from .common import percentile, seed, use_temp_database
+
+
+def import_body(rng: random.Random, user_index: int, words: int) -> str:
+    """A 100-row CSV: half terms the user already has, half new ones."""
+    lines = ["term,translation,tags"]
+    for _ in range(50):
+        lines.append(f"term-{user_index + 1}-{rng.randrange(words)},extra,food")
+    for _ in range(50):
+        lines.append(f"import-{rng.getrandbits(48):x},new,travel")
+    return "\n".join(lines) + "\n"
+
+
+# name -> request builder(rng, user index, word ids, words per user)
+SCENARIOS = {
+    "review_today": lambda rng, user, ids, words: ("GET", "/api/review/today", {}),
+    "review_answer": lambda rng, user, ids, words: (
+        "POST",
+        f"/api/review/{rng.choice(ids)}",
+        {"json": {"result": "good" if rng.random() < 0.8 else "bad"}},
+    ),
+    "words": lambda rng, user, ids, words: ("GET", "/api/words", {}),
+    "words_search": lambda rng, user, ids, words: (
+        "GET",
+        "/api/words",
+        {"params": {"q": f"term-{user + 1}-{rng.randrange(words)}"}},
+    ),
+    "words_tag": lambda rng, user, ids, words: (
+        "GET",
+        "/api/words",
+        {"params": {"tag": rng.choice(["food", "travel", "verbs", "work"])}},
+    ),
+    "stats": lambda rng, user, ids, words: ("GET", "/api/stats", {}),
+    "stats_series": lambda rng, user, ids, words: (
+        "GET",
+        "/api/stats/series",
+        {"params": {"range": rng.choice(["1d", "7d", "30d", "365d"])}},
+    ),
+    "export": lambda rng, user, ids, words: ("GET", "/api/words/export", {}),
+    "import": lambda rng, user, ids, words: (
+        "POST",
+        "/api/words/import",
+        {"files": {"file": ("deck.csv", import_body(rng, user, words))}},
+    ),
+}
+
+
+async def drive(
+    scenario: str,
+    tokens: list[str],
+    word_ids: list[list[int]],
+    words: int,
+    clients: int,
+    seconds: float,
+    rng_seed: int,
+) -> dict:
+    import httpx
+    from sqlalchemy import event
+
+    from app.db import async_engine, engine
+    from app.services.response_cache import cache_generations
+    from main import app
+
+    # ASGITransport skips the lifespan, which would start this.
+    cache_generations.start(engine)
+    build = SCENARIOS[scenario]
+    rng = random.Random(rng_seed)
+    latencies: list[float] = []
+    errors = 0
+    statements = 0
+
+    def count(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    engines = [engine, async_engine.sync_engine]
+    for target in engines:
+        event.listen(target, "before_cursor_execute", count)
+    deadline = time.perf_counter() + seconds
+
+    async def client_loop(client) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            user = rng.randrange(len(tokens))
+            method, path, kwargs = build(rng, user, word_ids[user], words)
+            headers = {"Authorization": f"Bearer {tokens[user]}"}
+            started = time.perf_counter()
+            response = await client.request(method, path, headers=headers, **kwargs)
+            if response.status_code < 400:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    started = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", limits=limits, timeout=None
+        ) as client:
+            await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", count)
+    return {
+        "latencies": latencies,
+        "errors": errors,
+        "statements": statements,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+def run_worker(args: tuple) -> dict:
+    scenario, tokens, word_ids, words, clients, seconds, rng_seed, barrier = args
+    if barrier is not None:
+        # Start together, so every process is loading the database at once.
+        barrier.wait()
+    return asyncio.run(
+        drive(scenario, tokens, word_ids, words, clients, seconds, rng_seed)
+    )
+
+
+def summarize(results: list[dict]) -> dict:
+    latencies = [value for result in results for value in result["latencies"]]
+    requests = len(latencies)
+    errors = sum(result["errors"] for result in results)
+    elapsed = max(result["elapsed"] for result in results)
+    statements = sum(result["statements"] for result in results)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_per_request": (
+            round(statements / (requests + errors), 2) if requests + errors else 0.0
+        ),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline_path: str, current_path: str) -> None:
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)
+    with open(current_path) as handle:
+        current = json.load(handle)
+    print(
+        f"{baseline['meta'].get('commit')} -> {current['meta'].get('commit')}"
+        f"  (ratio new/old; throughput up is better, latency and queries down)"
+    )
+    for name, new in current["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if not old:
+            print(f"{name:>14}: new scenario")
+            continue
+        cells = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "queries_per_request"):
+            ratio = new[key] / old[key] if old[key] else float("nan")
+            cells.append(f"{key} {ratio:5.2f}x")
+        print(f"{name:>14}: " + ", ".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--words", type=int, default=2_000, help="words per user")
+    parser.add_argument("--reviews", type=int, default=20_000, help="review log rows per user")
+    parser.add_argument("--seconds", type=float, default=5.0, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="clients per process")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    use_temp_database("suite.db")
+    os.environ["VOCABULARY_OUTBOX_WORKER"] = "0"
+    from sqlmodel import Session
+
+    from app.db import engine, init_db
+    from app.services.activity import backfill_activity
+    from app.services.auth import create_access_token
+    from app.services.tags import backfill_tags
+    from app.settings import RESPONSE_CACHE_BACKEND, WRITE_QUEUE_ENABLED
+
+    init_db()
+    user_ids = seed(
+        engine,
+        users=args.users,
+        words_per_user=args.words,
+        reviews_per_user=args.reviews,
+        rng_seed=args.seed,
+    )
+    with Session(engine) as session:
+        backfill_activity(session)
+        backfill_tags(session)
+        session.commit()
+    with engine.connect() as conn:
+        word_ids = [
+            [
+                row[0]
+                for row in conn.exec_driver_sql(
+                    "SELECT id FROM word WHERE user_id = ?", (user_id,)
+                )
+            ]
+            for user_id in user_ids
+        ]
+    engine.dispose()
+    tokens = [create_access_token(f"bench{index}@example.com") for index in range(args.users)]
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "cpus": os.cpu_count(),
+            "response_cache": RESPONSE_CACHE_BACKEND,
+            "write_queue": WRITE_QUEUE_ENABLED,
+            **{
+                key: getattr(args, key)
+                for key in (
+                    "users",
+                    "words",
+                    "reviews",
+                    "seconds",
+                    "concurrency",
+                    "processes",
+                    "seed",
+                )
+            },
+        },
+        "scenarios": {},
+    }
+
+    def jobs(scenario: str, barrier) -> list[tuple]:
+        return [
+            (
+                scenario,
+                tokens,
+                word_ids,
+                args.words,
+                args.concurrency,
+                args.seconds,
+                args.seed + index,
+                barrier,
+            )
+            for index in range(args.processes)
+        ]
+
+    if args.processes == 1:
+        from app.services.writer import stop_writers
+
+        for scenario in args.scenarios:
+            results = [run_worker(job) for job in jobs(scenario, None)]
+            report["scenarios"][scenario] = summarize(results)
+            print(f"{scenario}: {report['scenarios'][scenario]}", file=sys.stderr)
+        stop_writers()
+    else:
+        # Fresh interpreters, so each process builds its own engine and writer.
+        context = multiprocessing.get_context("spawn")
+        with context.Manager() as manager, context.Pool(args.processes) as pool:
+            for scenario in args.scenarios:
+                barrier = manager.Barrier(args.processes)
+                results = pool.map(run_worker, jobs(scenario, barrier), chunksize=1)
+                report["scenarios"][scenario] = summarize(results)
+                print(f"{scenario}: {report['scenarios'][scenario]}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,56 @@ from __future__ import annotations
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from starlette.middleware.sessions import SessionMiddleware
+from sqlmodel import Session
 
-from app.db import init_db
-from app.routes.auth import router as auth_router
+from app.db import async_engine, engine, init_db
 from app.routes.api import router as api_router
+from app.routes.metrics import router as metrics_router
 from app.routes.pages import router as pages_router
-from app.settings import STATIC_DIR
-from app.settings import SESSION_SECRET
+from app.services.activity import ensure_activity_rollups
+from app.services.hashing import HashPoolBusy
+from app.services.metrics import MetricsMiddleware, request_metrics
+from app.services.outbox import start_worker, stop_worker
+from app.services.progress import ensure_progress_counters
+from app.services.response_cache import cache_generations
+from app.services.tags import ensure_tag_index
+from app.services.writer import stop_writers
+from app.settings import METRICS_ENABLED, OUTBOX_WORKER_ENABLED, STATIC_DIR
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     init_db()
+    with Session(engine) as session:
+        ensure_activity_rollups(session)
+        ensure_tag_index(session)
+        ensure_progress_counters(session)
+    if OUTBOX_WORKER_ENABLED:
+        start_worker(engine)
+    cache_generations.start(engine)
     yield
+    cache_generations.stop()
+    stop_worker()
+    stop_writers()
+
+
+async def hash_pool_busy(_: Request, exc: HashPoolBusy) -> JSONResponse:
+    return JSONResponse(
+        status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+    )
 
 
 app = FastAPI(title="Vocabulary Trainer", version="0.1.0", lifespan=lifespan)
-app.add_middleware(SessionMiddleware, secret_key=SESSION_SECRET, same_site="lax")
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 app.include_router(pages_router)
-app.include_router(auth_router)
 app.include_router(api_router)
+app.add_exception_handler(HashPoolBusy, hash_pool_busy)
+
+if METRICS_ENABLED:
+    request_metrics.attach(engine)
+    request_metrics.attach(async_engine.sync_engine)
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
@@ -1,13 +1,14 @@
 import { apiRequest } from "./js/api.js";
-<<<<<<< HEAD
-import { initAuthUI } from "./js/auth.js";
-=======
 import { initAuth } from "./js/auth.js";
->>>>>>> dce23febdb3bb8efd7e33cacfdea52a2dd384518
 import { queryElements } from "./js/dom.js";
 import { initWordsCardsDragAndDrop } from "./js/layout_drag.js";
 import { initConfirmModal } from "./js/modal.js";
-import { loadReviewQueue, revealTranslation, submitReview } from "./js/review.js";
+import {
+  initReviewBuffer,
+  loadReviewQueue,
+  revealTranslation,
+  submitReview,
+} from "./js/review.js";
 import { createState } from "./js/state.js";
 import { loadStats } from "./js/stats.js";
 import { initStatsChart } from "./js/charts.js";
@@ -15,9 +16,6 @@ import { switchSection } from "./js/tabs.js";
 import { debounce, setStatus } from "./js/utils.js";
 import { loadWords, resetForm } from "./js/words.js";
 
-<<<<<<< HEAD
-function startApp(ctx) {
-=======
 function downloadBlob(filename, blob) {
   const url = window.URL.createObjectURL(blob);
   const link = document.createElement("a");
@@ -103,10 +101,10 @@ document.addEventListener("DOMContentLoaded", () => {
   document.body.classList.add("page-loaded");
   initWordsCardsDragAndDrop();
   initConfirmModal(ctx);
->>>>>>> dce23febdb3bb8efd7e33cacfdea52a2dd384518
   resetForm(ctx);
 
   const startApp = () => {
+    initReviewBuffer(ctx);
     loadWords(ctx);
     loadReviewQueue(ctx);
     loadStats(ctx);
@@ -190,15 +188,17 @@ document.addEventListener("DOMContentLoaded", () => {
   });
 
   ctx.elements.markGood.addEventListener("click", async () => {
-    await submitReview(ctx, "good");
-    await loadStats(ctx);
-    await loadWords(ctx);
+    if (await submitReview(ctx, "good")) {
+      await loadStats(ctx);
+      await loadWords(ctx);
+    }
   });
 
   ctx.elements.markBad.addEventListener("click", async () => {
-    await submitReview(ctx, "bad");
-    await loadStats(ctx);
-    await loadWords(ctx);
+    if (await submitReview(ctx, "bad")) {
+      await loadStats(ctx);
+      await loadWords(ctx);
+    }
   });
 
   const runSearch = debounce(() => loadWords(ctx), 300);
@@ -238,27 +238,4 @@ document.addEventListener("DOMContentLoaded", () => {
   }
 
   ctx.elements.tagFilter.addEventListener("input", runSearch);
-}
-
-document.addEventListener("DOMContentLoaded", async () => {
-  const ctx = {
-    state: createState(),
-    elements: queryElements(),
-  };
-
-  document.body.classList.add("page-loaded");
-  initWordsCardsDragAndDrop();
-  let started = false;
-  const authed = await initAuthUI(ctx, {
-    onAuthed: () => {
-      if (started) return;
-      started = true;
-      startApp(ctx);
-    },
-  });
-
-  if (authed && !started) {
-    started = true;
-    startApp(ctx);
-  }
 });
@@ -37,6 +37,8 @@ export function queryElements() {
     statReviews7d: document.querySelector("#stat-reviews-7d"),
     statReviews30d: document.querySelector("#stat-reviews-30d"),
     statReviews365d: document.querySelector("#stat-reviews-365d"),
+    statStreak: document.querySelector("#stat-streak"),
+    statLearned: document.querySelector("#stat-learned"),
     statsChart: document.querySelector("#stats-chart"),
     statsTooltip: document.querySelector("#stats-tooltip"),
     statsRangeButtons: document.querySelectorAll("[data-stats-range]"),
@@ -62,21 +64,5 @@ export function queryElements() {
     loginStatus: document.querySelector("#login-status"),
     logoutButton: document.querySelector("#logout-button"),
     refreshStats: document.querySelector("#refresh-stats"),
-
-    authStatus: document.querySelector("#auth-status"),
-    authLoginBtn: document.querySelector("#auth-login-btn"),
-    authRegisterBtn: document.querySelector("#auth-register-btn"),
-    authLogoutBtn: document.querySelector("#auth-logout-btn"),
-
-    authModal: document.querySelector("#auth-modal"),
-    authBackdrop: document.querySelector("#auth-modal-backdrop"),
-    authClose: document.querySelector("#auth-modal-close"),
-    authTitle: document.querySelector("#auth-title"),
-    authForm: document.querySelector("#auth-form"),
-    authEmail: document.querySelector("#auth-email"),
-    authPassword: document.querySelector("#auth-password"),
-    authSubmit: document.querySelector("#auth-submit"),
-    authSwitchMode: document.querySelector("#auth-switch-mode"),
-    authError: document.querySelector("#auth-error"),
   };
 }
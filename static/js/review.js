@@ -1,6 +1,72 @@
 import { apiRequest } from "./api.js";
+import { currentOwner, syncWords } from "./sync.js";
 import { formatDate, setStatus } from "./utils.js";
 
+// Answers are kept per account under PENDING_KEY.<email>, so signing in
+// as someone else never sends the previous account's answers.
+const PENDING_KEY = "vocabulary.pendingReviews";
+const FLUSH_SIZE = 10;
+// Per request; comfortably under the server's REVIEW_BATCH_LIMIT (200).
+const BATCH_LIMIT = 100;
+const FLUSH_INTERVAL_MS = 15000;
+const QUEUE_SIZE = 20;
+
+function localDate() {
+  const now = new Date();
+  const pad = (value) => String(value).padStart(2, "0");
+  return `${now.getFullYear()}-${pad(now.getMonth() + 1)}-${pad(now.getDate())}`;
+}
+
+function newIdempotencyKey() {
+  if (window.crypto && window.crypto.randomUUID) {
+    return window.crypto.randomUUID();
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
+function savePending(state) {
+  if (!state.pendingOwner) return;
+  try {
+    window.localStorage.setItem(
+      `${PENDING_KEY}.${state.pendingOwner}`,
+      JSON.stringify(state.pendingReviews)
+    );
+  } catch {
+    // Storage full or disabled; answers still live in memory.
+  }
+}
+
+function loadPending(owner) {
+  if (!owner) return [];
+  try {
+    const storage = window.localStorage;
+    // Earlier versions shared one buffer; the server skips answers for
+    // words the account does not own, so the first account may adopt it.
+    const legacy = storage.getItem(PENDING_KEY);
+    if (legacy !== null) {
+      storage.removeItem(PENDING_KEY);
+      if (storage.getItem(`${PENDING_KEY}.${owner}`) === null) {
+        storage.setItem(`${PENDING_KEY}.${owner}`, legacy);
+      }
+    }
+    const data = JSON.parse(storage.getItem(`${PENDING_KEY}.${owner}`) || "[]");
+    return Array.isArray(data) ? data : [];
+  } catch {
+    return [];
+  }
+}
+
+// Switches the in-memory buffer to the signed-in account's; the other
+// account's answers stay stored under its own key.
+function usePendingOwner(state) {
+  const owner = currentOwner();
+  if (state.pendingOwner !== owner) {
+    state.pendingOwner = owner;
+    state.pendingReviews = loadPending(owner);
+  }
+  return owner;
+}
+
 function setReviewButtons({ elements }, enabled) {
   elements.markGood.disabled = !enabled;
   elements.markBad.disabled = !enabled;
@@ -34,12 +100,77 @@ export function renderReviewCard({ state, elements }) {
   elements.reviewQueue.textContent = `Remaining in queue: ${state.reviewQueue.length}`;
 }
 
+export async function flushReviews(ctx, { keepalive = false } = {}) {
+  const { state } = ctx;
+  // On page hide there is no time to wait; idempotency keys make the
+  // overlap with an in-flight flush harmless.
+  if (state.flushingReviews && !keepalive) {
+    await state.flushingReviews;
+  }
+  const owner = usePendingOwner(state);
+  if (!state.pendingReviews.length) return false;
+  // A long offline spell can buffer more answers than one batch may
+  // carry, so send them oldest first, one slice per request.
+  const send = async () => {
+    // Stop if the account changed mid-flush: the token is read per request.
+    while (state.pendingReviews.length && currentOwner() === owner) {
+      const answers = state.pendingReviews.slice(0, BATCH_LIMIT);
+      await apiRequest("/api/review/batch", {
+        method: "POST",
+        body: JSON.stringify({ answers }),
+        keepalive,
+      });
+      // Keys make a resend harmless, so only drop what this request carried.
+      const sent = new Set(answers.map((answer) => answer.idempotency_key));
+      state.pendingReviews = state.pendingReviews.filter(
+        (answer) => !sent.has(answer.idempotency_key)
+      );
+      savePending(state);
+    }
+  };
+  const request = send();
+  state.flushingReviews = request.catch(() => null);
+  try {
+    await request;
+    return true;
+  } finally {
+    state.flushingReviews = null;
+  }
+}
+
+export function initReviewBuffer(ctx) {
+  if (ctx.state.reviewBufferReady) return;
+  ctx.state.reviewBufferReady = true;
+  usePendingOwner(ctx.state);
+  const flushQuietly = (options) => {
+    flushReviews(ctx, options).catch(() => {
+      // Kept in the buffer for the next flush.
+    });
+  };
+  window.setInterval(() => flushQuietly(), FLUSH_INTERVAL_MS);
+  window.addEventListener("pagehide", () => flushQuietly({ keepalive: true }));
+  document.addEventListener("visibilitychange", () => {
+    if (document.visibilityState === "hidden") {
+      flushQuietly({ keepalive: true });
+    }
+  });
+}
+
 export async function loadReviewQueue(ctx) {
   const { state, elements } = ctx;
   setStatus(elements.reviewStatus, "Loading batch...");
   try {
-    const data = await apiRequest("/api/review/today?limit=20");
-    state.reviewQueue = data;
+    // Unsent answers would otherwise bring their words back into the queue.
+    await flushReviews(ctx);
+    const today = localDate();
+    const words = await syncWords(ctx);
+    state.reviewQueue = words
+      .filter((word) => word.next_review <= today)
+      .sort(
+        (a, b) =>
+          a.next_review.localeCompare(b.next_review) || a.stage - b.stage || a.id - b.id
+      )
+      .slice(0, QUEUE_SIZE);
     state.currentReview = null;
     renderReviewCard(ctx);
     setStatus(elements.reviewStatus, "");
@@ -50,16 +181,25 @@ export async function loadReviewQueue(ctx) {
 
 export async function submitReview(ctx, result) {
   const { state, elements } = ctx;
-  if (!state.currentReview) return;
+  if (!state.currentReview) return false;
+  usePendingOwner(state);
+  state.pendingReviews.push({
+    word_id: state.currentReview.id,
+    result,
+    reviewed_at: new Date().toISOString(),
+    idempotency_key: newIdempotencyKey(),
+  });
+  savePending(state);
+  state.currentReview = null;
+  renderReviewCard(ctx);
+  if (state.reviewQueue.length && state.pendingReviews.length < FLUSH_SIZE) {
+    return false;
+  }
   try {
-    await apiRequest(`/api/review/${state.currentReview.id}`, {
-      method: "POST",
-      body: JSON.stringify({ result }),
-    });
-    state.currentReview = null;
-    renderReviewCard(ctx);
+    return await flushReviews(ctx);
   } catch (err) {
     setStatus(elements.reviewStatus, err.message || "Review failed");
+    return false;
   }
 }
 
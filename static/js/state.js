@@ -3,7 +3,13 @@ export function createState() {
     words: [],
     reviewQueue: [],
     currentReview: null,
+    pendingReviews: [],
+    pendingOwner: null,
+    flushingReviews: null,
+    reviewBufferReady: false,
     editingId: null,
+    replica: null,
+    syncing: null,
   };
 }
 
@@ -14,6 +14,8 @@ export async function loadStats({ elements }) {
     elements.statReviews7d.textContent = data.reviews_7d;
     elements.statReviews30d.textContent = data.reviews_30d;
     elements.statReviews365d.textContent = data.reviews_365d;
+    elements.statStreak.textContent = `${data.current_streak} (${data.longest_streak})`;
+    elements.statLearned.textContent = data.words_learned;
   } catch (err) {
     setStatus(elements.reviewStatus, err.message || "Stats failed");
   }
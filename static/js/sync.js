@@ -0,0 +1,110 @@
+import { apiRequest } from "./api.js";
+
+const DATABASE = "vocabulary";
+const STORE = "replicas";
+// Where earlier versions kept the replica; a large deck outgrew its quota.
+const LEGACY_KEY = "vocabulary.replica";
+
+export function currentOwner() {
+  const token = window.localStorage.getItem("vocabulary.token") || "";
+  try {
+    const payload = token.split(".")[1].replace(/-/g, "+").replace(/_/g, "/");
+    return JSON.parse(window.atob(payload)).sub || null;
+  } catch {
+    return null;
+  }
+}
+
+let database = null;
+
+// Resolves to null where IndexedDB is missing or refuses to open; the
+// replica then lives in memory and each page load starts a full sync.
+function openDatabase() {
+  if (!database) {
+    database = new Promise((resolve) => {
+      try {
+        window.localStorage.removeItem(LEGACY_KEY);
+        const request = window.indexedDB.open(DATABASE, 1);
+        request.onupgradeneeded = () => {
+          request.result.createObjectStore(STORE, { keyPath: "owner" });
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => resolve(null);
+      } catch {
+        resolve(null);
+      }
+    });
+  }
+  return database;
+}
+
+function done(transaction, request) {
+  return new Promise((resolve, reject) => {
+    transaction.oncomplete = () => resolve(request && request.result);
+    transaction.onerror = () => reject(transaction.error);
+    transaction.onabort = () => reject(transaction.error);
+  });
+}
+
+async function loadReplica(owner) {
+  const empty = { owner, token: null, words: {} };
+  const db = await openDatabase();
+  if (!db || !owner) return empty;
+  try {
+    const transaction = db.transaction(STORE, "readonly");
+    const stored = await done(transaction, transaction.objectStore(STORE).get(owner));
+    return stored || empty;
+  } catch {
+    // Unreadable copy: start over with a full sync.
+    return empty;
+  }
+}
+
+async function saveReplica(replica) {
+  const db = await openDatabase();
+  if (!db || !replica.owner) return;
+  try {
+    // One account's copy at a time; the put replaces it whole.
+    const transaction = db.transaction(STORE, "readwrite");
+    const store = transaction.objectStore(STORE);
+    store.clear();
+    store.put(replica);
+    await done(transaction);
+  } catch {
+    // Over quota: the write aborts and the last stored copy stays, which
+    // the next page load brings up to date; this page keeps its copy in memory.
+  }
+}
+
+async function pull(state) {
+  const owner = currentOwner();
+  if (!state.replica || state.replica.owner !== owner) {
+    state.replica = await loadReplica(owner);
+  }
+  const replica = state.replica;
+  let more = true;
+  while (more) {
+    const params = new URLSearchParams();
+    if (replica.token) params.append("since", replica.token);
+    const data = await apiRequest(`/api/sync?${params}`);
+    data.words.forEach((word) => {
+      replica.words[word.id] = word;
+    });
+    data.deleted_words.forEach((id) => {
+      delete replica.words[id];
+    });
+    replica.token = data.token;
+    more = data.more;
+  }
+  await saveReplica(replica);
+  return Object.values(replica.words);
+}
+
+// Brings the local copy of the user's words up to date with GET /api/sync,
+// which sends only what changed since the last pull, and returns all words.
+// Pulls run one after another so two of them never apply the same page.
+export function syncWords({ state }) {
+  const previous = state.syncing || Promise.resolve();
+  state.syncing = previous.catch(() => {}).then(() => pull(state));
+  return state.syncing;
+}
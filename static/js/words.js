@@ -1,7 +1,10 @@
 import { apiRequest } from "./api.js";
 import { confirmAction } from "./modal.js";
+import { syncWords } from "./sync.js";
 import { formatDate, setStatus } from "./utils.js";
 
+const PAGE_SIZE = 50;
+
 export function resetForm({ state, elements }) {
   elements.form.reset();
   state.editingId = null;
@@ -106,10 +109,14 @@ export async function loadWords(ctx) {
   if (q) params.append("q", q);
   if (tag) params.append("tag", tag);
   const query = params.toString();
-  const path = query ? `/api/words?${query}` : "/api/words";
   setStatus(elements.searchStatus, "Loading...");
   try {
-    const data = await apiRequest(path);
+    // Unfiltered lists come from the synced replica; searches go to the server.
+    const data = query
+      ? await apiRequest(`/api/words?${query}`)
+      : (await syncWords(ctx))
+          .sort((a, b) => b.created_at.localeCompare(a.created_at) || b.id - a.id)
+          .slice(0, PAGE_SIZE);
     state.words = data;
     renderWords(ctx, data);
     setStatus(elements.searchStatus, data.length ? "" : "No matches found.");
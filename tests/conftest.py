@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import itertools
+import os
+import tempfile
+from pathlib import Path
+
+# app.db builds its engines from the URL on import; point it at a
+# throwaway database before anything imports the app.
+os.environ["VOCABULARY_DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'test.db'}"
+os.environ.setdefault("VOCABULARY_OUTBOX_WORKER", "0")
+os.environ.setdefault("VOCABULARY_EMAIL_TRANSPORT", "memory")
+os.environ.setdefault("VOCABULARY_JWT_SECRET", "test-secret-" + "x" * 32)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.db import engine
+from app.models import User
+from app.services.auth import create_access_token
+from main import app
+
+_emails = (f"user{n}@example.com" for n in itertools.count())
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def user(client) -> User:
+    with Session(engine) as session:
+        user = User(email=next(_emails), password_hash="x", is_verified=True)
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return user
+
+
+@pytest.fixture
+def headers(user) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(user.email)}"}
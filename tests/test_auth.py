@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.models import EmailOutbox, Review, User, Word
+from app.routes.api import claim_legacy_data
+from app.services.auth import create_access_token, hash_password, user_cache
+from app.services.email import MemoryTransport
+from app.services.outbox import deliver_batch
+from app.services.writer import write_queue
+
+
+def add_user(email: str, password_hash: str, is_verified: bool = True) -> None:
+    with Session(engine) as session:
+        session.add(User(email=email, password_hash=password_hash, is_verified=is_verified))
+        session.commit()
+
+
+def delivered_code(email: str) -> str:
+    transport = MemoryTransport()
+    deliver_batch(engine, transport)
+    # The newest code is the one /auth/verify accepts.
+    message = [message for message in transport.sent if message["To"] == email][-1]
+    return re.search(r"\d{6}", message.get_content()).group()
+
+
+def test_register_verify_and_login_through_the_outbox(client):
+    account = {"email": "Outbox@Example.com", "password": "secret-1"}
+    assert client.post("/api/auth/register", json=account).status_code == 200
+    with Session(engine) as session:
+        queued = session.exec(
+            select(EmailOutbox).where(EmailOutbox.to_email == "outbox@example.com")
+        ).one()
+    assert queued.sent_at is None
+    assert client.post("/api/auth/login", json=account).status_code == 403
+
+    code = delivered_code("outbox@example.com")
+    with Session(engine) as session:
+        assert session.get(EmailOutbox, queued.id).sent_at is not None
+    wrong = {"email": account["email"], "code": "x" + code[1:]}
+    assert client.post("/api/auth/verify", json=wrong).status_code == 400
+    verify = {"email": account["email"], "code": code}
+    assert client.post("/api/auth/verify", json=verify).status_code == 200
+
+    assert client.post("/api/auth/login", json={**account, "password": "wrong!"}).status_code == 401
+    response = client.post("/api/auth/login", json=account)
+    assert response.status_code == 200
+    token = response.json()["access_token"]
+    me = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.json()["email"] == "outbox@example.com"
+    assert client.post("/api/auth/register", json=account).status_code == 409
+
+
+def test_verification_drops_the_cached_user(client):
+    email = "cached@example.com"
+    assert client.post("/api/auth/register", json={"email": email, "password": "secret-1"}).status_code == 200
+    headers = {"Authorization": f"Bearer {create_access_token(email)}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 403
+    assert user_cache.get(email).is_verified is False
+    # Registering again replaces the password of the unverified account.
+    assert client.post("/api/auth/register", json={"email": email, "password": "secret-2"}).status_code == 200
+    assert user_cache.get(email) is None
+    assert client.get("/api/auth/me", headers=headers).status_code == 403
+
+    code = delivered_code(email)
+    assert client.post("/api/auth/verify", json={"email": email, "code": code}).status_code == 200
+    assert user_cache.get(email) is None
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+
+def test_login_replaces_a_legacy_pbkdf2_hash(client):
+    salt = b"0123456789abcdef"
+    digest = hashlib.pbkdf2_hmac("sha256", b"secret-1", salt, 1000)
+    legacy = "pbkdf2_sha256$1000${}${}".format(
+        base64.b64encode(salt).decode(), base64.b64encode(digest).decode()
+    )
+    add_user("legacy@example.com", legacy)
+    account = {"email": "legacy@example.com", "password": "secret-1"}
+    assert client.post("/api/auth/login", json={**account, "password": "wrong!"}).status_code == 401
+    assert client.post("/api/auth/login", json=account).status_code == 200
+    with Session(engine) as session:
+        stored = session.exec(select(User.password_hash).where(User.email == account["email"])).one()
+    assert stored.startswith("$2b$")
+    assert client.post("/api/auth/login", json=account).status_code == 200
+
+
+def test_login_waits_for_the_write_lock_off_the_event_loop(client, headers):
+    account = {"email": "locked@example.com", "password": "secret-1"}
+    add_user(account["email"], hash_password(account["password"]))
+    lock = sqlite3.connect(engine.url.database, isolation_level=None)
+    lock.execute("BEGIN IMMEDIATE")
+    try:
+        with ThreadPoolExecutor(1) as pool:
+            login = pool.submit(client.post, "/api/auth/login", json=account)
+            time.sleep(0.5)
+            assert not login.done()
+            # Other requests keep being served while login waits on SQLite.
+            start = time.perf_counter()
+            assert client.get("/api/leaderboard", headers=headers).status_code == 200
+            assert time.perf_counter() - start < 0.5
+            lock.execute("ROLLBACK")
+            assert login.result(timeout=10).status_code == 200
+    finally:
+        lock.close()
+
+
+def test_claimed_legacy_words_get_their_tags_rollups_and_counters(user):
+    with Session(engine) as session:
+        word = Word(term="legacy", translation="old", tags="Verbs, old", stage=2)
+        session.add(word)
+        session.flush()
+        session.add(
+            Review(
+                word_id=word.id,
+                reviewed_at=datetime(2024, 3, 1, 9, 30),
+                result=True,
+                next_review_assigned=date(2024, 3, 4),
+            )
+        )
+        session.commit()
+        word_id = word.id
+
+    write_queue(engine).run(lambda session: claim_legacy_data(session, user.id))
+
+    with engine.connect() as conn:
+        def rows(sql):
+            return conn.execute(text(sql), {"uid": user.id, "wid": word_id}).all()
+
+        assert rows(
+            "SELECT tag.name FROM wordtag JOIN tag ON tag.id = wordtag.tag_id "
+            "WHERE wordtag.word_id = :wid ORDER BY tag.name"
+        ) == [("old",), ("verbs",)]
+        assert rows("SELECT stage, words FROM stagecount WHERE user_id = :uid AND words") == [(2, 1)]
+        assert rows("SELECT current_streak, last_active_day FROM streak WHERE user_id = :uid") == [
+            (1, "2024-03-01")
+        ]
+        assert rows("SELECT day, reviews FROM activityday WHERE user_id = :uid AND reviews") == [
+            ("2024-03-01", 1)
+        ]
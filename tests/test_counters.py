@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.db import engine
+from app.models import Streak, User
+from app.services.progress import repair_counters
+
+
+def new_user(email: str) -> int:
+    with Session(engine) as session:
+        user = User(email=email, password_hash="x", is_verified=True)
+        session.add(user)
+        session.commit()
+        return user.id
+
+
+def shuffle_words(rng: random.Random, user_ids: list[int], rounds: int = 200) -> None:
+    """Random inserts, moves between users, reschedules, stage changes and deletes."""
+    today = date(2026, 3, 1)
+    owned = text(f"SELECT id FROM word WHERE user_id IN ({', '.join(map(str, user_ids))})")
+    with engine.begin() as conn:
+        for n in range(rounds):
+            ids = [row[0] for row in conn.execute(owned)]
+            action = rng.choice(["insert", "insert", "reschedule", "stage", "move", "delete"])
+            if action == "insert" or not ids:
+                conn.execute(
+                    text(
+                        "INSERT INTO word(user_id, term, translation, created_at, stage, next_review) "
+                        "VALUES (:uid, :term, 'x', '2026-01-01 00:00:00', :stage, :due)"
+                    ),
+                    {
+                        "uid": rng.choice(user_ids),
+                        "term": f"counter-{n}",
+                        "stage": rng.randint(0, 4),
+                        "due": today + timedelta(days=rng.randint(-3, 10)),
+                    },
+                )
+            elif action == "reschedule":
+                conn.execute(
+                    text("UPDATE word SET next_review = :due, stage = :stage WHERE id = :id"),
+                    {
+                        "id": rng.choice(ids),
+                        "due": today + timedelta(days=rng.randint(-3, 10)),
+                        "stage": rng.randint(0, 4),
+                    },
+                )
+            elif action == "stage":
+                conn.execute(
+                    text("UPDATE word SET stage = :stage WHERE id = :id"),
+                    {"id": rng.choice(ids), "stage": rng.randint(0, 4)},
+                )
+            elif action == "move":
+                conn.execute(
+                    text("UPDATE word SET user_id = :uid WHERE id = :id"),
+                    {"id": rng.choice(ids), "uid": rng.choice(user_ids)},
+                )
+            else:
+                conn.execute(text("DELETE FROM word WHERE id = :id"), {"id": rng.choice(ids)})
+
+
+def rows(sql: str, user_ids: list[int]) -> set[tuple]:
+    scope = ", ".join(map(str, user_ids))
+    with engine.connect() as conn:
+        return {tuple(row) for row in conn.execute(text(sql.format(scope=scope)))}
+
+
+def test_dueday_matches_a_recount(client):
+    rng = random.Random(18)
+    user_ids = [new_user(f"dueday{n}@example.com") for n in range(3)]
+    shuffle_words(rng, user_ids)
+    counted = rows(
+        "SELECT user_id, day, words FROM dueday "
+        "WHERE user_id IN ({scope}) AND words > 0",
+        user_ids,
+    )
+    recounted = rows(
+        "SELECT user_id, next_review, count(*) FROM word "
+        "WHERE user_id IN ({scope}) GROUP BY user_id, next_review",
+        user_ids,
+    )
+    assert counted == recounted
+
+
+def add_review(conn, user_id: int, word_id: int, moment: datetime) -> None:
+    conn.execute(
+        text(
+            "INSERT INTO review(word_id, user_id, reviewed_at, result, next_review_assigned) "
+            "VALUES (:wid, :uid, :at, 1, :due)"
+        ),
+        {"wid": word_id, "uid": user_id, "at": moment, "due": moment.date()},
+    )
+
+
+def test_stagecount_and_streak_match_a_recount(client):
+    rng = random.Random(24)
+    user_ids = [new_user(f"streak{n}@example.com") for n in range(3)]
+    shuffle_words(rng, user_ids)
+    counted = rows(
+        "SELECT user_id, stage, words FROM stagecount "
+        "WHERE user_id IN ({scope}) AND words > 0",
+        user_ids,
+    )
+    recounted = rows(
+        "SELECT user_id, stage, count(*) FROM word "
+        "WHERE user_id IN ({scope}) GROUP BY user_id, stage",
+        user_ids,
+    )
+    assert counted == recounted
+
+    # Reviews arrive in time order, with repeats on a day and gaps between runs.
+    start = datetime(2026, 2, 1, 8, 0)
+    with engine.begin() as conn:
+        for user_id in user_ids:
+            word_id = conn.execute(
+                text("SELECT id FROM word WHERE user_id = :uid LIMIT 1"), {"uid": user_id}
+            ).scalar()
+            day = 0
+            for _ in range(30):
+                day += rng.choice([0, 1, 1, 1, 2, 5])
+                moment = start + timedelta(days=day, minutes=rng.randint(0, 600))
+                add_review(conn, user_id, word_id, moment)
+    with Session(engine) as session:
+        before = rows("SELECT * FROM streak WHERE user_id IN ({scope})", user_ids)
+        assert len(before) == len(user_ids)
+        assert sum(repair_counters(session, user_id) for user_id in user_ids) == 0
+        session.commit()
+    assert rows("SELECT * FROM streak WHERE user_id IN ({scope})", user_ids) == before
+
+
+def test_a_backdated_review_leaves_the_streak_alone(client):
+    user_id = new_user("backdated@example.com")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO word(user_id, term, translation, created_at, stage, next_review) "
+                "VALUES (:uid, 'late', 'x', '2026-01-01 00:00:00', 0, '2026-01-01')"
+            ),
+            {"uid": user_id},
+        )
+        word_id = conn.execute(
+            text("SELECT id FROM word WHERE user_id = :uid"), {"uid": user_id}
+        ).scalar()
+        for moment in (datetime(2026, 2, 1, 9), datetime(2026, 2, 3, 9)):
+            add_review(conn, user_id, word_id, moment)
+        # Fills the gap, but arrives after the later day.
+        add_review(conn, user_id, word_id, datetime(2026, 2, 2, 9))
+        streak = conn.execute(
+            text(
+                "SELECT current_streak, longest_streak, last_active_day FROM streak "
+                "WHERE user_id = :uid"
+            ),
+            {"uid": user_id},
+        ).one()
+    assert tuple(streak) == (1, 1, "2026-02-03")
+    with Session(engine) as session:
+        # The rebuild counts the run the backdated review completed.
+        assert repair_counters(session, user_id) == 1
+        session.commit()
+        repaired = session.get(Streak, user_id)
+        assert (repaired.current_streak, repaired.longest_streak) == (3, 3)
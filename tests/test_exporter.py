@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+
+from sqlmodel import Session
+
+from app.db import engine
+from app.models import User
+from app.services.exporter import (
+    EXPORT_COLUMNS,
+    csv_chunks,
+    export_statement,
+    gzip_chunks,
+    ndjson_chunks,
+    stream_rows,
+)
+from app.services.importer import import_csv
+
+DECK = (
+    "term,translation,example,tags,stage,next_review,created_at\n"
+    'Привет,hello,"Привет, мир",greet,2,2024-05-03,2024-05-01T08:00:00\n'
+    'quote,"say ""hi"", twice",,"a,b",0,2024-05-02,2024-05-02T09:30:00\n'
+    "plain,simple,,,5,2024-06-01,2024-05-03T10:15:00\n"
+)
+
+
+def export(client, headers, **params) -> bytes:
+    response = client.get("/api/words/export", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.content
+
+
+def csv_records(body: bytes) -> list[dict]:
+    return list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+
+
+def test_csv_export_imports_back_unchanged(client, user, headers):
+    import_csv(engine, user.id, io.BytesIO(DECK.encode()))
+    exported = export(client, headers)
+    records = csv_records(exported)
+    assert [record["term"] for record in records] == ["plain", "quote", "Привет"]
+    assert records[1]["translation"] == 'say "hi", twice'
+    assert records[1]["tags"] == "a,b"
+
+    with Session(engine) as session:
+        other = User(email="roundtrip@example.com", password_hash="x", is_verified=True)
+        session.add(other)
+        session.commit()
+        other_id = other.id
+    import_csv(engine, other_id, io.BytesIO(exported))
+    again = b"".join(csv_chunks(stream_rows(engine, export_statement(other_id))))
+    assert again == exported
+
+
+def test_ndjson_and_gzip_carry_the_same_rows(client, user, headers):
+    import_csv(engine, user.id, io.BytesIO(DECK.encode()))
+    records = csv_records(export(client, headers))
+    lines = export(client, headers, format="ndjson").decode("utf-8").splitlines()
+    parsed = [json.loads(line) for line in lines]
+    assert list(parsed[0]) == EXPORT_COLUMNS
+    as_text = [
+        {key: "" if value is None else str(value) for key, value in record.items()}
+        for record in parsed
+    ]
+    assert as_text == records
+
+    for fmt in ("csv", "ndjson"):
+        plain = export(client, headers, format=fmt)
+        assert gzip.decompress(export(client, headers, format=fmt, gzip="true")) == plain
+
+
+def test_chunked_streams_match_a_single_chunk(user):
+    import_csv(engine, user.id, io.BytesIO(DECK.encode()))
+    statement = export_statement(user.id)
+    for encode in (csv_chunks, ndjson_chunks):
+        whole = b"".join(encode(stream_rows(engine, statement, chunk_size=1000)))
+        pieces = list(encode(stream_rows(engine, statement, chunk_size=1)))
+        assert len(pieces) >= 3
+        assert b"".join(pieces) == whole
+        assert gzip.decompress(b"".join(gzip_chunks(iter(pieces)))) == whole
+    empty = b"".join(csv_chunks(stream_rows(engine, export_statement(-1))))
+    assert empty.decode().strip() == ",".join(EXPORT_COLUMNS)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import math
+from datetime import date, timedelta
+
+import numpy as np
+from sqlmodel import Session
+
+from app.db import engine
+from app.models import Word
+from app.services.forecast import Z_95, due_curves, forecast_reviews, pass_rate
+from app.services.scheduler import MAX_STAGE, FixedScheduler, save_scheduler_settings
+
+
+def brute_force(scheduler, rate: float, stage: int, due: int, days: int) -> list[dict[int, float]]:
+    """
+    For one card, walk every sequence of right/wrong answers and return,
+    per day, the probability of each number of reviews that day.
+    """
+    outcomes: list[dict[int, float]] = [{} for _ in range(days)]
+
+    def walk(stage: int, day: int, probability: float, reviews: tuple[int, ...]) -> None:
+        if day >= days:
+            for offset in range(days):
+                count = reviews.count(offset)
+                outcomes[offset][count] = outcomes[offset].get(count, 0.0) + probability
+            return
+        reviews += (day,)
+        promoted = min(stage + 1, MAX_STAGE)
+        walk(promoted, day + scheduler.interval(promoted), probability * rate, reviews)
+        walk(0, day + scheduler.interval(0), probability * (1 - rate), reviews)
+
+    walk(stage, max(due, 0), 1.0, ())
+    return outcomes
+
+
+def moments(outcome: dict[int, float]) -> tuple[float, float]:
+    mean = sum(count * p for count, p in outcome.items())
+    return mean, sum((count - mean) ** 2 * p for count, p in outcome.items())
+
+
+def test_due_curves_match_every_answer_sequence():
+    scheduler = FixedScheduler([2, 3, 5, 8])
+    days = 14
+    curves = due_curves(scheduler, 0.7, days)
+    for stage in range(MAX_STAGE + 1):
+        expected = [moments(outcome)[0] for outcome in brute_force(scheduler, 0.7, stage, 0, days)]
+        np.testing.assert_allclose(curves[stage], expected, atol=1e-12)
+
+
+def test_forecast_matches_a_brute_force_deck(user):
+    today = date(2026, 3, 1)
+    days = 12
+    # (stage, due offset): overdue cards count as due today.
+    deck = [(0, -3), (2, 1), (4, 2), (1, 5), (1, 5), (3, 11), (2, 20)]
+    with Session(engine) as session:
+        save_scheduler_settings(session, user.id, "fixed", [1, 2, 4, 7], 1.0, 2.5)
+        for n, (stage, due) in enumerate(deck):
+            session.add(
+                Word(
+                    user_id=user.id,
+                    term=f"forecast-{n}",
+                    translation="x",
+                    stage=stage,
+                    next_review=today + timedelta(days=due),
+                )
+            )
+        session.commit()
+        rate, _ = pass_rate(session, user.id)
+        result = forecast_reviews(session, user.id, today, days)
+
+    scheduler = FixedScheduler([1, 2, 4, 7])
+    mean = np.zeros(days)
+    variance = np.zeros(days)
+    for stage, due in deck:
+        for offset, outcome in enumerate(brute_force(scheduler, rate, stage, due, days)):
+            card_mean, card_variance = moments(outcome)
+            mean[offset] += card_mean
+            variance[offset] += card_variance
+
+    assert [point["day"] for point in result["forecast"]] == [
+        today + timedelta(days=offset) for offset in range(days)
+    ]
+    for offset, point in enumerate(result["forecast"]):
+        spread = Z_95 * math.sqrt(variance[offset])
+        assert point["expected"] == round(mean[offset], 1)
+        assert point["low"] == round(max(mean[offset] - spread, 0.0), 1)
+        assert point["high"] == round(mean[offset] + spread, 1)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import csv
+import io
+
+import pytest
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.models import Tag, Word, WordTag
+from app.services.importer import CsvImportError, import_csv
+
+
+def deck(rows: int, start: int = 0) -> bytes:
+    lines = ["term,translation"] + [f"imp{n},t{n}" for n in range(start, start + rows)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def word_count(user_id: int) -> int:
+    with Session(engine) as session:
+        return session.exec(
+            select(func.count()).select_from(Word).where(Word.user_id == user_id)
+        ).one()
+
+
+def test_error_in_a_later_chunk_reports_the_committed_rows(user):
+    # Well over the decoder's 8 KiB read-ahead of valid rows first, so the
+    # bad byte is reached only after the first chunks were written.
+    payload = deck(3_000) + b"bad\xff,row\n"
+    with pytest.raises(CsvImportError) as raised:
+        import_csv(engine, user.id, io.BytesIO(payload), chunk_size=100)
+    assert raised.value.progress.imported > 0
+    assert raised.value.progress.imported == word_count(user.id)
+
+
+def test_route_returns_the_partial_counts(client, user, headers):
+    payload = deck(1_500) + b"bad\xff,row\n"
+    response = client.post(
+        "/api/words/import",
+        files={"file": ("deck.csv", payload, "text/csv")},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    body = response.json()
+    assert body["imported"] == word_count(user.id) > 0
+    assert "UTF-8" in body["detail"]
+
+
+def test_malformed_row_is_a_400_not_a_500(client, user, headers):
+    field = "x" * (csv.field_size_limit() + 1)
+    payload = deck(3) + f"long,{field}\n".encode()
+    response = client.post(
+        "/api/words/import",
+        files={"file": ("deck.csv", payload, "text/csv")},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Malformed CSV at row 4")
+    # The bad row's chunk is dropped whole; nothing was committed before it.
+    assert response.json()["imported"] == word_count(user.id) == 0
+
+
+def test_non_ascii_terms_are_tagged_and_merged_on_reimport(user):
+    payload = "term,translation,tags\nПривет,hello,greet\n".encode()
+    import_csv(engine, user.id, io.BytesIO(payload))
+    again = "term,translation,tags\nПривет,hi,daily\n".encode()
+    import_csv(engine, user.id, io.BytesIO(again))
+
+    with Session(engine) as session:
+        (word,) = session.exec(select(Word).where(Word.user_id == user.id)).all()
+        tags = session.exec(
+            select(Tag.name)
+            .join(WordTag, WordTag.tag_id == Tag.id)
+            .where(WordTag.word_id == word.id)
+            .order_by(Tag.name)
+        ).all()
+    assert (word.term, word.translation, word.tags) == ("Привет", "hello, hi", "greet,daily")
+    assert tags == ["daily", "greet"]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import random
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.db import apply_schema_migrations, engine
+from app.models import User
+from app.services.auth import create_access_token
+from app.services.leaderboard import ranking_cache
+
+
+def learner(learned: int, email: str) -> dict[str, str]:
+    with Session(engine) as session:
+        user = User(email=email, password_hash="x", is_verified=True)
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        user_id = user.id
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO word(user_id, term, translation, created_at, stage, next_review) "
+                "VALUES (:uid, :term, 'x', '2026-01-01 00:00:00', 4, '2026-02-01')"
+            ),
+            [{"uid": user_id, "term": f"{email}-{n}"} for n in range(learned)],
+        )
+    return {"Authorization": f"Bearer {create_access_token(email)}"}
+
+
+def expected_rank(score: int) -> int:
+    with engine.connect() as conn:
+        ahead = conn.execute(
+            text(
+                "SELECT count(*) FROM (SELECT user_id FROM word WHERE stage = 4 "
+                "GROUP BY user_id HAVING count(*) > :score)"
+            ),
+            {"score": score},
+        ).scalar()
+    return ahead + 1
+
+
+def test_leaderboard_ranks_ties_and_caller(client):
+    for n, learned in enumerate([7, 12, 7]):
+        learner(learned, f"board{n}@example.com")
+    caller = learner(3, "board-caller@example.com")
+    ranking_cache.clear()
+    board = client.get("/api/leaderboard", params={"limit": 100}, headers=caller).json()
+    entries = board["entries"]
+    assert [e["learned"] for e in entries] == sorted(
+        (e["learned"] for e in entries), reverse=True
+    )
+    for entry in entries:
+        assert entry["rank"] == expected_rank(entry["learned"])
+    sevens = [e for e in entries if e["learned"] == 7]
+    assert len(sevens) >= 2 and len({e["rank"] for e in sevens}) == 1
+    mine = [e for e in entries if e["you"]]
+    assert [e["learned"] for e in mine] == [3]
+    assert board["your_learned"] == 3
+    assert board["your_rank"] == expected_rank(3) == mine[0]["rank"]
+
+    for limit in (0, 101):
+        response = client.get("/api/leaderboard", params={"limit": limit}, headers=caller)
+        assert response.status_code == 400
+
+
+def test_your_rank_is_live(client, headers):
+    word = client.post(
+        "/api/words", json={"term": "live-rank", "translation": "x"}, headers=headers
+    ).json()
+    for _ in range(4):
+        client.post(f"/api/review/{word['id']}", json={"result": "good"}, headers=headers)
+    board = client.get("/api/leaderboard", headers=headers).json()
+    assert board["your_learned"] == 1
+    assert board["your_rank"] == expected_rank(1)
+    client.post(f"/api/review/{word['id']}", json={"result": "bad"}, headers=headers)
+    board = client.get("/api/leaderboard", headers=headers).json()
+    assert board["your_learned"] == 0
+    assert board["your_rank"] == expected_rank(0)
+
+
+def score_rows() -> dict[int, tuple[int, int]]:
+    with engine.connect() as conn:
+        return {
+            score: (users, ahead)
+            for score, users, ahead in conn.execute(
+                text("SELECT score, users, ahead FROM scorecount")
+            )
+        }
+
+
+def test_score_histogram_follows_stage_moves(client):
+    rng = random.Random(5)
+    learner(4, "histogram@example.com")
+    with engine.begin() as conn:
+        ids = [row[0] for row in conn.execute(text("SELECT id FROM word"))]
+        for word_id in rng.sample(ids, min(len(ids), 40)):
+            conn.execute(
+                text("UPDATE word SET stage = :stage WHERE id = :id"),
+                {"stage": rng.randint(0, 4), "id": word_id},
+            )
+        conn.execute(text("DELETE FROM word WHERE id = :id"), {"id": rng.choice(ids)})
+        rebuilt = dict(
+            conn.execute(
+                text(
+                    "SELECT learned, count(*) FROM (SELECT count(*) AS learned FROM word "
+                    "WHERE stage = 4 AND user_id IS NOT NULL GROUP BY user_id) "
+                    "GROUP BY learned"
+                )
+            ).all()
+        )
+    histogram = score_rows()
+    assert histogram == {
+        score: (users, sum(n for higher, n in rebuilt.items() if higher > score))
+        for score, users in rebuilt.items()
+    }
+    # The migration's rebuild agrees with what the triggers kept.
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA user_version = 13")
+    apply_schema_migrations()
+    assert score_rows() == histogram
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.models import EmailOutbox
+from app.services.email import MemoryTransport
+from app.services.outbox import backoff, deliver_batch, drain, enqueue_verification_email
+from app.settings import OUTBOX_MAX_ATTEMPTS
+
+
+class FailingTransport(MemoryTransport):
+    def send(self, message) -> None:
+        raise OSError("connection refused")
+
+
+def queue(to_email: str) -> int:
+    # Start from an empty queue so only this test's message is due.
+    drain(engine, MemoryTransport())
+    with Session(engine) as session:
+        enqueue_verification_email(session, to_email, "123456")
+        session.commit()
+        return session.exec(select(EmailOutbox.id).where(EmailOutbox.to_email == to_email)).one()
+
+
+def message(row_id: int) -> EmailOutbox:
+    with Session(engine) as session:
+        return session.get(EmailOutbox, row_id)
+
+
+def test_delivery_marks_the_message_sent(client):
+    row_id = queue("sent@example.com")
+    transport = MemoryTransport()
+    assert drain(engine, transport) == 1
+    assert [sent["To"] for sent in transport.sent] == ["sent@example.com"]
+    assert "123456" in transport.sent[0].get_content()
+    sent = message(row_id)
+    assert sent.sent_at is not None and sent.attempts == 1
+    assert sent.locked_until is None and sent.last_error is None
+    assert deliver_batch(engine, MemoryTransport()) == 0
+
+
+def test_a_leased_message_is_not_claimed_twice(client):
+    row_id = queue("leased@example.com")
+    claimed_meanwhile = []
+
+    class Racing(MemoryTransport):
+        def send(self, message) -> None:
+            # A second worker polling mid-send finds the row leased.
+            claimed_meanwhile.append(deliver_batch(engine, MemoryTransport()))
+            super().send(message)
+
+    assert deliver_batch(engine, Racing()) == 1
+    assert claimed_meanwhile == [0]
+    assert message(row_id).sent_at is not None
+
+
+def test_an_expired_lease_is_claimed_again(client):
+    row_id = queue("expired@example.com")
+    with Session(engine) as session:
+        stuck = session.get(EmailOutbox, row_id)
+        stuck.locked_until = datetime.now() + timedelta(minutes=1)
+        session.add(stuck)
+        session.commit()
+    assert deliver_batch(engine, MemoryTransport()) == 0
+
+    with Session(engine) as session:
+        stuck = session.get(EmailOutbox, row_id)
+        stuck.locked_until = datetime.now() - timedelta(seconds=1)
+        session.add(stuck)
+        session.commit()
+    assert deliver_batch(engine, MemoryTransport()) == 1
+    assert message(row_id).sent_at is not None
+
+
+def test_failures_back_off_then_give_up(client):
+    row_id = queue("failing@example.com")
+    for attempt in range(1, OUTBOX_MAX_ATTEMPTS + 1):
+        before = datetime.now()
+        assert deliver_batch(engine, FailingTransport()) == 1
+        failed = message(row_id)
+        assert failed.attempts == attempt
+        assert failed.last_error == "connection refused"
+        assert failed.locked_until is None and failed.sent_at is None
+        if attempt < OUTBOX_MAX_ATTEMPTS:
+            assert failed.failed_at is None
+            assert before + backoff(attempt) <= failed.next_attempt_at
+            assert failed.next_attempt_at <= datetime.now() + backoff(attempt)
+            # Not due again until the backoff has passed.
+            assert deliver_batch(engine, FailingTransport()) == 0
+            with Session(engine) as session:
+                due = session.get(EmailOutbox, row_id)
+                due.next_attempt_at = datetime.now() - timedelta(seconds=1)
+                session.add(due)
+                session.commit()
+    assert message(row_id).failed_at is not None
+    assert deliver_batch(engine, MemoryTransport()) == 0
+    assert [backoff(n).total_seconds() for n in (1, 2, 3)] == [30, 60, 120]
+    assert backoff(20).total_seconds() == 3600
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+
+TERMS = ["Дом", "дом2", "Привет", "привет2", "Ёж", "apple", "Banana", "cherry", "Ärger", "zebra"]
+
+
+@pytest.mark.parametrize("sort", ["term", "created", "stage", "next_review"])
+def test_cursor_pages_cover_the_list_with_non_ascii_terms(client, user, headers, sort):
+    for term in TERMS:
+        client.post("/api/words", json={"term": term, "translation": "x"}, headers=headers)
+    everything = client.get("/api/words", params={"sort": sort}, headers=headers).json()
+    assert len(everything) == len(TERMS)
+
+    paged, cursor = [], None
+    while True:
+        params = {"sort": sort, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/words", params=params, headers=headers)
+        assert response.status_code == 200
+        paged += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert [w["id"] for w in paged] == [w["id"] for w in everything]
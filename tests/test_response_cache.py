@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from sqlalchemy import event, text
+
+from app.db import async_engine, engine
+from app.models import Word
+from app.services.response_cache import (
+    Generations,
+    MemoryBackend,
+    ResponseCache,
+    cache_generations,
+)
+from app.services.writer import write_queue
+
+
+def add_word(user_id: int, term: str) -> None:
+    # Straight to the database, the way another worker's write would land.
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO word(user_id, term, translation, created_at, stage, next_review) "
+                "VALUES (:uid, :term, 'x', '2026-01-01 00:00:00', 0, '2026-01-01')"
+            ),
+            {"uid": user_id, "term": term},
+        )
+
+
+def isolated_cache() -> tuple[ResponseCache, Generations]:
+    # Polls too rarely to matter, so only the writer hook and explicit
+    # catch-ups move the generation.
+    generations = Generations(poll_seconds=3600)
+    generations.start(engine)
+    return ResponseCache(MemoryBackend(16, 300), generations), generations
+
+
+def test_a_queued_write_retires_bodies_before_its_caller_resumes(user):
+    cache, generations = isolated_cache()
+    try:
+        key = cache.key(user.id, "words")
+        cache.store(key, b"[]", None)
+        assert cache.key(user.id, "words") == key
+        write_queue(engine).run(
+            lambda session: session.add(Word(user_id=user.id, term="queued", translation="x"))
+        )
+        fresh = cache.key(user.id, "words")
+        assert fresh != key
+        assert cache.lookup(fresh, None) is None
+    finally:
+        generations.stop()
+
+
+def test_another_processes_write_is_folded_in_from_the_changelog(user):
+    cache, generations = isolated_cache()
+    try:
+        key = cache.key(user.id, "words")
+        add_word(user.id, "from-another-worker")
+        # Not seen until the next poll: lookups never read the database.
+        assert cache.key(user.id, "words") == key
+        with engine.connect() as conn:
+            generations.catch_up(conn)
+        assert cache.key(user.id, "words") != key
+    finally:
+        generations.stop()
+
+
+def test_route_sees_a_write_it_did_not_serve(client, user, headers):
+    assert client.get("/api/words", headers=headers).json() == []
+    add_word(user.id, "elsewhere")
+    deadline = time.monotonic() + 10 * cache_generations.poll_seconds
+    while True:
+        terms = [w["term"] for w in client.get("/api/words", headers=headers).json()]
+        if terms or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert terms == ["elsewhere"]
+
+
+def test_hits_and_304s_do_not_touch_the_database(client, user, headers):
+    routes = ["/api/words", "/api/review/today", "/api/stats", "/api/stats/series?range=7d"]
+    etags = {path: client.get(path, headers=headers).headers["ETag"] for path in routes}
+    statements = []
+
+    def record(*args) -> None:
+        if threading.current_thread().name != "response-cache-sync":
+            statements.append(args[2])
+
+    engines = [engine, async_engine.sync_engine]
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        for path in routes:
+            assert client.get(path, headers=headers).status_code == 200
+            revalidate = {**headers, "If-None-Match": etags[path]}
+            assert client.get(path, headers=revalidate).status_code == 304
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
+    assert statements == []
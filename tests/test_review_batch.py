@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.models import Review, User, Word
+from app.settings import REVIEW_BATCH_LIMIT
+
+
+def add_word(user_id: int, term: str, stage: int = 2) -> int:
+    with Session(engine) as session:
+        word = Word(user_id=user_id, term=term, translation=term, stage=stage)
+        session.add(word)
+        session.commit()
+        return word.id
+
+
+def reviews_of(word_id: int) -> list[tuple[datetime, bool]]:
+    with Session(engine) as session:
+        return [
+            tuple(row)
+            for row in session.exec(
+                select(Review.reviewed_at, Review.result)
+                .where(Review.word_id == word_id)
+                .order_by(Review.id)
+            )
+        ]
+
+
+def stage_of(word_id: int) -> int:
+    with Session(engine) as session:
+        return session.get(Word, word_id).stage
+
+
+def post(client, headers, *answers: dict):
+    return client.post("/api/review/batch", json={"answers": list(answers)}, headers=headers)
+
+
+def test_answers_apply_in_client_time_order(client, user, headers):
+    word_id = add_word(user.id, "ordered")
+    earlier = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+    later = earlier + timedelta(minutes=5)
+    # Sent newest first: applied oldest first, so bad then good.
+    response = post(
+        client,
+        headers,
+        {"word_id": word_id, "result": "good", "reviewed_at": later.isoformat()},
+        {"word_id": word_id, "result": "bad", "reviewed_at": earlier.isoformat()},
+    )
+    assert response.status_code == 200
+    assert response.json()["applied"] == 2
+    assert reviews_of(word_id) == [(earlier, False), (later, True)]
+    assert stage_of(word_id) == 1
+    (word,) = response.json()["words"]
+    assert (word["id"], word["stage"]) == (word_id, 1)
+
+
+def test_answers_at_the_same_time_keep_payload_order(client, user, headers):
+    word_id = add_word(user.id, "tied")
+    moment = (datetime.now() - timedelta(minutes=10)).isoformat()
+    response = post(
+        client,
+        headers,
+        {"word_id": word_id, "result": "good", "reviewed_at": moment},
+        {"word_id": word_id, "result": "bad", "reviewed_at": moment},
+    )
+    assert response.json()["applied"] == 2
+    assert [result for _, result in reviews_of(word_id)] == [True, False]
+    assert stage_of(word_id) == 0
+
+
+def test_future_times_are_clamped_to_now(client, user, headers):
+    word_id = add_word(user.id, "future")
+    before = datetime.now()
+    tomorrow = (before + timedelta(days=1)).isoformat()
+    post(client, headers, {"word_id": word_id, "result": "good", "reviewed_at": tomorrow})
+    ((reviewed_at, _),) = reviews_of(word_id)
+    assert before <= reviewed_at <= datetime.now()
+
+
+def test_missing_and_duplicate_answers_are_reported_per_item(client, user, headers):
+    word_id = add_word(user.id, "mine")
+    with Session(engine) as session:
+        stranger = User(email="stranger@example.com", password_hash="x", is_verified=True)
+        session.add(stranger)
+        session.commit()
+        stranger_id = stranger.id
+    foreign_id = add_word(stranger_id, "theirs")
+
+    answers = [
+        {"word_id": word_id, "result": "good", "idempotency_key": "batch-a"},
+        {"word_id": foreign_id, "result": "good"},
+        {"word_id": 10**9, "result": "bad"},
+        {"word_id": word_id, "result": "good", "idempotency_key": "batch-a"},
+    ]
+    body = post(client, headers, *answers).json()
+    assert body["applied"] == 1
+    assert body["duplicates"] == 1
+    assert body["missing"] == [foreign_id, 10**9]
+    assert len(reviews_of(word_id)) == 1
+    assert reviews_of(foreign_id) == []
+    assert stage_of(foreign_id) == 2
+
+    # A retry of the whole batch applies nothing new.
+    retry = post(client, headers, *answers).json()
+    assert (retry["applied"], retry["duplicates"]) == (0, 2)
+    assert len(reviews_of(word_id)) == 1
+
+
+def test_invalid_batches_are_rejected_whole(client, user, headers):
+    word_id = add_word(user.id, "rejected")
+    good = {"word_id": word_id, "result": "good"}
+    response = post(client, headers, good, {"word_id": word_id, "result": "maybe"})
+    assert response.status_code == 400
+    response = post(client, headers, good, {**good, "idempotency_key": "k" * 65})
+    assert response.status_code == 400
+    response = post(client, headers, *[good] * (REVIEW_BATCH_LIMIT + 1))
+    assert response.status_code == 400
+    assert str(REVIEW_BATCH_LIMIT) in response.json()["detail"]
+    assert reviews_of(word_id) == []
+
+    response = post(client, headers, *[good] * REVIEW_BATCH_LIMIT)
+    assert response.json()["applied"] == REVIEW_BATCH_LIMIT
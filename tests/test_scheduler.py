@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from app.db import apply_schema_migrations, engine
+from app.models import Word
+from app.services.response_cache import cache_generations
+from app.services.scheduler import (
+    FixedScheduler,
+    GeometricScheduler,
+    reschedule,
+    scheduler_for,
+)
+
+
+def test_geometric_scheduler_replaces_sm2(client, headers):
+    settings = {"scheduler": "geometric", "ease": 2.0}
+    response = client.put("/api/settings/scheduler", json=settings, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["stage_intervals"] == [1, 1, 6, 12, 24]
+
+    settings = {"scheduler": "sm2", "ease": 2.0}
+    response = client.put("/api/settings/scheduler", json=settings, headers=headers)
+    assert response.status_code == 400
+
+
+def test_migration_renames_stored_sm2_settings(user):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO schedulersettings(user_id, scheduler, intervals, multiplier, "
+                "ease, updated_at) VALUES (:uid, 'sm2', '3,7,14,30', 1.0, 2.5, '2026-01-01')"
+            ),
+            {"uid": user.id},
+        )
+        conn.exec_driver_sql("PRAGMA user_version = 11")
+    apply_schema_migrations()
+    with engine.connect() as conn:
+        kind = conn.execute(
+            text("SELECT scheduler FROM schedulersettings WHERE user_id = :uid"),
+            {"uid": user.id},
+        ).scalar()
+    assert kind == "geometric"
+
+
+def test_geometric_cards_keep_their_own_ease_and_interval():
+    scheduler = GeometricScheduler(2.5)
+    today = date(2026, 3, 1)
+    word = Word(user_id=1, term="sm2", translation="sm2")
+    seen = []
+    for good in (True, True, True, True, True, False, True, True, True):
+        scheduler.answer(word, good, today)
+        assert word.next_review == today + timedelta(days=word.interval)
+        seen.append((word.stage, word.interval, word.ease))
+    assert seen == [
+        (1, 1, 2.5),
+        (2, 6, 2.5),
+        (3, 15, 2.5),
+        (4, 38, 2.5),
+        # Past the last stage the interval keeps growing.
+        (4, 95, 2.5),
+        (0, 1, 2.18),
+        (1, 1, 2.18),
+        (2, 6, 2.18),
+        (3, 13, 2.18),
+    ]
+    assert [scheduler.interval(stage) for stage in range(5)] == [1, 1, 6, 15, 38]
+
+
+def test_reviews_store_the_card_interval(client, headers):
+    settings = {"scheduler": "geometric", "ease": 2.5}
+    assert client.put("/api/settings/scheduler", json=settings, headers=headers).status_code == 200
+    word_id = client.post(
+        "/api/words", json={"term": "ease", "translation": "ease"}, headers=headers
+    ).json()["id"]
+    for _ in range(3):
+        word = client.post(
+            f"/api/review/{word_id}", json={"result": "good"}, headers=headers
+        ).json()
+    assert (word["stage"], word["interval"], word["ease"]) == (3, 15, 2.5)
+    assert word["next_review"] == (date.today() + timedelta(days=15)).isoformat()
+
+
+def test_reschedule_starts_from_each_card_interval(user):
+    due = date(2026, 3, 20)
+    cards = {
+        "answered": dict(stage=3, interval=20, ease=1.9),
+        "imported": dict(stage=2),
+        "lapsed": dict(stage=0, interval=1, ease=2.18),
+        "new": dict(stage=0),
+    }
+    with Session(engine) as session:
+        for term, fields in cards.items():
+            session.add(
+                Word(user_id=user.id, term=term, translation=term, next_review=due, **fields)
+            )
+        session.commit()
+        old, new = GeometricScheduler(2.5), FixedScheduler([3, 7, 14, 30])
+        assert reschedule(session, user.id, old, old) == 0
+        assert reschedule(session, user.id, old, new) == 3
+        session.commit()
+        moved = {
+            word.term: (word.next_review, word.interval, word.ease)
+            for word in session.exec(select(Word).where(Word.user_id == user.id))
+        }
+    assert moved == {
+        # Answered 20 days before it was due; now due 14 days after that.
+        "answered": (due - timedelta(days=6), 14, None),
+        # No stored interval: the old scheduler's 6 days for stage 2.
+        "imported": (due + timedelta(days=1), 7, None),
+        "lapsed": (due, 1, None),
+        "new": (due, None, None),
+    }
+
+
+def test_a_save_in_another_process_retires_the_cached_scheduler(client, user):
+    with Session(engine) as session:
+        assert scheduler_for(session, user.id).stage_intervals == [1, 3, 7, 14, 30]
+    # Another worker saves new settings, outside this process's write queue.
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO schedulersettings(user_id, scheduler, intervals, multiplier, "
+                "ease, updated_at) VALUES (:uid, 'fixed', '2,4,8,16', 1.0, 2.5, '2026-01-01')"
+            ),
+            {"uid": user.id},
+        )
+    with Session(engine) as session:
+        # Well inside the cache TTL: only the changelog entry retires it.
+        cache_generations.catch_up(session)
+        assert scheduler_for(session, user.id).stage_intervals == [1, 2, 4, 8, 16]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from app.services.search import MARK_CLOSE, MARK_OPEN, mark_up
+
+
+def test_mark_up_escapes_text_around_the_marks():
+    marked = f"<b>{MARK_OPEN}cat{MARK_CLOSE} & dog"
+    assert mark_up(marked) == "&lt;b&gt;<mark>cat</mark> &amp; dog"
+    assert mark_up(None) is None
+
+
+def test_highlights_do_not_echo_markup(client, headers):
+    term = "<script>alert(1)</script>"
+    response = client.post(
+        "/api/words",
+        json={"term": term, "translation": "x & <img src=y onerror=z>"},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    response = client.get(
+        "/api/words", params={"q": "script", "highlight": True}, headers=headers
+    )
+    assert response.status_code == 200
+    (word,) = response.json()
+    assert word["term"] == term
+    highlights = word["highlights"]
+    assert highlights["term"] == (
+        "&lt;<mark>script</mark>&gt;alert(1)&lt;/<mark>script</mark>&gt;"
+    )
+    assert highlights["translation"] == "x &amp; &lt;img src=y onerror=z&gt;"
+    for text in filter(None, highlights.values()):
+        assert "<script" not in text and "<img" not in text
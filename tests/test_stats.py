@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.db import engine
+from app.services.activity import backfill_activity
+from app.services.stats import WINDOWS, compute_stats
+
+
+def baseline_counts(user_id: int, now: datetime) -> dict[str, int]:
+    """The windows the way /api/stats always counted them: rows since now - window."""
+    counts = {}
+    with engine.connect() as conn:
+        for key, days in WINDOWS.items():
+            start = now - timedelta(days=days)
+            for field, table, column in (
+                ("new_words", "word", "created_at"),
+                ("reviews", "review", "reviewed_at"),
+            ):
+                counts[f"{field}_{key}"] = conn.execute(
+                    text(f"SELECT count(*) FROM {table} WHERE user_id = :uid AND {column} >= :start"),
+                    {"uid": user_id, "start": start},
+                ).scalar()
+    return counts
+
+
+def test_windows_start_at_the_exact_minute(user):
+    now = datetime(2026, 10, 17, 14, 37, 20)
+    moments = [now - timedelta(minutes=5)]
+    for days in WINDOWS.values():
+        start = now - timedelta(days=days)
+        # Either side of the start, inside its hour, and the hour boundaries.
+        moments += [
+            start - timedelta(minutes=20),
+            start - timedelta(seconds=1),
+            start,
+            start + timedelta(minutes=10),
+            start.replace(minute=0, second=0) + timedelta(hours=1),
+            start.replace(minute=0, second=0),
+        ]
+    with engine.begin() as conn:
+        for n, moment in enumerate(moments):
+            word_id = conn.execute(
+                text(
+                    "INSERT INTO word(user_id, term, translation, created_at, stage, next_review) "
+                    "VALUES (:uid, :term, 'x', :at, 0, '2026-11-01') RETURNING id"
+                ),
+                {"uid": user.id, "term": f"edge{n}", "at": moment},
+            ).scalar()
+            conn.execute(
+                text(
+                    "INSERT INTO review(word_id, user_id, reviewed_at, result, next_review_assigned) "
+                    "VALUES (:wid, :uid, :at, 1, '2026-11-01')"
+                ),
+                {"wid": word_id, "uid": user.id, "at": moment},
+            )
+    with Session(engine) as session:
+        backfill_activity(session, user.id)
+        session.commit()
+        stats = compute_stats(session, user.id, now)
+    expected = baseline_counts(user.id, now)
+    assert {key: stats[key] for key in expected} == expected
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.db import engine
+from app.services.sync import changes_since
+
+
+def test_changes_are_read_in_one_snapshot(client, user, headers):
+    word = client.post(
+        "/api/words", json={"term": "snapshot", "translation": "x"}, headers=headers
+    ).json()
+    with Session(engine) as session:
+        page = changes_since(session, user.id, 0, 10)
+        # A delete committed after the log was read stays out of this read.
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM word WHERE id = :id"), {"id": word["id"]})
+        still_there = session.connection().exec_driver_sql(
+            "SELECT count(*) FROM word WHERE id = ?", (word["id"],)
+        ).scalar()
+    assert [w.id for w in page["words"]] == [word["id"]]
+    assert still_there == 1
+
+    page = client.get("/api/sync", headers=headers).json()
+    assert page["words"] == []
+    assert page["deleted_words"] == [word["id"]]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, create_engine, select
+
+from app.db import db_metrics, engine, is_write
+from app.models import Tag
+from app.services.writer import WriteQueue, write_queue
+
+
+def test_write_lock_waits_are_timed_at_begin_immediate(client):
+    assert is_write("BEGIN IMMEDIATE") and is_write("  begin\n exclusive")
+    assert not is_write("BEGIN") and not is_write("SELECT 1")
+
+    lock = sqlite3.connect(
+        engine.url.database, isolation_level=None, check_same_thread=False
+    )
+    lock.execute("BEGIN IMMEDIATE")
+    released = threading.Timer(0.3, lambda: lock.execute("ROLLBACK"))
+    db_metrics.reset()
+    released.start()
+    try:
+        write_queue(engine).run(lambda session: session.execute(text("SELECT 1")))
+    finally:
+        released.join()
+        lock.close()
+    stats = db_metrics.stats()
+    assert stats["writes"] >= 1
+    assert stats["max_write_seconds"] >= 0.25
+
+
+def tag_names(user_id: int) -> list[str]:
+    with Session(engine) as session:
+        return sorted(session.exec(select(Tag.name).where(Tag.user_id == user_id)))
+
+
+def add_tag(user_id: int, name: str, fail: bool = False):
+    def job(session: Session) -> str:
+        session.add(Tag(user_id=user_id, name=name))
+        session.flush()
+        if fail:
+            raise ValueError(name)
+        return name
+
+    return job
+
+
+def test_a_failing_job_rolls_back_only_its_savepoint(user):
+    # A long wait so the three jobs are sure to share one batch.
+    writer = WriteQueue(engine, max_batch=3, max_wait=5)
+    try:
+        futures = [
+            writer.submit(add_tag(user.id, "first")),
+            writer.submit(add_tag(user.id, "broken", fail=True)),
+            writer.submit(add_tag(user.id, "third")),
+        ]
+        assert futures[0].result(timeout=10) == "first"
+        with pytest.raises(ValueError, match="broken"):
+            futures[1].result(timeout=10)
+        assert futures[2].result(timeout=10) == "third"
+        assert writer.stats()["commits"] == 1
+        assert writer.stats()["largest_batch"] == 3
+    finally:
+        writer.stop()
+    assert tag_names(user.id) == ["first", "third"]
+
+
+def test_a_failed_commit_fails_every_job_in_the_batch(user):
+    impatient = create_engine(engine.url, connect_args={"timeout": 0.05})
+    writer = WriteQueue(impatient, max_batch=2, max_wait=0.5)
+    lock = sqlite3.connect(engine.url.database, isolation_level=None)
+    lock.execute("BEGIN IMMEDIATE")
+    try:
+        futures = [
+            writer.submit(add_tag(user.id, "lost-1")),
+            writer.submit(add_tag(user.id, "lost-2")),
+        ]
+        for future in futures:
+            with pytest.raises(OperationalError, match="locked"):
+                future.result(timeout=10)
+        lock.execute("ROLLBACK")
+        # The writer thread survives the failed batch.
+        assert writer.run(add_tag(user.id, "kept")) == "kept"
+    finally:
+        lock.close()
+        writer.stop()
+        impatient.dispose()
+    assert tag_names(user.id) == ["kept"]